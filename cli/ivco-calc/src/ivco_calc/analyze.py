@@ -0,0 +1,123 @@
+"""One-stop analysis pipeline: fetched statements → OE → CAGR → IV.
+
+Pure function of already-fetched data so it can run in worker processes
+(ivco screen) as well as behind `ivco analyze`.
+"""
+from ivco_calc.owner_earnings import calc_owner_earnings
+from ivco_calc.cagr import calc_cagr
+from ivco_calc.dcf import calc_three_stage_dcf
+
+DEFAULT_PARAMETERS = {
+    "stage2_cagr": 0.15,
+    "stage3_cagr": 0.05,
+    "discount_rate": 0.08,
+    "long_term_debt": 0,
+    "share_par_value": 10,
+}
+REQUIRED_PARAMETERS = ("maintenance_ratio", "cc_low", "cc_high")
+
+
+def analyze_financials(
+    ticker: str,
+    income: list[dict],
+    balance: list[dict],
+    quote: dict,
+    maintenance_ratio: float,
+    cc_low: float,
+    cc_high: float,
+    stage2_cagr: float = 0.15,
+    stage3_cagr: float = 0.05,
+    discount_rate: float = 0.08,
+    long_term_debt: int = 0,
+    share_par_value: int = 10,
+) -> dict:
+    """Run calc-oe → calc-cagr → calc-iv (+ reverse DCF) on fetched statements.
+
+    Returns:
+        Dict with ticker, analysis (oe_series, cagr, iv, current_price,
+        pe_ratio, market_implied_stage1_cagr) and parameters.
+    """
+    # Step 2: Calculate OE for each year
+    oe_series = []
+    for stmt in sorted(income, key=lambda x: x["year"]):
+        oe = calc_owner_earnings(
+            net_income=stmt["net_income"],
+            depreciation=stmt["depreciation"],
+            amortization=stmt["amortization"],
+            capex=stmt["capex"],
+            maintenance_capex_ratio=maintenance_ratio,
+        )
+        oe_series.append({
+            "year": stmt["year"],
+            "oe": oe,
+            "net_income": stmt["net_income"],
+            "depreciation": stmt["depreciation"],
+            "amortization": stmt["amortization"],
+            "capex": stmt["capex"],
+        })
+
+    # Step 3: Calculate CAGR
+    if len(oe_series) >= 2:
+        cagr_result = calc_cagr(oe_series=oe_series, reality_coefficients={})
+    else:
+        cagr_result = {"cagr": 0, "years": 0}
+
+    # Step 4: Calculate IV
+    latest_oe = oe_series[-1]["oe"] if oe_series else 0
+    shares = 0
+    for bs in balance:
+        if bs.get("shares_outstanding"):
+            shares = bs["shares_outstanding"]
+            break
+
+    if latest_oe > 0 and shares > 0 and cagr_result.get("cagr", 0) > 0:
+        iv_result = calc_three_stage_dcf(
+            latest_oe=latest_oe,
+            cagr=cagr_result["cagr"],
+            cc_low=cc_low,
+            cc_high=cc_high,
+            stage2_cagr=stage2_cagr,
+            stage3_cagr=stage3_cagr,
+            discount_rate=discount_rate,
+            long_term_debt=long_term_debt,
+            shares_outstanding_raw=shares,
+            share_par_value=share_par_value,
+        )
+    else:
+        iv_result = {"error": "Insufficient data for IV calculation"}
+
+    # Step 5: Market-implied stage-1 CAGR at the current price
+    implied_cagr = None
+    price = quote.get("price", 0)
+    if price and "error" not in iv_result:
+        from ivco_calc.reverse_dcf import solve_implied
+        implied_cagr = solve_implied(
+            price,
+            latest_oe=latest_oe,
+            stage2_cagr=stage2_cagr,
+            stage3_cagr=stage3_cagr,
+            discount_rate=discount_rate,
+            long_term_debt=long_term_debt,
+            shares_outstanding_raw=shares,
+            share_par_value=share_par_value,
+        )["implied"]
+
+    return {
+        "ticker": ticker,
+        "analysis": {
+            "oe_series": oe_series,
+            "cagr": cagr_result,
+            "iv": iv_result,
+            "current_price": quote.get("price", 0),
+            "pe_ratio": quote.get("pe", 0),
+            "market_implied_stage1_cagr": implied_cagr,
+        },
+        "parameters": {
+            "maintenance_ratio": maintenance_ratio,
+            "cc_low": cc_low,
+            "cc_high": cc_high,
+            "stage2_cagr": stage2_cagr,
+            "stage3_cagr": stage3_cagr,
+            "discount_rate": discount_rate,
+        },
+    }
@@ -1,214 +1,227 @@
-"""IVCO CLI — composable valuation tools."""
+"""IVCO CLI — composable valuation tools.
+
+Commands are loaded lazily: each tool in TOOLS lives in
+ivco_calc.commands.<name> and is imported only when it is invoked, so
+`ivco calc-oe` never pays for the fetchers, numpy or the screen pipeline.
+This module keeps the group and the helpers the command modules share.
+"""
 import click
+import copy
 import json
-from ivco_calc.owner_earnings import calc_owner_earnings
-from ivco_calc.cagr import calc_cagr
-from ivco_calc.dcf import calc_three_stage_dcf
-from ivco_calc.verify import verify_iv_range
-from ivco_calc.tools_registry import list_tools, get_tool_info
-
-@click.group()
+import sys
+from contextvars import ContextVar
+from ivco_calc.tools_registry import TOOLS, list_tools, get_tool_info
+
+
+class LazyGroup(click.Group):
+    """Group whose subcommands come from TOOLS and are imported on first use.
+
+    The command for tool `calc-oe` is `calc_oe_cmd` in ivco_calc.commands.calc_oe.
+    `--help` lists tools from their registry descriptions without importing them.
+    """
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | {tool["name"] for tool in TOOLS})
+
+    def get_command(self, ctx, name):
+        cmd = self.commands.get(name)
+        if cmd is None and get_tool_info(name) is not None:
+            module_name = name.replace("-", "_")
+            attr = f"{module_name}_cmd"
+            # __import__ rather than importlib.import_module so -X importtime reports it
+            cmd = getattr(__import__(f"ivco_calc.commands.{module_name}", fromlist=[attr]), attr)
+            self.add_command(cmd, name)
+        return cmd
+
+    def format_commands(self, ctx, formatter):
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            cmd = self.commands.get(name)
+            if cmd is not None:
+                if cmd.hidden:
+                    continue
+                rows.append((name, cmd.get_short_help_str(limit)))
+            else:
+                text = get_tool_info(name)["description"]
+                if len(text) > limit:
+                    text = text[:limit - 3].rsplit(" ", 1)[0] + "..."
+                rows.append((name, text))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
 @click.version_option(version="0.2.0")
 def cli():
     """IVCO — Intrinsic Value Confidence Observatory CLI tools."""
     pass
 
+# Set by `ivco serve` while a command runs: results are collected, not printed
+_capture: ContextVar[list | None] = ContextVar("ivco_capture", default=None)
+# Set by `ivco serve`: fetchers (cache, connection pool, rate limiter) reused across requests
+_shared_fetchers: dict | None = None
+
+
+class ToolError(Exception):
+    """A command failed; raised instead of printing {"error": ...} under `ivco serve`."""
+
+
 def output_json(data: dict) -> None:
     """Print JSON to stdout for piping."""
+    sink = _capture.get()
+    if sink is not None:
+        sink.append(data)
+        return
     click.echo(json.dumps(data, indent=2, ensure_ascii=False))
 
-@cli.command("calc-oe")
-@click.option("--net-income", type=int, required=True)
-@click.option("--depreciation", type=int, required=True)
-@click.option("--amortization", type=int, required=True)
-@click.option("--capex", type=int, required=True)
-@click.option("--maintenance-ratio", type=float, required=True)
-def calc_oe_cmd(net_income, depreciation, amortization, capex, maintenance_ratio):
-    """Calculate Owner Earnings for a single year."""
-    oe = calc_owner_earnings(
-        net_income=net_income,
-        depreciation=depreciation,
-        amortization=amortization,
-        capex=capex,
-        maintenance_capex_ratio=maintenance_ratio
-    )
-    output_json({
-        "owner_earnings": oe,
-        "inputs": {
-            "net_income": net_income,
-            "depreciation": depreciation,
-            "amortization": amortization,
-            "capex": capex,
-            "maintenance_capex_ratio": maintenance_ratio
-        }
-    })
-
-@cli.command("calc-cagr")
-@click.option("--start-oe", type=int, required=True)
-@click.option("--end-oe", type=int, required=True)
-@click.option("--start-year", type=int, required=True)
-@click.option("--end-year", type=int, required=True)
-@click.option("--rc-start", type=float, default=1.0)
-@click.option("--rc-end", type=float, default=1.0)
-def calc_cagr_cmd(start_oe, end_oe, start_year, end_year, rc_start, rc_end):
-    """Calculate CAGR from Owner Earnings with Reality Coefficient."""
-    oe_series = [{"year": start_year, "oe": start_oe}, {"year": end_year, "oe": end_oe}]
-    rc = {start_year: rc_start, end_year: rc_end}
-    result = calc_cagr(oe_series=oe_series, reality_coefficients=rc)
-    output_json(result)
-
-@cli.command("calc-iv")
-@click.option("--latest-oe", type=int, required=True)
-@click.option("--cagr", type=float, required=True)
-@click.option("--cc-low", type=float, required=True)
-@click.option("--cc-high", type=float, required=True)
-@click.option("--stage2-cagr", type=float, required=True)
-@click.option("--stage3-cagr", type=float, required=True)
-@click.option("--discount-rate", type=float, required=True)
-@click.option("--long-term-debt", type=int, required=True)
-@click.option("--shares-outstanding", type=int, required=True)
-@click.option("--share-par-value", type=int, default=10)
-def calc_iv_cmd(latest_oe, cagr, cc_low, cc_high, stage2_cagr, stage3_cagr,
-                discount_rate, long_term_debt, shares_outstanding, share_par_value):
-    """Calculate Intrinsic Value using Three-Stage DCF."""
-    result = calc_three_stage_dcf(
-        latest_oe=latest_oe,
-        cagr=cagr,
-        cc_low=cc_low,
-        cc_high=cc_high,
-        stage2_cagr=stage2_cagr,
-        stage3_cagr=stage3_cagr,
-        discount_rate=discount_rate,
-        long_term_debt=long_term_debt,
-        shares_outstanding_raw=shares_outstanding,
-        share_par_value=share_par_value,
-    )
-    output_json(result)
-
-@cli.command("verify")
-@click.option("--computed-low", type=int, required=True)
-@click.option("--computed-high", type=int, required=True)
-@click.option("--expected-low", type=int, required=True)
-@click.option("--expected-high", type=int, required=True)
-@click.option("--tolerance", type=int, default=0)
-def verify_cmd(computed_low, computed_high, expected_low, expected_high, tolerance):
-    """Verify computed IV Range against expected values."""
-    result = verify_iv_range(
-        computed_low=computed_low, computed_high=computed_high,
-        expected_low=expected_low, expected_high=expected_high,
-        tolerance=tolerance,
-    )
-    output_json(result)
-    if result["status"] == "FAIL":
+def output_text(text: str) -> None:
+    """Print non-JSON output (CSV) as is."""
+    sink = _capture.get()
+    if sink is not None:
+        sink.append(text)
+        return
+    click.echo(text, nl=not text.endswith("\n"))
+
+def fail(message: str):
+    """Print {"error": message} and exit 1."""
+    if _capture.get() is not None:
+        raise ToolError(message)
+    click.echo(json.dumps({"error": message}))
+    raise SystemExit(1)
+
+def output_line(data: dict) -> None:
+    """Print one compact NDJSON line (flushed, so pipes see results as they come)."""
+    sink = _capture.get()
+    if sink is not None:
+        sink.append(data)
+        return
+    click.echo(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+
+class BatchCommand(click.Command):
+    """A primitive with --batch: required options are only enforced outside batch mode
+    (inside it they are checked per record)."""
+
+    def parse_args(self, ctx, args):
+        ctx.meta["ivco.batch"] = "--batch" in args
+        return super().parse_args(ctx, args)
+
+    def get_params(self, ctx):
+        params = super().get_params(ctx)
+        if not ctx.meta.get("ivco.batch"):
+            return params
+        relaxed = []
+        for param in params:
+            if param.required:
+                param = copy.copy(param)
+                param.required = False
+            relaxed.append(param)
+        return relaxed
+
+
+batch_option = click.option(
+    "--batch", is_flag=True,
+    help="Read NDJSON parameter sets from stdin (fields named like the options; "
+         "options given act as defaults) and write one compact result per line")
+
+
+def run_batch(ctx: click.Context, compute) -> None:
+    """--batch loop: one JSON object per stdin line -> one result line, errors per record.
+
+    An "id" field is echoed on its result line. Exits 1 after the last line
+    if any record failed.
+    """
+    options = {}
+    for param in ctx.command.params:
+        if isinstance(param, click.Option) and param.name != "batch":
+            options[param.name] = param
+            for opt in param.opts:
+                options[opt.lstrip("-").replace("-", "_")] = param
+    defaults = {name: value for name, value in ctx.params.items() if name != "batch"}
+    failed = 0
+    for lineno, line in enumerate(sys.stdin, 1):
+        if not line.strip():
+            continue
+        record, error = {}, None
+        try:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"invalid JSON: {e}")
+            if not isinstance(record, dict):
+                raise ValueError("record must be a JSON object")
+            kwargs = dict(defaults)
+            for key, value in record.items():
+                if key == "id":
+                    continue
+                param = options.get(key.replace("-", "_"))
+                if param is None:
+                    raise ValueError(f"unknown field '{key}'")
+                if (isinstance(param.type, click.types.IntParamType) and isinstance(value, float)
+                        and not value.is_integer()):
+                    # click's INT would truncate 1.9 to 1; 1e9 and 2.0 are still fine
+                    raise click.BadParameter(f"{value!r} is not a valid integer.", ctx=ctx, param=param)
+                kwargs[param.name] = param.type_cast_value(ctx, value)
+            missing = [p.opts[0] for p in ctx.command.params if p.required and kwargs.get(p.name) is None]
+            if missing:
+                raise ValueError(f"missing {', '.join(missing)}")
+            result = compute(**kwargs)
+        except click.BadParameter as e:
+            error = e.format_message()
+        except ValueError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            failed += 1
+            result = {"error": error, "line": lineno}
+        if isinstance(record, dict) and "id" in record:
+            result = {"id": record["id"], **result}
+        output_line(result)
+    if failed:
         raise SystemExit(1)
 
-@cli.command("fetch")
-@click.option("--ticker", type=str, required=True, help="Stock ticker (e.g. TSM, AAPL)")
-@click.option("--years", type=int, default=10, help="Number of years to fetch")
-@click.option("--source", type=click.Choice(["fmp"]), default="fmp", help="Data source")
-def fetch_cmd(ticker, years, source):
-    """Fetch financial data from external API."""
-    from ivco_calc.fetchers.fmp import FMPFetcher
-    fetcher = FMPFetcher()
-    income = fetcher.fetch_income_statements(ticker, limit=years)
-    balance = fetcher.fetch_balance_sheet(ticker, limit=years)
-    quote = fetcher.fetch_quote(ticker)
-    output_json({
-        "ticker": ticker,
-        "source": source,
-        "income_statements": income,
-        "balance_sheet": balance,
-        "quote": quote,
-    })
-
-@cli.command("analyze")
-@click.option("--ticker", type=str, required=True, help="Stock ticker (e.g. TSM)")
-@click.option("--years", type=int, default=10, help="Years of history to fetch")
-@click.option("--maintenance-ratio", type=float, required=True, help="Maintenance CapEx ratio (e.g. 0.20)")
-@click.option("--cc-low", type=float, required=True, help="Confidence Coefficient lower bound")
-@click.option("--cc-high", type=float, required=True, help="Confidence Coefficient upper bound")
-@click.option("--stage2-cagr", type=float, default=0.15, help="Stage 2 CAGR (default 15%%)")
-@click.option("--stage3-cagr", type=float, default=0.05, help="Stage 3 perpetual growth (default 5%%)")
-@click.option("--discount-rate", type=float, default=0.08, help="Discount rate (default 8%%)")
-@click.option("--long-term-debt", type=int, default=0, help="Long-term debt")
-@click.option("--share-par-value", type=int, default=10, help="Share par value")
-@click.option("--source", type=click.Choice(["fmp"]), default="fmp")
-def analyze_cmd(ticker, years, maintenance_ratio, cc_low, cc_high,
-                stage2_cagr, stage3_cagr, discount_rate, long_term_debt,
-                share_par_value, source):
-    """One-stop analysis: fetch → calc-oe → calc-cagr → calc-iv."""
+def make_fetcher(no_cache: bool = False, offline: bool = False,
+                 rps: float | None = None, daily_budget: int | None = None):
+    """FMPFetcher with the on-disk response cache (unless --no-cache) and the
+    shared rate limiter ($IVCO_FMP_RPS / $IVCO_FMP_DAILY_BUDGET defaults)."""
+    import os
     from ivco_calc.fetchers.fmp import FMPFetcher
-
-    # Step 1: Fetch
-    fetcher = FMPFetcher()
-    income = fetcher.fetch_income_statements(ticker, limit=years)
-    balance = fetcher.fetch_balance_sheet(ticker, limit=years)
-    quote = fetcher.fetch_quote(ticker)
-
-    if not income:
-        click.echo(json.dumps({"error": f"No income data found for {ticker}"}))
-        raise SystemExit(1)
-
-    # Step 2: Calculate OE for each year
-    oe_series = []
-    for stmt in sorted(income, key=lambda x: x["year"]):
-        oe = calc_owner_earnings(
-            net_income=stmt["net_income"],
-            depreciation=stmt["depreciation"],
-            amortization=stmt["amortization"],
-            capex=stmt["capex"],
-            maintenance_capex_ratio=maintenance_ratio,
-        )
-        oe_series.append({"year": stmt["year"], "oe": oe})
-
-    # Step 3: Calculate CAGR
-    if len(oe_series) >= 2:
-        cagr_result = calc_cagr(oe_series=oe_series, reality_coefficients={})
-    else:
-        cagr_result = {"cagr": 0, "years": 0}
-
-    # Step 4: Calculate IV
-    latest_oe = oe_series[-1]["oe"] if oe_series else 0
-    shares = 0
-    for bs in balance:
-        if bs.get("shares_outstanding"):
-            shares = bs["shares_outstanding"]
-            break
-
-    if latest_oe > 0 and shares > 0 and cagr_result.get("cagr", 0) > 0:
-        iv_result = calc_three_stage_dcf(
-            latest_oe=latest_oe,
-            cagr=cagr_result["cagr"],
-            cc_low=cc_low,
-            cc_high=cc_high,
-            stage2_cagr=stage2_cagr,
-            stage3_cagr=stage3_cagr,
-            discount_rate=discount_rate,
-            long_term_debt=long_term_debt,
-            shares_outstanding_raw=shares,
-            share_par_value=share_par_value,
-        )
-    else:
-        iv_result = {"error": "Insufficient data for IV calculation"}
-
-    output_json({
-        "ticker": ticker,
-        "analysis": {
-            "oe_series": oe_series,
-            "cagr": cagr_result,
-            "iv": iv_result,
-            "current_price": quote.get("price", 0),
-            "pe_ratio": quote.get("pe", 0),
-        },
-        "parameters": {
-            "maintenance_ratio": maintenance_ratio,
-            "cc_low": cc_low,
-            "cc_high": cc_high,
-            "stage2_cagr": stage2_cagr,
-            "stage3_cagr": stage3_cagr,
-            "discount_rate": discount_rate,
-        },
-    })
+    from ivco_calc.fetchers.cache import ResponseCache, default_cache_dir
+    from ivco_calc.fetchers.ratelimit import RateLimiter
+    if no_cache and offline:
+        raise click.UsageError("--offline needs the cache; drop --no-cache")
+    key = ("fmp", no_cache, offline, rps, daily_budget)
+    if _shared_fetchers is not None and key in _shared_fetchers:
+        return _shared_fetchers[key]
+    limiter = RateLimiter(
+        os.path.join(default_cache_dir(), "fmp-ratelimit.json"),
+        rate=rps if rps is not None else float(os.environ.get("IVCO_FMP_RPS", 5)),
+        per_day=daily_budget if daily_budget is not None else int(os.environ.get("IVCO_FMP_DAILY_BUDGET", 250)),
+    )
+    fetcher = FMPFetcher(cache=None if no_cache else ResponseCache(), offline=offline, rate_limiter=limiter)
+    if _shared_fetchers is not None:
+        _shared_fetchers[key] = fetcher
+    return fetcher
+
+def make_source_fetcher(source: str, store_path: str | None = None,
+                        no_cache: bool = False, offline: bool = False):
+    """Fetcher for --source: the local statement store or the FMP API."""
+    if source == "store":
+        from ivco_calc.fetchers.store import StoreFetcher
+        from ivco_calc.store import StatementStore
+        key = ("store", store_path)
+        if _shared_fetchers is not None and key in _shared_fetchers:
+            return _shared_fetchers[key]
+        fetcher = StoreFetcher(StatementStore(store_path))
+        if _shared_fetchers is not None:
+            _shared_fetchers[key] = fetcher
+        return fetcher
+    return make_fetcher(no_cache, offline)
 
 @cli.command("list-tools")
 @click.option("--layer", type=int, help="Filter by layer (1=primitive, 2=composed, 3=agent)")
@@ -225,8 +238,7 @@ def tool_info_cmd(name):
     """Get detailed info about a specific tool."""
     info = get_tool_info(name)
     if info is None:
-        click.echo(json.dumps({"error": f"Tool '{name}' not found. Use 'ivco list-tools' to see available tools."}))
-        raise SystemExit(1)
+        fail(f"Tool '{name}' not found. Use 'ivco list-tools' to see available tools.")
     output_json(info)
 
 if __name__ == "__main__":
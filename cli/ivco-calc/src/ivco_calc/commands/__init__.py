@@ -0,0 +1 @@
+"""Command modules for the `ivco` CLI, imported on first use (see cli.LazyGroup)."""
@@ -0,0 +1,76 @@
+"""`ivco analyze`: fetch → calc-oe → calc-cagr → calc-iv for one ticker."""
+import click
+
+from ivco_calc.analyze import analyze_financials
+from ivco_calc.cli import fail, make_source_fetcher, output_json
+
+@click.command("analyze")
+@click.option("--ticker", type=str, required=True, help="Stock ticker (e.g. TSM)")
+@click.option("--years", type=int, default=10, help="Years of history to fetch")
+@click.option("--maintenance-ratio", type=float, required=True, help="Maintenance CapEx ratio (e.g. 0.20)")
+@click.option("--cc-low", type=float, required=True, help="Confidence Coefficient lower bound")
+@click.option("--cc-high", type=float, required=True, help="Confidence Coefficient upper bound")
+@click.option("--stage2-cagr", type=float, default=0.15, help="Stage 2 CAGR (default 15%%)")
+@click.option("--stage3-cagr", type=float, default=0.05, help="Stage 3 perpetual growth (default 5%%)")
+@click.option("--discount-rate", type=float, default=0.08, help="Discount rate (default 8%%)")
+@click.option("--long-term-debt", type=int, default=0, help="Long-term debt")
+@click.option("--share-par-value", type=int, default=10, help="Share par value")
+@click.option("--source", type=click.Choice(["fmp", "store"]), default="fmp",
+              help="fmp = API (cached); store = local statement store (no network)")
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), help="Statement store path (--source store)")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk response cache")
+@click.option("--offline", is_flag=True, help="Serve only from the response cache (no API calls)")
+@click.option("--no-memo", is_flag=True,
+              help="Recompute even if this exact analysis is cached (--source store)")
+def analyze_cmd(ticker, years, maintenance_ratio, cc_low, cc_high,
+                stage2_cagr, stage3_cagr, discount_rate, long_term_debt,
+                share_par_value, source, store_path, no_cache, offline, no_memo):
+    """One-stop analysis: fetch → calc-oe → calc-cagr → calc-iv."""
+    from ivco_calc.fetchers.cache import CacheMiss
+    from ivco_calc.fetchers.ratelimit import QuotaExceeded
+    import os
+    from ivco_calc.memo import default_memo, input_key
+
+    params = dict(
+        maintenance_ratio=maintenance_ratio,
+        cc_low=cc_low,
+        cc_high=cc_high,
+        stage2_cagr=stage2_cagr,
+        stage3_cagr=stage3_cagr,
+        discount_rate=discount_rate,
+        long_term_debt=long_term_debt,
+        share_par_value=share_par_value,
+    )
+    # Only the store has a cheap revision to key on; an FMP analysis would have to
+    # fetch (or revalidate) every response before a lookup, which is the costly part
+    memo = None if no_memo or source != "store" else default_memo()
+
+    # Step 1: Fetch
+    fetcher = make_source_fetcher(source, store_path, no_cache, offline)
+    store_key = None
+    if memo is not None:
+        # The store revision changes whenever the ticker's data does: skip the reads too
+        store = fetcher.store
+        store_key = input_key("analyze-store", {
+            "store": os.path.abspath(store.path), "ticker": ticker.upper(),
+            "revision": store.revision(ticker), "years": years, "parameters": params,
+        })
+        cached = memo.get(store_key)
+        if cached is not None:
+            output_json(cached)
+            return
+    try:
+        income = fetcher.fetch_income_statements(ticker, limit=years)
+        balance = fetcher.fetch_balance_sheet(ticker, limit=years)
+        quote = fetcher.fetch_quote(ticker)
+    except (CacheMiss, QuotaExceeded) as e:
+        fail(str(e))
+
+    if not income:
+        fail(f"No income data found for {ticker}")
+
+    # Steps 2-5: OE → CAGR → IV → market-implied CAGR
+    result = analyze_financials(ticker, income, balance, quote, **params)
+    if store_key is not None:
+        memo.put(store_key, "analyze-store", result)
+    output_json(result)
@@ -0,0 +1,25 @@
+"""`ivco calc-cagr`: CAGR from an OE start/end pair."""
+import click
+
+from ivco_calc.cagr import calc_cagr
+from ivco_calc.cli import BatchCommand, batch_option, output_json, run_batch
+
+def _calc_cagr(start_oe, end_oe, start_year, end_year, rc_start, rc_end):
+    oe_series = [{"year": start_year, "oe": start_oe}, {"year": end_year, "oe": end_oe}]
+    rc = {start_year: rc_start, end_year: rc_end}
+    return calc_cagr(oe_series=oe_series, reality_coefficients=rc)
+
+@click.command("calc-cagr", cls=BatchCommand)
+@click.option("--start-oe", type=int, required=True)
+@click.option("--end-oe", type=int, required=True)
+@click.option("--start-year", type=int, required=True)
+@click.option("--end-year", type=int, required=True)
+@click.option("--rc-start", type=float, default=1.0)
+@click.option("--rc-end", type=float, default=1.0)
+@batch_option
+@click.pass_context
+def calc_cagr_cmd(ctx, start_oe, end_oe, start_year, end_year, rc_start, rc_end, batch):
+    """Calculate CAGR from Owner Earnings with Reality Coefficient."""
+    if batch:
+        return run_batch(ctx, _calc_cagr)
+    output_json(_calc_cagr(start_oe, end_oe, start_year, end_year, rc_start, rc_end))
@@ -0,0 +1,55 @@
+"""`ivco calc-iv`: three-stage DCF intrinsic value."""
+import functools
+
+import click
+
+from ivco_calc import cli as cli_module
+from ivco_calc.cli import BatchCommand, batch_option, output_json, run_batch
+from ivco_calc.dcf import calc_three_stage_dcf
+
+def _calc_iv(latest_oe, cagr, cc_low, cc_high, stage2_cagr, stage3_cagr,
+             discount_rate, long_term_debt, shares_outstanding, share_par_value, fast, memo=None):
+    inputs = dict(
+        latest_oe=latest_oe,
+        cagr=cagr,
+        cc_low=cc_low,
+        cc_high=cc_high,
+        stage2_cagr=stage2_cagr,
+        stage3_cagr=stage3_cagr,
+        discount_rate=discount_rate,
+        long_term_debt=long_term_debt,
+        shares_outstanding_raw=shares_outstanding,
+        share_par_value=share_par_value,
+        fast=fast,
+    )
+    if memo is None:
+        return calc_three_stage_dcf(**inputs)
+    return memo.memoize("calc-iv", inputs, lambda: calc_three_stage_dcf(**inputs))
+
+@click.command("calc-iv", cls=BatchCommand)
+@click.option("--latest-oe", type=int, required=True)
+@click.option("--cagr", type=float, required=True)
+@click.option("--cc-low", type=float, required=True)
+@click.option("--cc-high", type=float, required=True)
+@click.option("--stage2-cagr", type=float, required=True)
+@click.option("--stage3-cagr", type=float, required=True)
+@click.option("--discount-rate", type=float, required=True)
+@click.option("--long-term-debt", type=int, required=True)
+@click.option("--shares-outstanding", type=int, required=True)
+@click.option("--share-par-value", type=int, default=10)
+@click.option("--fast", is_flag=True, help="Closed-form stage sums, summary only (no per-year detail)")
+@batch_option
+@click.pass_context
+def calc_iv_cmd(ctx, latest_oe, cagr, cc_low, cc_high, stage2_cagr, stage3_cagr,
+                discount_rate, long_term_debt, shares_outstanding, share_par_value, fast, batch):
+    """Calculate Intrinsic Value using Three-Stage DCF."""
+    memo = None
+    if batch or cli_module._capture.get() is not None:
+        # Inputs only repeat within one process (--batch, `ivco serve`); in-process LRU
+        # only, since the DCF itself is cheaper than a disk lookup
+        from ivco_calc.memo import default_memo
+        memo = default_memo(disk=False)
+    if batch:
+        return run_batch(ctx, functools.partial(_calc_iv, memo=memo))
+    output_json(_calc_iv(latest_oe, cagr, cc_low, cc_high, stage2_cagr, stage3_cagr,
+                         discount_rate, long_term_debt, shares_outstanding, share_par_value, fast, memo))
@@ -0,0 +1,38 @@
+"""`ivco calc-oe`: Owner Earnings for a single year."""
+import click
+
+from ivco_calc.cli import BatchCommand, batch_option, output_json, run_batch
+from ivco_calc.owner_earnings import calc_owner_earnings
+
+def _calc_oe(net_income, depreciation, amortization, capex, maintenance_ratio):
+    oe = calc_owner_earnings(
+        net_income=net_income,
+        depreciation=depreciation,
+        amortization=amortization,
+        capex=capex,
+        maintenance_capex_ratio=maintenance_ratio
+    )
+    return {
+        "owner_earnings": oe,
+        "inputs": {
+            "net_income": net_income,
+            "depreciation": depreciation,
+            "amortization": amortization,
+            "capex": capex,
+            "maintenance_capex_ratio": maintenance_ratio
+        }
+    }
+
+@click.command("calc-oe", cls=BatchCommand)
+@click.option("--net-income", type=int, required=True)
+@click.option("--depreciation", type=int, required=True)
+@click.option("--amortization", type=int, required=True)
+@click.option("--capex", type=int, required=True)
+@click.option("--maintenance-ratio", type=float, required=True)
+@batch_option
+@click.pass_context
+def calc_oe_cmd(ctx, net_income, depreciation, amortization, capex, maintenance_ratio, batch):
+    """Calculate Owner Earnings for a single year."""
+    if batch:
+        return run_batch(ctx, _calc_oe)
+    output_json(_calc_oe(net_income, depreciation, amortization, capex, maintenance_ratio))
@@ -0,0 +1,47 @@
+"""`ivco fetch`: statements and quotes from FMP."""
+import click
+
+from ivco_calc.cli import fail, make_fetcher, output_json
+
+@click.command("fetch")
+@click.option("--ticker", type=str, help="Stock ticker (e.g. TSM, AAPL)")
+@click.option("--tickers", type=str, help="Comma-separated tickers (e.g. TSM,AAPL,MSFT)")
+@click.option("--tickers-file", type=click.Path(exists=True, dir_okay=False),
+              help="File with one ticker per line ('#' comments)")
+@click.option("--years", type=int, default=10, help="Number of years to fetch")
+@click.option("--source", type=click.Choice(["fmp"]), default="fmp", help="Data source")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk response cache")
+@click.option("--offline", is_flag=True, help="Serve only from the response cache (no API calls)")
+@click.option("--workers", type=int, default=4, help="Concurrent tickers for --tickers/--tickers-file")
+@click.option("--rps", type=float, help="Requests per second across all ivco processes (default 5)")
+@click.option("--daily-budget", type=int, help="Requests per UTC day across all ivco processes (default 250)")
+def fetch_cmd(ticker, tickers, tickers_file, years, source, no_cache, offline, workers, rps, daily_budget):
+    """Fetch financial data from external API."""
+    from ivco_calc.fetchers.cache import CacheMiss
+    from ivco_calc.fetchers.multi import fetch_many, read_tickers
+    from ivco_calc.fetchers.ratelimit import QuotaExceeded
+    if not (ticker or tickers or tickers_file):
+        raise click.UsageError("Missing option '--ticker' (or --tickers / --tickers-file)")
+    fetcher = make_fetcher(no_cache, offline, rps, daily_budget)
+
+    if tickers or tickers_file:
+        symbols = ([ticker] if ticker else []) + read_tickers(tickers, tickers_file)
+        results = fetch_many(fetcher, symbols, years=years, max_workers=workers)
+        output_json([{**r, "source": source} for r in results])
+        if any("error" in r for r in results):
+            raise SystemExit(1)
+        return
+
+    try:
+        income = fetcher.fetch_income_statements(ticker, limit=years)
+        balance = fetcher.fetch_balance_sheet(ticker, limit=years)
+        quote = fetcher.fetch_quote(ticker)
+    except (CacheMiss, QuotaExceeded) as e:
+        fail(str(e))
+    output_json({
+        "ticker": ticker,
+        "source": source,
+        "income_statements": income,
+        "balance_sheet": balance,
+        "quote": quote,
+    })
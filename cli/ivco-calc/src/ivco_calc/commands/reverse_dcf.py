@@ -0,0 +1,46 @@
+"""`ivco reverse-dcf`: market-implied stage-1 CAGR or discount rate."""
+import json
+
+import click
+
+from ivco_calc.cli import fail, output_json
+
+@click.command("reverse-dcf")
+@click.option("--price", type=float, help="Current market price per share")
+@click.option("--latest-oe", type=int)
+@click.option("--cagr", type=float, help="Historical CAGR (gives implied CC; required for --solve-for discount-rate)")
+@click.option("--cc", type=float, default=1.0, help="Confidence Coefficient applied to --cagr")
+@click.option("--stage2-cagr", type=float, default=0.15)
+@click.option("--stage3-cagr", type=float, default=0.05)
+@click.option("--discount-rate", type=float, default=0.08)
+@click.option("--long-term-debt", type=int, default=0)
+@click.option("--shares-outstanding", type=int)
+@click.option("--share-par-value", type=int, default=10)
+@click.option("--solve-for", type=click.Choice(["cagr", "discount-rate"]), default="cagr")
+@click.option("--input", "input_path", type=click.File("r"),
+              help="Batch: JSON array or NDJSON of ticker records ('-' for stdin); options act as defaults")
+def reverse_dcf_cmd(price, latest_oe, cagr, cc, stage2_cagr, stage3_cagr, discount_rate,
+                    long_term_debt, shares_outstanding, share_par_value, solve_for, input_path):
+    """Solve the market-implied stage-1 CAGR (or discount rate) from price."""
+    from ivco_calc.reverse_dcf import reverse_dcf_records
+    options = {
+        "price": price, "latest_oe": latest_oe, "cagr": cagr, "cc": cc,
+        "stage2_cagr": stage2_cagr, "stage3_cagr": stage3_cagr, "discount_rate": discount_rate,
+        "long_term_debt": long_term_debt, "shares_outstanding": shares_outstanding,
+        "share_par_value": share_par_value,
+    }
+    if input_path:
+        raw = input_path.read().strip()
+        try:
+            records = json.loads(raw) if raw.startswith("[") else [
+                json.loads(line) for line in raw.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise click.BadParameter(f"invalid JSON: {e}", param_hint="--input")
+    else:
+        records = [{}]
+    try:
+        results = reverse_dcf_records(records, solve_for=solve_for.replace("-", "_"),
+                                      defaults={k: v for k, v in options.items() if v is not None})
+    except ValueError as e:
+        fail(str(e))
+    output_json(results if input_path else results[0])
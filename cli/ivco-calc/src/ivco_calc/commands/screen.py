@@ -0,0 +1,61 @@
+"""`ivco screen`: analyze a ticker universe, ranked by margin of safety."""
+import json
+
+import click
+
+from ivco_calc.cli import fail, make_source_fetcher, output_json, output_text
+
+@click.command("screen")
+@click.option("--universe", type=click.Path(exists=True, dir_okay=False), required=True,
+              help="Tickers: JSON array / NDJSON with per-ticker overrides, or one ticker per line")
+@click.option("--years", type=int, default=10, help="Years of history to fetch")
+@click.option("--maintenance-ratio", type=float, help="Default maintenance CapEx ratio")
+@click.option("--cc-low", type=float, help="Default Confidence Coefficient lower bound")
+@click.option("--cc-high", type=float, help="Default Confidence Coefficient upper bound")
+@click.option("--stage2-cagr", type=float, default=0.15, help="Stage 2 CAGR (default 15%%)")
+@click.option("--stage3-cagr", type=float, default=0.05, help="Stage 3 perpetual growth (default 5%%)")
+@click.option("--discount-rate", type=float, default=0.08, help="Discount rate (default 8%%)")
+@click.option("--long-term-debt", type=int, default=0, help="Long-term debt")
+@click.option("--share-par-value", type=int, default=10, help="Share par value")
+@click.option("--checkpoint", type=click.Path(dir_okay=False),
+              help="NDJSON progress file; re-run with the same file to resume")
+@click.option("--io-workers", type=int, default=8, help="Concurrent fetches")
+@click.option("--compute-workers", type=int, default=0, help="Valuation processes (0 = in-process)")
+@click.option("--format", "fmt", type=click.Choice(["json", "csv"]), default="json")
+@click.option("--source", type=click.Choice(["fmp", "store"]), default="fmp",
+              help="fmp = API (cached); store = local statement store (no network)")
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), help="Statement store path (--source store)")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk response cache")
+@click.option("--offline", is_flag=True, help="Serve only from the response cache (no API calls)")
+def screen_cmd(universe, years, maintenance_ratio, cc_low, cc_high, stage2_cagr, stage3_cagr,
+               discount_rate, long_term_debt, share_par_value, checkpoint, io_workers,
+               compute_workers, fmt, source, store_path, no_cache, offline):
+    """Analyze a ticker universe and rank by margin of safety."""
+    from ivco_calc.screen import load_universe, run_screen, screen_to_csv
+    try:
+        entries = load_universe(universe)
+    except (ValueError, json.JSONDecodeError) as e:
+        fail(str(e))
+
+    result = run_screen(
+        entries,
+        make_source_fetcher(source, store_path, no_cache, offline),
+        defaults={
+            "maintenance_ratio": maintenance_ratio,
+            "cc_low": cc_low,
+            "cc_high": cc_high,
+            "stage2_cagr": stage2_cagr,
+            "stage3_cagr": stage3_cagr,
+            "discount_rate": discount_rate,
+            "long_term_debt": long_term_debt,
+            "share_par_value": share_par_value,
+        },
+        years=years,
+        io_workers=io_workers,
+        compute_workers=compute_workers,
+        checkpoint_path=checkpoint,
+    )
+    if fmt == "csv":
+        output_text(screen_to_csv(result))
+    else:
+        output_json(result)
@@ -0,0 +1,59 @@
+"""`ivco sensitivity`: IV-per-share grid over the DCF inputs."""
+import click
+
+from ivco_calc.cli import output_text
+
+def _grid_axis(ctx, param, value):
+    """click callback: parse a sensitivity axis spec into a list of floats."""
+    from ivco_calc.sensitivity import parse_range
+    try:
+        values = parse_range(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if not values:
+        raise click.BadParameter("axis needs at least one value")
+    return values
+
+@click.command("sensitivity")
+@click.option("--latest-oe", type=int, required=True)
+@click.option("--cagr", type=float, required=True)
+@click.option("--discount-rate", type=str, default="0.08", callback=_grid_axis,
+              help="Axis spec: 0.08 | 0.06,0.08 | START:STOP:NUM")
+@click.option("--stage2-cagr", type=str, default="0.15", callback=_grid_axis, help="Axis spec")
+@click.option("--stage3-cagr", type=str, default="0.05", callback=_grid_axis, help="Axis spec")
+@click.option("--cc", type=str, required=True, callback=_grid_axis,
+              help="Confidence Coefficient axis spec (e.g. 1.0:1.5:6)")
+@click.option("--long-term-debt", type=int, required=True)
+@click.option("--shares-outstanding", type=int, required=True)
+@click.option("--share-par-value", type=int, default=10)
+@click.option("--format", "fmt", type=click.Choice(["json", "csv", "npy"]), default="json")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write to file instead of stdout")
+def sensitivity_cmd(latest_oe, cagr, discount_rate, stage2_cagr, stage3_cagr, cc,
+                    long_term_debt, shares_outstanding, share_par_value, fmt, output):
+    """IV-per-share sensitivity grid: discount rate x stage 2 x stage 3 x CC."""
+    from ivco_calc.sensitivity import calc_sensitivity_grid, grid_to_csv, grid_to_json
+    grid = calc_sensitivity_grid(
+        latest_oe=latest_oe,
+        cagr=cagr,
+        discount_rates=discount_rate,
+        stage2_cagrs=stage2_cagr,
+        stage3_cagrs=stage3_cagr,
+        ccs=cc,
+        long_term_debt=long_term_debt,
+        shares_outstanding_raw=shares_outstanding,
+        share_par_value=share_par_value,
+    )
+    if fmt == "npy":
+        import numpy as np
+        if output:
+            with open(output, "wb") as f:
+                np.save(f, grid["iv_per_share"])
+        else:
+            np.save(click.get_binary_stream("stdout"), grid["iv_per_share"])
+        return
+    text = grid_to_json(grid) if fmt == "json" else grid_to_csv(grid)
+    if output:
+        with open(output, "w") as f:
+            f.write(text if text.endswith("\n") else text + "\n")
+    else:
+        output_text(text)
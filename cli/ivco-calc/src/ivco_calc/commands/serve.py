@@ -0,0 +1,22 @@
+"""`ivco serve`: JSON-RPC server over the registered tools."""
+import json
+
+import click
+
+@click.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind (keep it local)")
+@click.option("--port", type=int, default=8765, show_default=True, help="Port (0 picks a free one)")
+@click.option("--verbose", is_flag=True, help="Log each HTTP request to stderr")
+def serve_cmd(host, port, verbose):
+    """Serve every registered tool as JSON-RPC 2.0 methods over local HTTP (POST /rpc, GET /tools)."""
+    from ivco_calc.server import make_server
+    server = make_server(host, port, verbose=verbose)
+    bound_host, bound_port = server.server_address[:2]
+    click.echo(json.dumps({"serving": f"http://{bound_host}:{bound_port}/rpc",
+                           "methods": sorted(server.methods)}), err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,58 @@
+"""`ivco simulate`: Monte Carlo distribution of IV per share."""
+import click
+
+from ivco_calc.cli import output_json
+
+def _distribution(ctx, param, value):
+    """click callback: validate a simulate distribution spec."""
+    from ivco_calc.simulate import parse_distribution
+    try:
+        parse_distribution(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return value
+
+@click.command("simulate")
+@click.option("--latest-oe", type=int, required=True)
+@click.option("--cagr", type=str, required=True, callback=_distribution,
+              help="Distribution: 0.17 | uniform:L,H | normal:M,SD | triangular:L,M,H | lognormal:M,S")
+@click.option("--cc", type=str, required=True, callback=_distribution, help="Confidence Coefficient distribution")
+@click.option("--stage2-cagr", type=str, default="0.15", callback=_distribution, help="Stage 2 CAGR distribution")
+@click.option("--stage3-cagr", type=str, default="0.05", callback=_distribution, help="Terminal growth distribution")
+@click.option("--discount-rate", type=str, default="0.08", callback=_distribution, help="Discount rate distribution")
+@click.option("--long-term-debt", type=int, required=True)
+@click.option("--shares-outstanding", type=int, required=True)
+@click.option("--share-par-value", type=int, default=10)
+@click.option("--paths", type=int, default=100_000, help="Number of Monte Carlo paths")
+@click.option("--seed", type=int, default=0, help="Random seed (results independent of --workers)")
+@click.option("--chunk-size", type=int, default=100_000, help="Paths per chunk (bounds memory)")
+@click.option("--workers", type=int, default=1, help="Worker processes")
+@click.option("--percentiles", type=str, default="5,25,50,75,95")
+@click.option("--price", type=float, help="Current price: report probability IV exceeds it")
+def simulate_cmd(latest_oe, cagr, cc, stage2_cagr, stage3_cagr, discount_rate, long_term_debt,
+                 shares_outstanding, share_par_value, paths, seed, chunk_size, workers,
+                 percentiles, price):
+    """Monte Carlo distribution of IV per share."""
+    from ivco_calc.simulate import simulate_iv
+    try:
+        pcts = tuple(float(p) for p in percentiles.split(","))
+    except ValueError:
+        raise click.BadParameter("comma-separated numbers", param_hint="--percentiles")
+    result = simulate_iv(
+        latest_oe=latest_oe,
+        cagr=cagr,
+        cc=cc,
+        stage2_cagr=stage2_cagr,
+        stage3_cagr=stage3_cagr,
+        discount_rate=discount_rate,
+        long_term_debt=long_term_debt,
+        shares_outstanding_raw=shares_outstanding,
+        share_par_value=share_par_value,
+        paths=paths,
+        seed=seed,
+        chunk_size=chunk_size,
+        workers=workers,
+        percentiles=pcts,
+        current_price=price,
+    )
+    output_json(result)
@@ -0,0 +1,101 @@
+"""`ivco store`: local statement store (import, query) and the Postgres sink."""
+import json
+
+import click
+
+from ivco_calc.cli import fail, output_json
+
+@click.group("store")
+def store_cmd():
+    """Local financial-statement store (SQLite)."""
+
+@store_cmd.command("import")
+@click.option("--input", "input_file", type=click.File("r"), default="-",
+              help="`ivco fetch` output: JSON object/array or NDJSON ('-' = stdin)")
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), help="Store path (default $IVCO_STORE)")
+def store_import_cmd(input_file, store_path):
+    """Import fetched statements into the store (upsert by ticker/year/period)."""
+    from ivco_calc.store import StatementStore
+    raw = input_file.read().strip()
+    try:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    except json.JSONDecodeError as e:
+        raise click.BadParameter(f"invalid JSON: {e}", param_hint="--input")
+    records = data if isinstance(data, list) else [data]
+
+    store = StatementStore(store_path)
+    imported, skipped = [], []
+    for record in records:
+        if "error" in record or not record.get("ticker"):
+            skipped.append({"ticker": record.get("ticker"), "error": record.get("error", "missing ticker")})
+            continue
+        imported.append(store.import_fetched(record))
+    output_json({"store": store.path, "imported": imported, "skipped": skipped})
+
+@store_cmd.command("query")
+@click.option("--ticker", type=str, help="Ticker to query (omit to list stored tickers)")
+@click.option("--table", type=click.Choice(["income", "balance", "quote"]), default="income")
+@click.option("--years", type=int, help="Most recent N years")
+@click.option("--start-year", type=int)
+@click.option("--end-year", type=int)
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), help="Store path (default $IVCO_STORE)")
+def store_query_cmd(ticker, table, years, start_year, end_year, store_path):
+    """Read statements back from the store."""
+    from ivco_calc.store import StatementStore
+    store = StatementStore(store_path)
+    if not ticker:
+        output_json(store.tickers())
+        return
+    if table == "quote":
+        quote = store.get_quote(ticker)
+        if quote is None:
+            fail(f"No quote stored for {ticker}")
+        output_json(quote)
+        return
+    rows = store.query(table, ticker, limit=years, start_year=start_year, end_year=end_year)
+    if not rows:
+        fail(f"No {table} data stored for {ticker}")
+    output_json(rows)
+
+@store_cmd.command("sink")
+@click.option("--input", "input_file", type=click.File("r"), default="-",
+              help="`ivco analyze` / `ivco screen` JSON, or screen --checkpoint NDJSON ('-' = stdin)")
+@click.option("--dsn", type=str, help="Postgres DSN (default $IVCO_PG_DSN or $DATABASE_URL)")
+@click.option("--batch-size", type=int, default=5000, help="Rows per COPY + upsert batch (default 5000)")
+@click.option("--currency", type=str, default="USD", help="Currency recorded on each row (default USD)")
+@click.option("--source", "source_label", type=str, help="Value for historical_owner_earnings.source")
+def store_sink_cmd(input_file, dsn, batch_size, currency, source_label):
+    """Upsert OE series and IV results into Postgres (historical_owner_earnings, iv_calculations)."""
+    from ivco_calc.sink import PostgresSink, default_dsn
+    dsn = dsn or default_dsn()
+    if not dsn:
+        fail("No Postgres DSN: pass --dsn or set IVCO_PG_DSN")
+    raw = input_file.read().strip()
+    try:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    except json.JSONDecodeError as e:
+        raise click.BadParameter(f"invalid JSON: {e}", param_hint="--input")
+    if isinstance(data, dict) and "ranked" in data:
+        records = data["ranked"]
+    else:
+        records = data if isinstance(data, list) else [data]
+
+    try:
+        sink = PostgresSink(dsn, batch_size=batch_size, currency=currency, source=source_label)
+    except ImportError:
+        fail("psycopg is required: pip install 'ivco-calc[pg]'")
+    except Exception as e:
+        fail(f"{type(e).__name__}: {e}")
+    try:
+        for record in records:
+            sink.add(record)
+        result = sink.close()
+    except Exception as e:
+        fail(f"{type(e).__name__}: {e}")
+    output_json(result)
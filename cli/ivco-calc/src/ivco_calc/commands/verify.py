@@ -0,0 +1,29 @@
+"""`ivco verify`: cross-check a computed IV range."""
+import click
+
+from ivco_calc.cli import BatchCommand, batch_option, output_json, run_batch
+from ivco_calc.verify import verify_iv_range
+
+def _verify(computed_low, computed_high, expected_low, expected_high, tolerance):
+    return verify_iv_range(
+        computed_low=computed_low, computed_high=computed_high,
+        expected_low=expected_low, expected_high=expected_high,
+        tolerance=tolerance,
+    )
+
+@click.command("verify", cls=BatchCommand)
+@click.option("--computed-low", type=int, required=True)
+@click.option("--computed-high", type=int, required=True)
+@click.option("--expected-low", type=int, required=True)
+@click.option("--expected-high", type=int, required=True)
+@click.option("--tolerance", type=int, default=0)
+@batch_option
+@click.pass_context
+def verify_cmd(ctx, computed_low, computed_high, expected_low, expected_high, tolerance, batch):
+    """Verify computed IV Range against expected values."""
+    if batch:
+        return run_batch(ctx, _verify)  # FAIL is a result here, not an exit status
+    result = _verify(computed_low, computed_high, expected_low, expected_high, tolerance)
+    output_json(result)
+    if result["status"] == "FAIL":
+        raise SystemExit(1)
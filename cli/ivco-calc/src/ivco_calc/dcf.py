@@ -11,7 +11,15 @@ Three-Stage DCF:
   Stage 3 (year 11+): Perpetuity with low growth, discounted to year 11
 
 IV_per_share = round((DCF_Sum - Long_Term_Debt) * share_par_value / shares_outstanding_raw)
+
+Each explicit stage is a geometric series, so fast mode sums it in closed
+form (q + q^2 + ... + q^n with q = (1 + g) / (1 + r)) instead of
+compounding year by year, and skips the per-year breakdown. The two paths
+add the same terms in a different order, so fast dcf_sum agrees with the loop
+to a relative 1e-11 rather than exactly: it can be off by a few units after
+rounding, and iv_per_share by 1 when it sits on a rounding boundary.
 """
+import math
 
 
 def _calc_dcf_stages(
@@ -51,6 +59,48 @@ def _calc_dcf_stages(
     return {"yearly_values": yearly_values, "dcf_sum": round(dcf_sum)}
 
 
+def _geometric_sum(growth: float, discount_rate: float, n: int) -> float:
+    """q + q^2 + ... + q^n with q = (1 + growth) / (1 + discount_rate).
+
+    q - 1 is taken as (growth - r) / (1 + r) and q^n - 1 via expm1/log1p, so
+    the sum stays accurate when q is close to 1 (q * (1 - q^n) / (1 - q)
+    cancels catastrophically there). growth <= -1 puts q <= 0 outside
+    log1p's domain; the n powers are summed directly then.
+    """
+    rate = 1 + discount_rate
+    d = (growth - discount_rate) / rate
+    if d == 0.0:
+        return float(n)
+    if d <= -1.0:
+        q = (1 + growth) / rate
+        return sum(q ** k for k in range(1, n + 1))
+    return (1 + growth) / rate * math.expm1(n * math.log1p(d)) / d
+
+
+def _calc_dcf_sum_closed_form(
+    latest_oe: int,
+    stage1_cagr: float,
+    stage2_cagr: float,
+    stage3_cagr: float,
+    discount_rate: float,
+) -> dict:
+    """Calculate the DCF sum with geometric-series closed forms (no yearly detail)."""
+    rate = 1 + discount_rate
+    q1 = (1 + stage1_cagr) / rate
+    q2 = (1 + stage2_cagr) / rate
+
+    # Stage 1: sum_{t=1..5} OE * q1^t
+    stage1 = latest_oe * _geometric_sum(stage1_cagr, discount_rate, 5)
+    # Stage 2: OE_5 / (1+r)^5 * sum_{k=1..5} q2^k
+    discounted_oe5 = latest_oe * q1 ** 5
+    stage2 = discounted_oe5 * _geometric_sum(stage2_cagr, discount_rate, 5)
+    # Stage 3: OE_10 * (1+g3) / (r - g3), discounted by (1+r)^11
+    discounted_oe10 = discounted_oe5 * q2 ** 5
+    stage3 = discounted_oe10 * (1 + stage3_cagr) / (discount_rate - stage3_cagr) / rate
+
+    return {"dcf_sum": round(stage1 + stage2 + stage3)}
+
+
 def calc_three_stage_dcf(
     latest_oe: int,
     cagr: float,
@@ -62,6 +112,7 @@ def calc_three_stage_dcf(
     long_term_debt: int,
     shares_outstanding_raw: int,
     share_par_value: int = 10,
+    fast: bool = False,
 ) -> dict:
     """Full three-stage DCF calculation.
 
@@ -76,6 +127,8 @@ def calc_three_stage_dcf(
         long_term_debt: Long-term debt (bonds + long-term loans).
         shares_outstanding_raw: Raw share capital from financial statements.
         share_par_value: Par value per share (10 for Taiwan stocks).
+        fast: Use closed-form stage sums and omit dcf_low_detail/dcf_high_detail
+            (dcf_sum within a relative 1e-11 of the loop, see module docstring).
 
     Returns:
         Dict with full DCF breakdown and IV Range.
@@ -91,8 +144,9 @@ def calc_three_stage_dcf(
     stage1_cagr_low = cagr * cc_low
     stage1_cagr_high = cagr * cc_high
 
-    low = _calc_dcf_stages(latest_oe, stage1_cagr_low, stage2_cagr, stage3_cagr, discount_rate)
-    high = _calc_dcf_stages(latest_oe, stage1_cagr_high, stage2_cagr, stage3_cagr, discount_rate)
+    calc_stages = _calc_dcf_sum_closed_form if fast else _calc_dcf_stages
+    low = calc_stages(latest_oe, stage1_cagr_low, stage2_cagr, stage3_cagr, discount_rate)
+    high = calc_stages(latest_oe, stage1_cagr_high, stage2_cagr, stage3_cagr, discount_rate)
 
     iv_total_low = low["dcf_sum"] - long_term_debt
     iv_total_high = high["dcf_sum"] - long_term_debt
@@ -100,7 +154,7 @@ def calc_three_stage_dcf(
     iv_per_share_low = round(iv_total_low * share_par_value / shares_outstanding_raw)
     iv_per_share_high = round(iv_total_high * share_par_value / shares_outstanding_raw)
 
-    return {
+    result = {
         "stage1_cagr_low": round(stage1_cagr_low, 4),
         "stage1_cagr_high": round(stage1_cagr_high, 4),
         "stage2_cagr": stage2_cagr,
@@ -115,6 +169,8 @@ def calc_three_stage_dcf(
         "share_par_value": share_par_value,
         "iv_per_share_low": iv_per_share_low,
         "iv_per_share_high": iv_per_share_high,
-        "dcf_low_detail": low["yearly_values"],
-        "dcf_high_detail": high["yearly_values"],
     }
+    if not fast:
+        result["dcf_low_detail"] = low["yearly_values"]
+        result["dcf_high_detail"] = high["yearly_values"]
+    return result
@@ -0,0 +1,152 @@
+"""Persistent on-disk HTTP response cache for financial data fetchers.
+
+One JSON file per (endpoint, ticker, limit) — the API key is never part of
+the key or the stored entry. Entries carry the response ETag/Last-Modified
+so stale entries can be revalidated with a conditional request, and the
+directory is kept under max_bytes by evicting least-recently-used files
+(reads bump the file mtime).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DAY = 24 * 60 * 60
+DEFAULT_TTLS = {
+    "income-statement": 30 * DAY,
+    "balance-sheet-statement": 30 * DAY,
+    "cash-flow-statement": 30 * DAY,
+    "quote": 5 * 60,
+}
+DEFAULT_TTL = DAY
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """$IVCO_CACHE_DIR, else $XDG_CACHE_HOME/ivco, else ~/.cache/ivco."""
+    base = os.environ.get("IVCO_CACHE_DIR")
+    if base:
+        return base
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(xdg, "ivco")
+
+
+class CacheMiss(LookupError):
+    """Offline mode and the response is not cached."""
+
+
+class ResponseCache:
+    """TTL + ETag + size-bounded LRU response cache."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        ttls: dict[str, int] | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = os.path.join(directory or default_cache_dir(), "http")
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(endpoint: str, ticker: str, limit: int | None) -> str:
+        raw = f"{endpoint}|{ticker.upper()}|{limit if limit is not None else ''}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def ttl(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, endpoint: str, ticker: str, limit: int | None) -> dict | None:
+        """Return the cached entry (fresh or stale), or None."""
+        path = self._path(self.key(endpoint, ticker, limit))
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)  # LRU: mark as recently used
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl(entry["endpoint"])
+
+    def put(
+        self,
+        endpoint: str,
+        ticker: str,
+        limit: int | None,
+        body: list | dict,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> dict:
+        entry = {
+            "endpoint": endpoint,
+            "ticker": ticker.upper(),
+            "limit": limit,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        self._write(entry)
+        self._evict()
+        return entry
+
+    def refresh(self, entry: dict) -> dict:
+        """Mark a revalidated (HTTP 304) entry as fresh again."""
+        entry = {**entry, "fetched_at": time.time()}
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(self.key(entry["endpoint"], entry["ticker"], entry["limit"]))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        files = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(".json"):
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:  # evicted by another thread or process
+                        continue
+                    files.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> int:
+        """Remove every cached response. Returns the number of entries removed."""
+        removed = 0
+        if not os.path.isdir(self.directory):
+            return 0
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(".json"):
+                    try:
+                        os.unlink(e.path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+        return removed
@@ -1,28 +1,98 @@
 """Financial Modeling Prep (FMP) API fetcher — free tier."""
 import os
 import json
-from urllib.request import urlopen, Request
-from urllib.error import URLError
 from ivco_calc.fetchers.base import BaseFetcher
+from ivco_calc.fetchers.cache import CacheMiss, ResponseCache
+from ivco_calc.fetchers.pool import HTTPConnectionPool
+from ivco_calc.fetchers.ratelimit import RateLimiter
 
 
 class FMPFetcher(BaseFetcher):
-    """FMP API v3 client. Free tier: 250 requests/day."""
+    """FMP API v3 client. Free tier: 250 requests/day.
+
+    With a ResponseCache, responses are served from disk while fresh and
+    revalidated with If-None-Match / If-Modified-Since once stale; if that
+    request fails (HTTP error status or network error) the stale entry is
+    served instead. In offline mode only the cache is consulted (stale
+    entries included) and no API key is needed.
+
+    Network requests share one keep-alive connection pool (safe to use from
+    several threads) and, if given, draw from a RateLimiter budget; cache
+    hits never touch the budget.
+    """
 
     BASE_URL = "https://financialmodelingprep.com/api/v3"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: ResponseCache | None = None,
+        offline: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        pool: HTTPConnectionPool | None = None,
+    ):
         self.api_key = api_key or os.environ.get("FMP_API_KEY", "")
-        if not self.api_key:
+        self.cache = cache
+        self.offline = offline
+        self.rate_limiter = rate_limiter
+        self.pool = pool or HTTPConnectionPool(self.BASE_URL)
+        if offline and cache is None:
+            raise ValueError("Offline mode requires a response cache")
+        if not self.api_key and not offline:
             raise ValueError("FMP_API_KEY not set. Get free key at financialmodelingprep.com")
 
     def build_url(self, ticker: str, endpoint: str, limit: int = 10) -> str:
         return f"{self.BASE_URL}/{endpoint}/{ticker}?limit={limit}&apikey={self.api_key}"
 
+    def _open(self, url: str, headers: dict | None = None) -> tuple[int, list | dict | None, dict]:
+        """GET url. Returns (status, parsed JSON or None on 304, response headers)."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        status, resp_headers, body = self.pool.request(
+            url, {"User-Agent": "IVCO-CLI/0.2.0", **(headers or {})})
+        if status == 304:
+            return 304, None, resp_headers
+        return status, json.loads(body.decode()), resp_headers
+
     def _get_json(self, url: str) -> list | dict:
-        req = Request(url, headers={"User-Agent": "IVCO-CLI/0.2.0"})
-        with urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read().decode())
+        return self._open(url)[1]
+
+    def _fetch(self, endpoint: str, ticker: str, limit: int | None, url: str) -> list | dict:
+        """GET through the response cache (if any)."""
+        if self.cache is None:
+            return self._get_json(url)
+
+        entry = self.cache.get(endpoint, ticker, limit)
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            return entry["body"]
+        if self.offline:
+            raise CacheMiss(f"{endpoint} for {ticker} not cached (offline mode)")
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            status, body, resp_headers = self._open(url, headers)
+        except OSError:
+            # HTTPError (429/5xx) or the network: a stale entry beats no answer
+            if entry is None:
+                raise
+            return entry["body"]
+        if status == 304 and entry is not None:
+            return self.cache.refresh(entry)["body"]
+        if status != 200 or not isinstance(body, list) or not body:
+            # FMP reports errors ("Limit Reach", bad key) as 200 + dict, and unknown
+            # tickers as []: never cache those, and prefer a stale good entry to them
+            return entry["body"] if entry is not None else body
+        self.cache.put(
+            endpoint, ticker, limit, body,
+            etag=resp_headers.get("ETag"),
+            last_modified=resp_headers.get("Last-Modified"),
+        )
+        return body
 
     def parse_income_statement(self, raw: dict) -> dict:
         """Parse FMP income statement into IVCO format."""
@@ -45,14 +115,14 @@ class FMPFetcher(BaseFetcher):
 
     def fetch_income_statements(self, ticker: str, limit: int = 10) -> list[dict]:
         url = self.build_url(ticker, "income-statement", limit)
-        raw_list = self._get_json(url)
+        raw_list = self._fetch("income-statement", ticker, limit, url)
         if not isinstance(raw_list, list):
             return []
         return [self.parse_income_statement(r) for r in raw_list]
 
     def fetch_balance_sheet(self, ticker: str, limit: int = 10) -> list[dict]:
         url = self.build_url(ticker, "balance-sheet-statement", limit)
-        raw_list = self._get_json(url)
+        raw_list = self._fetch("balance-sheet-statement", ticker, limit, url)
         if not isinstance(raw_list, list):
             return []
         return [
@@ -68,7 +138,7 @@ class FMPFetcher(BaseFetcher):
 
     def fetch_quote(self, ticker: str) -> dict:
         url = f"{self.BASE_URL}/quote/{ticker}?apikey={self.api_key}"
-        data = self._get_json(url)
+        data = self._fetch("quote", ticker, None, url)
         if isinstance(data, list) and data:
             q = data[0]
             return {
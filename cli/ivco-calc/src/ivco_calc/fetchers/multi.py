@@ -0,0 +1,49 @@
+"""Concurrent multi-ticker fetching."""
+from concurrent.futures import ThreadPoolExecutor
+
+from ivco_calc.fetchers.base import BaseFetcher
+
+
+def fetch_ticker(fetcher: BaseFetcher, ticker: str, years: int = 10) -> dict:
+    """Income statements, balance sheet and quote for one ticker."""
+    return {
+        "ticker": ticker,
+        "income_statements": fetcher.fetch_income_statements(ticker, limit=years),
+        "balance_sheet": fetcher.fetch_balance_sheet(ticker, limit=years),
+        "quote": fetcher.fetch_quote(ticker),
+    }
+
+
+def fetch_many(fetcher: BaseFetcher, tickers: list[str], years: int = 10, max_workers: int = 4) -> list[dict]:
+    """Fetch several tickers concurrently with one shared fetcher.
+
+    Results keep the input order. A failing ticker yields {"ticker", "error"}
+    instead of aborting the others.
+    """
+    def one(ticker: str) -> dict:
+        try:
+            return fetch_ticker(fetcher, ticker, years)
+        except Exception as e:  # reported per ticker
+            return {"ticker": ticker, "error": f"{type(e).__name__}: {e}"}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return list(pool.map(one, tickers))
+
+
+def read_tickers(tickers: str | None = None, tickers_file: str | None = None) -> list[str]:
+    """Tickers from a comma list and/or a file (one per line, '#' comments)."""
+    result = []
+    if tickers:
+        result += [t.strip() for t in tickers.split(",") if t.strip()]
+    if tickers_file:
+        with open(tickers_file, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    result.append(line)
+    unique, seen = [], set()
+    for t in result:
+        if t.upper() not in seen:
+            seen.add(t.upper())
+            unique.append(t)
+    return unique
@@ -0,0 +1,83 @@
+"""Keep-alive HTTP(S) connection pool for a single API host."""
+import http.client
+import queue
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+# Raised when reusing a keep-alive connection the server already closed
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of persistent connections to one scheme://host:port.
+
+    Connections are reused across requests (HTTP/1.1 keep-alive). A request
+    on a connection the server has meanwhile closed is retried once on a
+    fresh connection.
+    """
+
+    def __init__(self, base_url: str, max_size: int = 4, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _send(self, path: str, headers: dict, fresh: bool = False):
+        conn = self._new_connection() if fresh else self._checkout()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            return conn, resp, resp.read()
+        except BaseException:
+            conn.close()
+            raise
+
+    def request(self, url: str, headers: dict | None = None) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """GET url. Returns (status, headers, body); raises HTTPError for status >= 400.
+
+        Response headers are an HTTPMessage (case-insensitive .get()).
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        try:
+            conn, resp, body = self._send(path, headers or {})
+        except _STALE_CONNECTION_ERRORS:
+            conn, resp, body = self._send(path, headers or {}, fresh=True)
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        if resp.status >= 400:
+            raise HTTPError(url, resp.status, resp.reason, resp.msg, None)
+        return resp.status, resp.msg, body
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,75 @@
+"""Token-bucket rate limiter shared across processes.
+
+Bucket state (tokens, last refill, per-day request count) lives in a small
+JSON file guarded by an exclusive flock, so parallel cron jobs and threads
+draw from the same requests-per-second and requests-per-day budget.
+"""
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class QuotaExceeded(RuntimeError):
+    """The per-day request budget is spent."""
+
+
+class RateLimiter:
+    """Blocking token bucket: `rate` requests/second (burst `rate`), `per_day` per UTC day."""
+
+    def __init__(self, state_path: str, rate: float = 5.0, per_day: int = 250):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.state_path = state_path
+        self.rate = rate
+        self.per_day = per_day
+        self.capacity = max(1.0, rate)
+
+    @contextmanager
+    def _locked_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        with open(self.state_path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.state_path, "r") as f:
+                        state = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    state = {}
+                yield state
+                tmp = f"{self.state_path}.{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp, self.state_path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available. Raises QuotaExceeded."""
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+                if state.get("day") != today:
+                    state["day"], state["day_count"] = today, 0
+                if state["day_count"] >= self.per_day:
+                    raise QuotaExceeded(f"Daily request budget of {self.per_day} spent for {today} (UTC)")
+                elapsed = max(0.0, now - state.get("updated", now))
+                tokens = min(self.capacity, state.get("tokens", self.capacity) + elapsed * self.rate)
+                state["updated"] = now
+                if tokens >= 1:
+                    state["tokens"] = tokens - 1
+                    state["day_count"] += 1
+                    return
+                state["tokens"] = tokens
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+    def usage(self) -> dict:
+        """Requests used today and remaining daily budget."""
+        with self._locked_state() as state:
+            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            used = state.get("day_count", 0) if state.get("day") == today else 0
+        return {"day": today, "used": used, "remaining": max(0, self.per_day - used)}
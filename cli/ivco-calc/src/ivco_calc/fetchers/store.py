@@ -0,0 +1,22 @@
+"""Fetcher backed by the local statement store (no network)."""
+from ivco_calc.fetchers.base import BaseFetcher
+from ivco_calc.store import QUOTE_COLUMNS, StatementStore
+
+
+class StoreFetcher(BaseFetcher):
+    """Serves statements imported with `ivco store import`, in FMPFetcher's format."""
+
+    def __init__(self, store: StatementStore | None = None):
+        self.store = store or StatementStore()
+
+    def fetch_income_statements(self, ticker: str, limit: int = 10) -> list[dict]:
+        return self.store.query("income", ticker, limit=limit)
+
+    def fetch_balance_sheet(self, ticker: str, limit: int = 10) -> list[dict]:
+        return self.store.query("balance", ticker, limit=limit)
+
+    def fetch_quote(self, ticker: str) -> dict:
+        row = self.store.get_quote(ticker)
+        if row is None:
+            return {"ticker": ticker, "price": 0, "pe": 0, "market_cap": 0, "change_pct": 0}
+        return {"ticker": row["ticker"], **{c: row[c] for c in QUOTE_COLUMNS}}
@@ -0,0 +1,181 @@
+"""Content-addressed memoization of valuation results.
+
+A result is keyed by a hash of its canonicalised inputs (OE series, the
+Allen framework parameters, shares, debt), so identical calculations are
+served from cache and any change to an input is a different key — there is
+nothing to invalidate. Lookups go to an in-process LRU first (microseconds
+for long-lived callers), then to a SQLite file shared across processes.
+`analyze --source store` also keys on the store's per-ticker revision, which
+every import bumps, so it can skip reading statements altogether.
+
+Keys never go stale, so the disk tier is bounded instead: every write drops
+entries older than max_age and then the oldest beyond max_entries.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from ivco_calc.fetchers.cache import default_cache_dir
+
+MEMO_VERSION = 1
+DEFAULT_MAXSIZE = 4096
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _canonical(value):
+    """JSON-stable form: integral floats as ints (10.0 and 10 hash alike), other floats by repr."""
+    if isinstance(value, float):
+        if math.isfinite(value) and value.is_integer():
+            return int(value)
+        return repr(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+_SCALARS = (int, float, str, bool, type(None))
+
+
+def _freeze(value):
+    """Hashable form for the in-process LRU key (cheaper than hashing JSON)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, v if isinstance(v, _SCALARS) else _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(v if isinstance(v, _SCALARS) else _freeze(v) for v in value)
+    return value
+
+
+def input_key(kind: str, inputs: dict) -> str:
+    """Hash of (kind, canonicalised inputs)."""
+    payload = json.dumps([MEMO_VERSION, kind, _canonical(inputs)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoCache:
+    """In-process LRU in front of an optional on-disk (SQLite) tier.
+
+    LRU hits return the cached object itself — no copy, so treat results as
+    read-only. Values must be JSON-serialisable for the disk tier.
+    """
+
+    def __init__(self, path: str | None = None, maxsize: int = DEFAULT_MAXSIZE, disk: bool = True,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_age: float = DEFAULT_MAX_AGE):
+        self.maxsize = maxsize
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lru: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+        self.path = (path or os.path.join(default_cache_dir(), "memo.db")) if disk else None
+        self._local = threading.local()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created_at)")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key: str, value) -> None:
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def _lru_get(self, key):
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+                self.stats["hits"] += 1
+            return value
+
+    def get(self, key: str):
+        value = self._lru_get(key)
+        if value is not None:
+            return value
+        if self.path is not None:
+            row = self._conn().execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = json.loads(row[0])
+                self._remember(key, value)
+                self.stats["disk_hits"] += 1
+                return value
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, kind: str, value) -> None:
+        self._remember(key, value)
+        if self.path is not None:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                             (key, kind, json.dumps(value), time.time()))
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> int:
+        """Drop disk entries older than max_age, then the oldest beyond max_entries."""
+        removed = conn.execute("DELETE FROM results WHERE created_at < ?",
+                               (time.time() - self.max_age,)).rowcount
+        cutoff = conn.execute("SELECT created_at FROM results ORDER BY created_at DESC LIMIT 1 OFFSET ?",
+                              (self.max_entries,)).fetchone()
+        if cutoff is not None:
+            removed += conn.execute("DELETE FROM results WHERE created_at <= ?", cutoff).rowcount
+        return removed
+
+    def memoize(self, kind: str, inputs: dict, compute):
+        """compute() on a miss, cached result otherwise. Exceptions are not cached.
+
+        The LRU is keyed by the frozen inputs themselves; the content hash is
+        only computed when the disk tier is consulted.
+        """
+        fast_key = (kind, _freeze(inputs))
+        value = self._lru_get(fast_key)
+        if value is not None:
+            return value
+        key = input_key(kind, inputs) if self.path is not None else None
+        value = self.get(key) if key is not None else None
+        if value is None:
+            if key is None:
+                self.stats["misses"] += 1  # get() counts disk-tier misses
+            value = compute()
+            if key is not None:
+                self.put(key, kind, value)
+        self._remember(fast_key, value)
+        return value
+
+    def clear(self) -> int:
+        """Drop every entry (both tiers); returns how many disk entries were removed."""
+        with self._lock:
+            self._lru.clear()
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM results").rowcount
+
+
+_default: dict[str | None, MemoCache] = {}
+
+
+def default_memo(disk: bool = True) -> MemoCache:
+    """Process-wide cache (one per disk path), so repeated calls in one process hit the LRU."""
+    path = os.path.join(default_cache_dir(), "memo.db") if disk else None
+    if path not in _default:
+        _default[path] = MemoCache(path, disk=disk)
+    return _default[path]
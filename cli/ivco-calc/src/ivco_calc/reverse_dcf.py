@@ -0,0 +1,193 @@
+"""Reverse DCF — market-implied stage-1 CAGR or discount rate.
+
+Solves closed-form IV_per_share(x) = price for x, where x is either the
+stage-1 CAGR (IV increases with it) or the discount rate (IV decreases with
+it). The solver is a vectorized Illinois (modified regula falsi) iteration on
+a fixed bracket: every ticker in a batch is solved in the same NumPy pass,
+and each converges superlinearly without derivatives.
+
+Rows whose price lies outside the IV range spanned by the bracket get NaN
+and converged=False rather than an extrapolated answer.
+"""
+import numpy as np
+
+from ivco_calc.dcf_batch import calc_iv_per_share_closed_form
+
+SOLVE_FOR = ("cagr", "discount_rate")
+CAGR_BRACKET = (-0.95, 2.0)
+DISCOUNT_RATE_MAX = 1.0
+_RATE_EPSILON = 1e-6
+
+
+def _illinois(f, lo: np.ndarray, hi: np.ndarray, xtol: float, max_iter: int) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized Illinois root finder on [lo, hi]. Returns (root, converged)."""
+    a, b = lo.copy(), hi.copy()
+    fa, fb = f(a), f(b)
+    bracketed = np.isfinite(fa) & np.isfinite(fb) & (np.sign(fa) != np.sign(fb))
+    x = np.where(fa == 0, a, b)
+    done = ~bracketed | (fa == 0) | (fb == 0)
+    side = np.zeros(a.shape, dtype=np.int8)
+
+    for _ in range(max_iter):
+        if done.all():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_new = (a * fb - b * fa) / (fb - fa)
+        x = np.where(done, x, x_new)
+        fx = f(x)
+        same_as_b = np.sign(fx) == np.sign(fb)
+        # Root between a and x: move b; halve fa if b moved twice in a row
+        move_b = ~done & same_as_b
+        fa = np.where(move_b & (side == 1), fa / 2, fa)
+        b, fb = np.where(move_b, x, b), np.where(move_b, fx, fb)
+        # Root between x and b: move a; halve fb if a moved twice in a row
+        move_a = ~done & ~same_as_b
+        fb = np.where(move_a & (side == -1), fb / 2, fb)
+        a, fa = np.where(move_a, x, a), np.where(move_a, fx, fa)
+        side = np.where(move_b, 1, np.where(move_a, -1, side))
+        done |= (np.abs(b - a) <= xtol) | (fx == 0)
+
+    converged = bracketed & done
+    return np.where(converged, x, np.nan), converged
+
+
+def solve_implied_batch(
+    price,
+    latest_oe,
+    stage2_cagr,
+    stage3_cagr,
+    long_term_debt,
+    shares_outstanding_raw,
+    share_par_value=10,
+    solve_for: str = "cagr",
+    discount_rate=0.08,
+    stage1_cagr=None,
+    xtol: float = 1e-10,
+    max_iter: int = 100,
+) -> dict:
+    """Market-implied stage-1 CAGR or discount rate for arrays of tickers.
+
+    Args:
+        price: Current market price per share.
+        latest_oe, stage2_cagr, stage3_cagr, long_term_debt, shares_outstanding_raw,
+        share_par_value: as in calc_three_stage_dcf.
+        solve_for: "cagr" (uses discount_rate) or "discount_rate" (uses stage1_cagr,
+            i.e. CAGR x CC).
+        xtol: Absolute tolerance on the solved rate.
+
+    Returns:
+        {"implied": float array (NaN when not bracketed), "converged": bool array}.
+    """
+    if solve_for not in SOLVE_FOR:
+        raise ValueError(f"solve_for must be one of {SOLVE_FOR}, got '{solve_for}'")
+    (price, latest_oe, stage2_cagr, stage3_cagr, long_term_debt, shares_outstanding_raw,
+     share_par_value, discount_rate) = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64),
+        np.asarray(latest_oe, dtype=np.float64),
+        np.asarray(stage2_cagr, dtype=np.float64),
+        np.asarray(stage3_cagr, dtype=np.float64),
+        np.asarray(long_term_debt, dtype=np.float64),
+        np.asarray(shares_outstanding_raw, dtype=np.float64),
+        np.asarray(share_par_value, dtype=np.float64),
+        np.asarray(discount_rate, dtype=np.float64),
+    )
+    if (shares_outstanding_raw <= 0).any():
+        raise ValueError("shares_outstanding_raw must be positive for every ticker")
+
+    def iv(stage1, rate):
+        return calc_iv_per_share_closed_form(
+            latest_oe, stage1, stage2_cagr, stage3_cagr, rate,
+            long_term_debt, shares_outstanding_raw, share_par_value,
+        )
+
+    if solve_for == "cagr":
+        if (discount_rate <= stage3_cagr).any():
+            raise ValueError("discount_rate must exceed stage3_cagr for Gordon Growth Model perpetuity")
+        lo = np.full(price.shape, CAGR_BRACKET[0])
+        hi = np.full(price.shape, CAGR_BRACKET[1])
+        implied, converged = _illinois(lambda g: iv(g, discount_rate) - price, lo, hi, xtol, max_iter)
+    else:
+        if stage1_cagr is None:
+            raise ValueError("stage1_cagr is required when solving for discount_rate")
+        stage1 = np.broadcast_to(np.asarray(stage1_cagr, dtype=np.float64), price.shape)
+        lo = stage3_cagr + _RATE_EPSILON
+        hi = np.maximum(np.full(price.shape, DISCOUNT_RATE_MAX), lo + _RATE_EPSILON)
+        implied, converged = _illinois(lambda r: iv(stage1, r) - price, lo, hi, xtol, max_iter)
+
+    return {"implied": implied, "converged": converged}
+
+
+def solve_implied(price: float, **kwargs) -> dict:
+    """Scalar convenience wrapper around solve_implied_batch."""
+    result = solve_implied_batch(price, **kwargs)
+    implied = float(result["implied"])
+    return {
+        "implied": None if np.isnan(implied) else implied,
+        "converged": bool(result["converged"]),
+    }
+
+
+RECORD_DEFAULTS = {
+    "cc": 1.0,
+    "stage2_cagr": 0.15,
+    "stage3_cagr": 0.05,
+    "discount_rate": 0.08,
+    "long_term_debt": 0,
+    "share_par_value": 10,
+}
+REQUIRED_FIELDS = ("price", "latest_oe", "shares_outstanding")
+
+
+def reverse_dcf_records(records: list[dict], solve_for: str = "cagr", defaults: dict | None = None) -> list[dict]:
+    """Solve a whole ticker list in one vectorized pass.
+
+    Each record carries price, latest_oe, shares_outstanding and optionally
+    ticker, cagr, cc, stage2_cagr, stage3_cagr, discount_rate, long_term_debt,
+    share_par_value (falling back to `defaults`, then RECORD_DEFAULTS).
+    Solving for discount_rate needs cagr (stage-1 CAGR = cagr x cc).
+    """
+    base = {**RECORD_DEFAULTS, **(defaults or {})}
+    rows = [{**base, **{k: v for k, v in r.items() if v is not None}} for r in records]
+    for i, row in enumerate(rows):
+        missing = [f for f in REQUIRED_FIELDS if row.get(f) is None]
+        if solve_for == "discount_rate" and row.get("cagr") is None:
+            missing.append("cagr")
+        if missing:
+            raise ValueError(f"Record {i} ({row.get('ticker', '?')}) missing: {', '.join(missing)}")
+    if not rows:
+        return []
+
+    def column(name):
+        return np.array([row[name] for row in rows], dtype=np.float64)
+
+    cagr = np.array([np.nan if row.get("cagr") is None else row["cagr"] for row in rows])
+    cc = column("cc")
+    solved = solve_implied_batch(
+        price=column("price"),
+        latest_oe=column("latest_oe"),
+        stage2_cagr=column("stage2_cagr"),
+        stage3_cagr=column("stage3_cagr"),
+        long_term_debt=column("long_term_debt"),
+        shares_outstanding_raw=column("shares_outstanding"),
+        share_par_value=column("share_par_value"),
+        solve_for=solve_for,
+        discount_rate=column("discount_rate"),
+        stage1_cagr=cagr * cc,
+    )
+
+    results = []
+    for i, row in enumerate(rows):
+        implied = float(solved["implied"][i])
+        implied = None if np.isnan(implied) else implied
+        out = {"price": row["price"], "solve_for": solve_for, "converged": bool(solved["converged"][i])}
+        if "ticker" in row:
+            out = {"ticker": row["ticker"], **out}
+        if solve_for == "cagr":
+            out["implied_stage1_cagr"] = implied
+            if row.get("cagr") and implied is not None:
+                out["implied_cc"] = implied / row["cagr"]
+        else:
+            out["stage1_cagr"] = row["cagr"] * row["cc"]
+            out["implied_discount_rate"] = implied
+        results.append(out)
+    return results
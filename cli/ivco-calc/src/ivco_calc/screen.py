@@ -0,0 +1,208 @@
+"""Universe-wide screen: analyze every ticker, rank by margin of safety.
+
+Network fetches run on a thread pool; as each ticker's statements arrive,
+valuation (analyze_financials) is handed to a process pool, so I/O and
+compute overlap. Every finished ticker — success or failure — is appended
+to an NDJSON checkpoint as it completes; re-running with the same
+checkpoint skips tickers already valued and retries only the failures.
+
+margin_of_safety = (iv_per_share_low - price) / iv_per_share_low
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+
+from ivco_calc.analyze import DEFAULT_PARAMETERS, REQUIRED_PARAMETERS, analyze_financials
+from ivco_calc.fetchers.base import BaseFetcher
+from ivco_calc.fetchers.multi import fetch_ticker
+
+PARAMETER_KEYS = tuple(REQUIRED_PARAMETERS) + tuple(DEFAULT_PARAMETERS)
+
+
+def load_universe(path: str) -> list[dict]:
+    """Universe file: JSON array, NDJSON, or one ticker per line ('#' comments).
+
+    JSON entries are a ticker string or {"ticker": ..., <parameter overrides>}.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    stripped = text.strip()
+    if stripped.startswith("["):
+        entries = json.loads(stripped)
+    elif stripped.startswith("{"):
+        entries = [json.loads(line) for line in stripped.splitlines() if line.strip()]
+    else:
+        entries = [line.split("#", 1)[0].strip() for line in text.splitlines()]
+        entries = [e for e in entries if e]
+    universe = []
+    for entry in entries:
+        entry = {"ticker": entry} if isinstance(entry, str) else dict(entry)
+        if not entry.get("ticker"):
+            raise ValueError(f"Universe entry without ticker: {entry}")
+        universe.append(entry)
+    return universe
+
+
+def margin_of_safety(iv_per_share_low: float | None, price: float | None) -> float | None:
+    if not iv_per_share_low or iv_per_share_low <= 0 or not price:
+        return None
+    return (iv_per_share_low - price) / iv_per_share_low
+
+
+def value_ticker(ticker: str, fetched: dict, params: dict) -> dict:
+    """Valuation step for one ticker (runs in a worker process)."""
+    if not fetched["income_statements"]:
+        raise ValueError(f"No income data found for {ticker}")
+    result = analyze_financials(
+        ticker, fetched["income_statements"], fetched["balance_sheet"], fetched["quote"], **params)
+    analysis = result["analysis"]
+    iv = analysis["iv"]
+    if "error" in iv:
+        raise ValueError(iv["error"])
+    price = analysis["current_price"]
+    return {
+        "ticker": ticker,
+        "current_price": price,
+        "iv_per_share_low": iv["iv_per_share_low"],
+        "iv_per_share_high": iv["iv_per_share_high"],
+        "margin_of_safety": margin_of_safety(iv["iv_per_share_low"], price),
+        "cagr": analysis["cagr"]["cagr"],
+        "market_implied_stage1_cagr": analysis["market_implied_stage1_cagr"],
+        "parameters": result["parameters"],
+        # Kept for `ivco store sink` (historical_owner_earnings / iv_calculations)
+        "stage1_cagr_low": iv["stage1_cagr_low"],
+        "stage1_cagr_high": iv["stage1_cagr_high"],
+        "long_term_debt": iv["long_term_debt"],
+        "shares_outstanding": iv["shares_outstanding"],
+        "oe_series": analysis["oe_series"],
+    }
+
+
+def _load_checkpoint(path: str | None) -> dict[str, dict]:
+    """Successfully valued tickers from a previous (possibly interrupted) run."""
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted write
+            if "error" in record:
+                done.pop(record["ticker"], None)
+            else:
+                done[record["ticker"]] = record
+    return done
+
+
+def rank(rows: list[dict]) -> list[dict]:
+    """Sort by margin of safety (highest first; rows without one last) and number them."""
+    ordered = sorted(rows, key=lambda r: (r["margin_of_safety"] is None, -(r["margin_of_safety"] or 0)))
+    return [{"rank": i, **row} for i, row in enumerate(ordered, start=1)]
+
+
+def run_screen(
+    universe: list[dict],
+    fetcher: BaseFetcher,
+    defaults: dict,
+    years: int = 10,
+    io_workers: int = 8,
+    compute_workers: int = 0,
+    checkpoint_path: str | None = None,
+) -> dict:
+    """Analyze every ticker in the universe and rank by margin of safety.
+
+    Args:
+        universe: Entries {"ticker", optional parameter overrides and "years"}.
+        fetcher: Shared (thread-safe) fetcher.
+        defaults: Parameters for entries that do not override them.
+        io_workers: Concurrent fetches.
+        compute_workers: Valuation processes (0 = value in the main process).
+        checkpoint_path: NDJSON checkpoint enabling resume.
+
+    Returns:
+        {"ranked": [...], "errors": [...], "summary": {...}}.
+    """
+    done = _load_checkpoint(checkpoint_path)
+    todo = [e for e in universe if e["ticker"] not in done]
+    rows = [done[e["ticker"]] for e in universe if e["ticker"] in done]
+    errors = []
+
+    with ExitStack() as stack:
+        checkpoint = stack.enter_context(open(checkpoint_path, "a")) if checkpoint_path else None
+        io = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, io_workers)))
+        cpu = stack.enter_context(ProcessPoolExecutor(max_workers=compute_workers)) if compute_workers > 0 else None
+
+        def record(entry: dict, row: dict | None, stage: str = "", exc: Exception | None = None) -> None:
+            if row is None:
+                row = {"ticker": entry["ticker"], "stage": stage, "error": f"{type(exc).__name__}: {exc}"}
+                errors.append(row)
+            else:
+                rows.append(row)
+            if checkpoint:
+                checkpoint.write(json.dumps(row) + "\n")
+                checkpoint.flush()
+
+        def params_for(entry: dict) -> dict:
+            merged = {**DEFAULT_PARAMETERS, **defaults}
+            merged.update({k: entry[k] for k in PARAMETER_KEYS if entry.get(k) is not None})
+            missing = [k for k in REQUIRED_PARAMETERS if merged.get(k) is None]
+            if missing:
+                raise ValueError(f"Missing parameters: {', '.join(missing)}")
+            return {k: merged[k] for k in PARAMETER_KEYS}
+
+        fetches = {io.submit(fetch_ticker, fetcher, e["ticker"], e.get("years", years)): e for e in todo}
+        valuations = {}
+        for fut in as_completed(fetches):
+            entry = fetches[fut]
+            try:
+                fetched = fut.result()
+                params = params_for(entry)
+            except Exception as e:
+                record(entry, None, "fetch", e)
+                continue
+            if cpu is not None:
+                valuations[cpu.submit(value_ticker, entry["ticker"], fetched, params)] = entry
+                continue
+            try:
+                record(entry, value_ticker(entry["ticker"], fetched, params))
+            except Exception as e:
+                record(entry, None, "value", e)
+
+        for fut in as_completed(valuations):
+            entry = valuations[fut]
+            try:
+                record(entry, fut.result())
+            except Exception as e:
+                record(entry, None, "value", e)
+
+    order = {e["ticker"]: i for i, e in enumerate(universe)}
+    errors.sort(key=lambda r: order.get(r["ticker"], len(order)))
+    return {
+        "ranked": rank(rows),
+        "errors": errors,
+        "summary": {
+            "universe": len(universe),
+            "valued": len(rows),
+            "failed": len(errors),
+            "resumed": len(universe) - len(todo),
+        },
+    }
+
+
+CSV_COLUMNS = ("rank", "ticker", "current_price", "iv_per_share_low", "iv_per_share_high",
+               "margin_of_safety", "cagr", "market_implied_stage1_cagr")
+
+
+def screen_to_csv(result: dict) -> str:
+    """Ranked table as CSV (errors are not included)."""
+    import csv
+    import io
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for row in result["ranked"]:
+        writer.writerow(["" if row.get(c) is None else row.get(c) for c in CSV_COLUMNS])
+    return buf.getvalue()
@@ -0,0 +1,109 @@
+"""IV sensitivity grid — discount rate x stage-2 growth x stage-3 growth x CC.
+
+Evaluates the whole grid in one vectorized calc_three_stage_dcf_batch call,
+single-leg (cc_high=None): the CC axis replaces the low/high pair.
+Grid cells where discount_rate <= stage3_cagr have no Gordon Growth
+perpetuity and are reported as NaN (null in JSON, empty in CSV).
+"""
+import csv
+import io
+import json
+
+import numpy as np
+
+from ivco_calc.dcf_batch import calc_three_stage_dcf_batch
+
+AXES = ("discount_rate", "stage2_cagr", "stage3_cagr", "cc")
+
+
+def parse_range(spec: str) -> list[float]:
+    """Parse a grid axis spec.
+
+    "0.08"            -> [0.08]
+    "0.06,0.08,0.10"  -> explicit values
+    "0.06:0.10:5"     -> 5 evenly spaced values, both ends inclusive
+    """
+    spec = spec.strip()
+    if ":" in spec:
+        parts = spec.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Range '{spec}' must be START:STOP:NUM")
+        start, stop, num = float(parts[0]), float(parts[1]), int(parts[2])
+        if num < 1:
+            raise ValueError(f"Range '{spec}' must have NUM >= 1")
+        return [round(v, 10) for v in np.linspace(start, stop, num).tolist()]
+    return [float(v) for v in spec.split(",") if v.strip()]
+
+
+def calc_sensitivity_grid(
+    latest_oe: int,
+    cagr: float,
+    discount_rates: list[float],
+    stage2_cagrs: list[float],
+    stage3_cagrs: list[float],
+    ccs: list[float],
+    long_term_debt: int,
+    shares_outstanding_raw: int,
+    share_par_value: int = 10,
+) -> dict:
+    """IV per share over the full parameter grid.
+
+    Returns:
+        {"axes": {axis: values}, "iv_per_share": float ndarray shaped
+        (discount_rate, stage2_cagr, stage3_cagr, cc), NaN where invalid}.
+    """
+    if shares_outstanding_raw <= 0:
+        raise ValueError(f"shares_outstanding_raw must be positive, got {shares_outstanding_raw}")
+
+    rate, stage2, stage3, cc = np.meshgrid(
+        np.asarray(discount_rates, dtype=np.float64),
+        np.asarray(stage2_cagrs, dtype=np.float64),
+        np.asarray(stage3_cagrs, dtype=np.float64),
+        np.asarray(ccs, dtype=np.float64),
+        indexing="ij",
+    )
+    iv_per_share = np.full(rate.shape, np.nan)
+    valid = rate > stage3
+    if valid.any():
+        result = calc_three_stage_dcf_batch(
+            latest_oe=latest_oe, cagr=cagr, cc_low=cc[valid], cc_high=None,
+            stage2_cagr=stage2[valid], stage3_cagr=stage3[valid], discount_rate=rate[valid],
+            long_term_debt=long_term_debt, shares_outstanding_raw=shares_outstanding_raw,
+            share_par_value=share_par_value,
+        )
+        iv_per_share[valid] = result["iv_per_share_low"]
+
+    return {
+        "axes": dict(zip(AXES, (list(discount_rates), list(stage2_cagrs),
+                                list(stage3_cagrs), list(ccs)))),
+        "iv_per_share": iv_per_share,
+    }
+
+
+def _cell(value: float) -> int | None:
+    return None if np.isnan(value) else int(value)
+
+
+def grid_to_json(grid: dict) -> str:
+    """Compact JSON: axes + nested iv_per_share lists (null = invalid cell)."""
+    values = grid["iv_per_share"]
+    nested = np.vectorize(_cell, otypes=[object])(values).tolist() if values.size else []
+    return json.dumps(
+        {"axes": grid["axes"], "shape": list(values.shape), "iv_per_share": nested},
+        separators=(",", ":"),
+    )
+
+
+def grid_to_csv(grid: dict) -> str:
+    """Heat-map CSV: one row per (stage3_cagr, cc, discount_rate), one column per stage2_cagr."""
+    axes = grid["axes"]
+    values = grid["iv_per_share"]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["stage3_cagr", "cc", "discount_rate"] + axes["stage2_cagr"])
+    for k, stage3 in enumerate(axes["stage3_cagr"]):
+        for m, cc in enumerate(axes["cc"]):
+            for i, rate in enumerate(axes["discount_rate"]):
+                row = [_cell(v) for v in values[i, :, k, m]]
+                writer.writerow([stage3, cc, rate] + ["" if v is None else v for v in row])
+    return buf.getvalue()
@@ -0,0 +1,238 @@
+"""Resident JSON-RPC server over the registered tools (`ivco serve`).
+
+Every tool in TOOLS is a JSON-RPC 2.0 method of the same name; groups are
+exposed per subcommand (`store.import`, `store.query`, `store.sink`). Params
+are the command's options by name — `{"net_income": 100, "maintenance_ratio": 0.2}`
+or `{"net-income": 100, ...}`; flags take true/false, repeatable options a
+list — or a list of raw CLI arguments. The result is the object the command
+would print. A JSON array posted to /rpc is a batch, answered in one response.
+
+Commands run in-process through the same click definitions, so a call costs
+the calculation plus option parsing instead of interpreter startup. Fetchers
+(response cache, connection pool, rate limiter) and the memo cache live for
+the life of the server and are shared by all requests; each connection is
+served on its own thread with HTTP/1.1 keep-alive.
+
+    POST /rpc    {"jsonrpc": "2.0", "id": 1, "method": "calc-oe", "params": {...}}
+    GET  /tools  the TOOLS registry
+"""
+import contextlib
+import io
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import click
+
+from ivco_calc import cli as cli_module
+from ivco_calc.tools_registry import TOOLS
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+TOOL_ERROR = -32000
+# Not callable over RPC: the server itself
+EXCLUDED = {"serve"}
+
+_stdin_lock = threading.Lock()
+_stdin_calls = 0
+_saved_stdin = None
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def build_methods() -> dict[str, click.Command]:
+    """Method name -> click command for every tool in TOOLS."""
+    methods = {}
+    ctx = click.Context(cli_module.cli)
+    for tool in TOOLS:
+        name = tool["name"]
+        cmd = cli_module.cli.get_command(ctx, name)
+        if cmd is None or name in EXCLUDED:
+            continue
+        if isinstance(cmd, click.Group):
+            for sub_name, sub in cmd.commands.items():
+                methods[f"{name}.{sub_name}"] = sub
+        else:
+            methods[name] = cmd
+    return methods
+
+
+def _arg(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # 1e9 is fine for an INT option too
+    return json.dumps(value)
+
+
+def params_to_args(cmd: click.Command, params) -> list[str]:
+    """Turn a JSON-RPC params object (or list of CLI args) into argv for `cmd`."""
+    if params is None:
+        return []
+    if isinstance(params, list):
+        return [str(p) for p in params]
+    if not isinstance(params, dict):
+        raise RPCError(INVALID_PARAMS, "params must be an object or a list of CLI arguments")
+    lookup = {}
+    for param in cmd.params:
+        lookup[param.name] = param
+        for opt in getattr(param, "opts", []):
+            lookup[opt.lstrip("-").replace("-", "_")] = param
+    args, positional = [], []
+    for key, value in params.items():
+        param = lookup.get(key.replace("-", "_"))
+        if param is None:
+            raise RPCError(INVALID_PARAMS, f"unknown parameter '{key}'")
+        if isinstance(param, click.Argument):
+            positional.extend(value if isinstance(value, list) else [value])
+            continue
+        if value is None:
+            continue
+        opt = param.opts[0]
+        if param.is_flag and not param.secondary_opts:
+            if value:
+                args.append(opt)
+        elif param.is_flag:
+            args.append(opt if value else param.secondary_opts[0])
+        elif param.multiple:
+            for item in (value if isinstance(value, list) else [value]):
+                args += [opt, _arg(item)]
+        else:
+            args += [opt, _arg(value)]
+    return args + [str(p) for p in positional]
+
+
+@contextlib.contextmanager
+def _empty_stdin():
+    """Commands that default to reading stdin see an empty stream, not the server's terminal.
+
+    sys.stdin is process-wide, so it is swapped when the first concurrent call
+    starts and restored when the last one returns.
+    """
+    global _stdin_calls, _saved_stdin
+    with _stdin_lock:
+        if _stdin_calls == 0:
+            _saved_stdin, sys.stdin = sys.stdin, io.StringIO("")
+        _stdin_calls += 1
+    try:
+        yield
+    finally:
+        with _stdin_lock:
+            _stdin_calls -= 1
+            if _stdin_calls == 0:
+                sys.stdin, _saved_stdin = _saved_stdin, None
+
+
+def call(cmd: click.Command, name: str, params):
+    """Run one command in-process and return what it would have printed."""
+    args = params_to_args(cmd, params)
+    sink = []
+    token = cli_module._capture.set(sink)
+    try:
+        with _empty_stdin(), cmd.make_context(name, args) as ctx:
+            cmd.invoke(ctx)
+    except click.ClickException as e:
+        raise RPCError(INVALID_PARAMS, e.format_message())
+    except cli_module.ToolError as e:
+        raise RPCError(TOOL_ERROR, str(e))
+    except SystemExit as e:
+        if e.code not in (0, None) and not sink:
+            raise RPCError(TOOL_ERROR, f"{name} exited with status {e.code}")
+    finally:
+        cli_module._capture.reset(token)
+    if not sink:
+        return None
+    return sink[0] if len(sink) == 1 else sink
+
+
+def handle(methods: dict, request) -> dict | None:
+    """One JSON-RPC request object -> response object (None for notifications)."""
+    if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+        return {"jsonrpc": "2.0", "id": None,
+                "error": {"code": INVALID_REQUEST, "message": "Invalid Request"}}
+    request_id = request.get("id")
+    method = request["method"]
+    try:
+        cmd = methods.get(method)
+        if cmd is None:
+            raise RPCError(METHOD_NOT_FOUND, f"Method '{method}' not found")
+        result = call(cmd, method, request.get("params"))
+        response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+    except RPCError as e:
+        response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+    except Exception as e:
+        response = {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}}
+    return response if "id" in request else None
+
+
+def dispatch(methods: dict, body: bytes):
+    """Decoded request body (single or batch) -> response payload, or None when nothing is owed."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}}
+    if isinstance(payload, list):
+        if not payload:
+            return {"jsonrpc": "2.0", "id": None,
+                    "error": {"code": INVALID_REQUEST, "message": "Invalid Request"}}
+        responses = [r for r in (handle(methods, item) for item in payload) if r is not None]
+        return responses or None
+    return handle(methods, payload)
+
+
+class RPCHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "ivco-serve"
+
+    def _send(self, status: int, payload=None) -> None:
+        body = b"" if payload is None else json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/tools":
+            self._send(200, TOOLS)
+        else:
+            self._send(404, {"error": f"not found: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ("/", "/rpc"):
+            self._send(404, {"error": f"not found: {self.path}"})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        response = dispatch(self.server.methods, body)
+        self._send(200 if response is not None else 204, response)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RPCServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], verbose: bool = False):
+        super().__init__(address, RPCHandler)
+        self.methods = build_methods()
+        self.verbose = verbose
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, verbose: bool = False) -> RPCServer:
+    """Bind the server (port 0 picks a free port) and switch the CLI to shared fetchers."""
+    if cli_module._shared_fetchers is None:
+        cli_module._shared_fetchers = {}
+    return RPCServer((host, port), verbose=verbose)
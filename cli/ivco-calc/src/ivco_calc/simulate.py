@@ -0,0 +1,267 @@
+"""Monte Carlo IV distribution — a full distribution instead of the two-point CC band.
+
+Each path draws the historical CAGR, Confidence Coefficient, stage 2 CAGR,
+terminal (stage 3) growth and discount rate from user-specified
+distributions and values the company with the closed-form three-stage DCF.
+
+Reproducibility: the seed feeds a numpy SeedSequence that is spawned into one
+child stream per chunk, so results depend only on (seed, paths, chunk_size),
+never on how many worker processes evaluated the chunks.
+
+Memory: chunks never return their paths. Each one is reduced to exact
+count/mean/M2/min/max and a log-bucketed histogram (relative bucket width
+RELATIVE_ACCURACY, the DDSketch layout), and the parent merges those in
+chunk order. Peak memory is one chunk per worker plus one bucket per
+distinct IV magnitude, whatever --paths is. Mean, std and
+prob_iv_above_price are exact; percentiles are within RELATIVE_ACCURACY of
+the exact order statistic (and within the sampled min/max).
+
+Distribution specs:
+  "0.08" or "fixed:0.08"        constant
+  "uniform:LOW,HIGH"
+  "normal:MEAN,SD"
+  "triangular:LOW,MODE,HIGH"
+  "lognormal:MEAN,SIGMA"        parameters of the underlying normal
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ivco_calc.dcf_batch import calc_iv_per_share_closed_form
+
+DISTRIBUTIONS = {"fixed": 1, "uniform": 2, "normal": 2, "triangular": 3, "lognormal": 2}
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+RELATIVE_ACCURACY = 1e-4
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_MIN_MAGNITUDE = 1e-9  # |IV| below this counts as zero
+
+
+def parse_distribution(spec: str) -> tuple[str, tuple[float, ...]]:
+    """Parse 'kind:a,b,...' (or a bare number) into (kind, params)."""
+    spec = spec.strip()
+    if ":" not in spec:
+        params = (float(spec),)
+        _validate("fixed", params)
+        return "fixed", params
+    kind, _, args = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{kind}' (choose from {', '.join(DISTRIBUTIONS)})")
+    params = tuple(float(a) for a in args.split(",") if a.strip())
+    if len(params) != DISTRIBUTIONS[kind]:
+        raise ValueError(f"Distribution '{kind}' takes {DISTRIBUTIONS[kind]} parameters, got {len(params)}")
+    _validate(kind, params)
+    return kind, params
+
+
+def _validate(kind: str, params: tuple[float, ...]) -> None:
+    """Reject parameters numpy would refuse (or draw nonsense from) at sampling time."""
+    if not all(math.isfinite(p) for p in params):
+        raise ValueError(f"Distribution '{kind}' parameters must be finite")
+    if kind == "uniform" and params[0] > params[1]:
+        raise ValueError(f"uniform:LOW,HIGH needs LOW <= HIGH, got {params[0]} > {params[1]}")
+    if kind in ("normal", "lognormal") and params[1] < 0:
+        raise ValueError(f"{kind} spread must be >= 0, got {params[1]}")
+    if kind == "triangular":
+        low, mode, high = params
+        if not low <= mode <= high or low == high:
+            raise ValueError(f"triangular:LOW,MODE,HIGH needs LOW <= MODE <= HIGH and LOW < HIGH, "
+                             f"got {low},{mode},{high}")
+
+
+def _draw(rng: np.random.Generator, dist: tuple[str, tuple[float, ...]], n: int) -> np.ndarray:
+    kind, params = dist
+    if kind == "fixed":
+        return np.full(n, params[0])
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1], n)
+    if kind == "normal":
+        return rng.normal(params[0], params[1], n)
+    if kind == "triangular":
+        return rng.triangular(params[0], params[1], params[2], n)
+    return rng.lognormal(params[0], params[1], n)
+
+
+def _buckets(values: np.ndarray) -> dict[int, int]:
+    """Bucket index ceil(log_gamma(v)) -> count, for positive values."""
+    keys, counts = np.unique(np.ceil(np.log(values) / _LOG_GAMMA).astype(np.int64), return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def _summarize(iv: np.ndarray, current_price: float | None) -> dict:
+    """Mergeable summary of one chunk's IVs: exact moments and extremes plus the histogram."""
+    summary = {"n": int(iv.size), "mean": 0.0, "m2": 0.0, "min": math.inf, "max": -math.inf,
+               "above_price": 0, "positive": {}, "negative": {}, "zero": 0}
+    if not iv.size:
+        return summary
+    mean = float(iv.mean())
+    summary.update(mean=mean, m2=float(((iv - mean) ** 2).sum()), min=float(iv.min()), max=float(iv.max()))
+    if current_price is not None:
+        summary["above_price"] = int((iv > current_price).sum())
+    summary["positive"] = _buckets(iv[iv >= _MIN_MAGNITUDE])
+    summary["negative"] = _buckets(-iv[iv <= -_MIN_MAGNITUDE])
+    summary["zero"] = int((np.abs(iv) < _MIN_MAGNITUDE).sum())
+    return summary
+
+
+def _merge(total: dict, chunk: dict) -> dict:
+    """Combine two summaries (Chan et al. for mean/M2, summed bucket counts)."""
+    n = total["n"] + chunk["n"]
+    if not chunk["n"]:
+        return total
+    delta = chunk["mean"] - total["mean"]
+    merged = {
+        "n": n,
+        "mean": total["mean"] + delta * chunk["n"] / n,
+        "m2": total["m2"] + chunk["m2"] + delta * delta * total["n"] * chunk["n"] / n,
+        "min": min(total["min"], chunk["min"]),
+        "max": max(total["max"], chunk["max"]),
+        "above_price": total["above_price"] + chunk["above_price"],
+        "zero": total["zero"] + chunk["zero"],
+    }
+    for side in ("positive", "negative"):
+        buckets = dict(total[side])
+        for key, count in chunk[side].items():
+            buckets[key] = buckets.get(key, 0) + count
+        merged[side] = buckets
+    return merged
+
+
+def _percentiles(summary: dict, percentiles: tuple[float, ...]) -> list[float]:
+    """Value at rank p/100 * (n - 1) from the buckets, clamped to the sampled range."""
+    ordered = [(-2 * _GAMMA ** key / (_GAMMA + 1), count)
+               for key, count in sorted(summary["negative"].items(), reverse=True)]
+    ordered.append((0.0, summary["zero"]))
+    ordered += [(2 * _GAMMA ** key / (_GAMMA + 1), count) for key, count in sorted(summary["positive"].items())]
+    values = []
+    for p in percentiles:
+        rank, seen = p / 100 * (summary["n"] - 1), 0
+        for value, count in ordered:
+            seen += count
+            if seen > rank:
+                break
+        values.append(min(max(value, summary["min"]), summary["max"]))
+    return values
+
+
+def _simulate_chunk(task: tuple) -> tuple[dict, int]:
+    """Value one chunk of paths. Returns (summary of valid paths' IV per share, rejected count)."""
+    seed_seq, n, dists, fixed, current_price = task
+    rng = np.random.default_rng(seed_seq)
+    cagr = _draw(rng, dists["cagr"], n)
+    cc = _draw(rng, dists["cc"], n)
+    stage2_cagr = _draw(rng, dists["stage2_cagr"], n)
+    stage3_cagr = _draw(rng, dists["stage3_cagr"], n)
+    discount_rate = _draw(rng, dists["discount_rate"], n)
+
+    # Gordon Growth needs r > g; such paths are rejected, not clipped
+    valid = discount_rate > stage3_cagr
+    iv = calc_iv_per_share_closed_form(
+        latest_oe=fixed["latest_oe"],
+        stage1_cagr=(cagr * cc)[valid],
+        stage2_cagr=stage2_cagr[valid],
+        stage3_cagr=stage3_cagr[valid],
+        discount_rate=discount_rate[valid],
+        long_term_debt=fixed["long_term_debt"],
+        shares_outstanding_raw=fixed["shares_outstanding_raw"],
+        share_par_value=fixed["share_par_value"],
+    )
+    return _summarize(iv, current_price), int(n - valid.sum())
+
+
+def simulate_iv(
+    latest_oe: int,
+    cagr: str,
+    cc: str,
+    stage2_cagr: str,
+    stage3_cagr: str,
+    discount_rate: str,
+    long_term_debt: int,
+    shares_outstanding_raw: int,
+    share_par_value: int = 10,
+    paths: int = 100_000,
+    seed: int = 0,
+    chunk_size: int = 100_000,
+    workers: int = 1,
+    percentiles: tuple[float, ...] = DEFAULT_PERCENTILES,
+    current_price: float | None = None,
+) -> dict:
+    """Monte Carlo distribution of IV per share.
+
+    Args:
+        latest_oe, long_term_debt, shares_outstanding_raw, share_par_value: as in calc_three_stage_dcf.
+        cagr, cc, stage2_cagr, stage3_cagr, discount_rate: distribution specs (see module doc).
+        paths: Number of simulated paths.
+        seed: Seed for the SeedSequence; same seed -> same result for any worker count.
+        chunk_size: Paths per chunk (bounds peak memory per worker; the parent
+            only keeps merged summaries, see module doc).
+        workers: Processes to fan chunks across (1 = in-process).
+        percentiles: Percentiles of IV per share to report.
+        current_price: Optional market price; adds prob_iv_above_price.
+
+    Returns:
+        Dict with percentiles, mean/std and path counts.
+    """
+    if shares_outstanding_raw <= 0:
+        raise ValueError(f"shares_outstanding_raw must be positive, got {shares_outstanding_raw}")
+    if paths <= 0 or chunk_size <= 0:
+        raise ValueError("paths and chunk_size must be positive")
+
+    dists = {
+        "cagr": parse_distribution(cagr),
+        "cc": parse_distribution(cc),
+        "stage2_cagr": parse_distribution(stage2_cagr),
+        "stage3_cagr": parse_distribution(stage3_cagr),
+        "discount_rate": parse_distribution(discount_rate),
+    }
+    fixed = {
+        "latest_oe": latest_oe,
+        "long_term_debt": long_term_debt,
+        "shares_outstanding_raw": shares_outstanding_raw,
+        "share_par_value": share_par_value,
+    }
+    sizes = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        sizes.append(paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, n, dists, fixed, current_price) for s, n in zip(seeds, sizes)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunks = pool.map(_simulate_chunk, tasks)
+            summary, rejected = _merge_chunks(chunks)
+    else:
+        summary, rejected = _merge_chunks(map(_simulate_chunk, tasks))
+
+    result = {
+        "paths": paths,
+        "valid_paths": summary["n"],
+        "rejected_paths": rejected,
+        "seed": seed,
+        "distributions": {k: {"kind": v[0], "params": list(v[1])} for k, v in dists.items()},
+    }
+    if summary["n"] == 0:
+        result["error"] = "No valid paths (discount_rate must exceed stage3_cagr)"
+        return result
+
+    values = _percentiles(summary, percentiles)
+    result["iv_per_share_percentiles"] = {
+        f"p{p:g}": round(v) for p, v in zip(percentiles, values)
+    }
+    result["iv_per_share_mean"] = round(summary["mean"])
+    result["iv_per_share_std"] = round(math.sqrt(summary["m2"] / summary["n"]))
+    if current_price is not None:
+        result["current_price"] = current_price
+        result["prob_iv_above_price"] = round(summary["above_price"] / summary["n"], 4)
+    return result
+
+
+def _merge_chunks(chunks) -> tuple[dict, int]:
+    """Fold chunk results in order (pool.map preserves it), so any worker count agrees."""
+    summary, rejected = _summarize(np.empty(0), None), 0
+    for chunk_summary, chunk_rejected in chunks:
+        summary = _merge(summary, chunk_summary)
+        rejected += chunk_rejected
+    return summary, rejected
@@ -0,0 +1,245 @@
+"""Bulk Postgres writer for historical_owner_earnings and iv_calculations.
+
+Takes `ivco analyze` output or `ivco screen` results (ranked records or the
+--checkpoint NDJSON) and upserts them in batches: each batch is streamed
+with COPY into a temporary staging table, then merged with one
+INSERT ... SELECT ... ON CONFLICT. One connection serves every batch, so a
+nightly 2,000-ticker screen is a handful of round trips instead of tens of
+thousands of single-row INSERTs.
+
+iv_calculations rows are keyed (ticker, input_hash) — see migration 003 —
+where input_hash covers everything the valuation depends on except the
+price: re-running an unchanged valuation refreshes price and margin of
+safety instead of adding a row.
+
+Requires psycopg 3 (pip install 'ivco-calc[pg]').
+"""
+import hashlib
+import json
+import os
+
+OE_COLUMNS = ("company_ticker", "year", "net_income", "depreciation", "amortization", "capex",
+              "maintenance_ratio", "owner_earnings", "cagr_from_base", "currency", "source")
+IV_COLUMNS = ("ticker", "maintenance_ratio", "historical_cagr", "cc_low", "cc_high",
+              "stage1_cagr_low", "stage1_cagr_high", "stage2_cagr", "stage3_growth", "discount_rate",
+              "long_term_debt", "shares_outstanding", "iv_per_share_low", "iv_per_share_high",
+              "current_price", "margin_of_safety_low", "margin_of_safety_high", "currency",
+              "parameters_json", "input_hash")
+OE_UPDATE = [c for c in OE_COLUMNS if c not in ("company_ticker", "year")]
+IV_UPDATE = ("current_price", "margin_of_safety_low", "margin_of_safety_high", "parameters_json")
+# NOT NULL columns whose values must fit their NUMERIC(precision, scale)
+IV_REQUIRED = ("maintenance_ratio", "historical_cagr", "cc_low", "cc_high", "stage2_cagr",
+               "stage3_growth", "discount_rate", "shares_outstanding", "iv_per_share_low", "iv_per_share_high")
+
+
+def default_dsn() -> str | None:
+    return os.environ.get("IVCO_PG_DSN") or os.environ.get("DATABASE_URL")
+
+
+def _numeric(value, precision: int, scale: int):
+    """Round to NUMERIC(precision, scale); None when missing or out of range."""
+    if value is None:
+        return None
+    value = round(float(value), scale)
+    return value if abs(value) < 10 ** (precision - scale) else None
+
+
+def _required(ticker: str, column: str, value, precision: int, scale: int):
+    """_numeric for a NOT NULL column; ValueError naming the ticker when it does not fit."""
+    rounded = _numeric(value, precision, scale)
+    if rounded is None:
+        raise ValueError(f"{ticker}: {column} {value!r} does not fit NUMERIC({precision}, {scale})")
+    return rounded
+
+
+def _mos(iv_per_share: float | None, price: float | None) -> float | None:
+    if not iv_per_share or iv_per_share <= 0 or not price:
+        return None
+    return (iv_per_share - price) / iv_per_share
+
+
+def valuation_record(record: dict) -> dict | None:
+    """Common shape for analyze output and screen records; None for error records."""
+    if "error" in record or not record.get("ticker"):
+        return None
+    if "analysis" in record:
+        analysis = record["analysis"]
+        iv = analysis["iv"]
+        valued = "error" not in iv
+        return {
+            "ticker": record["ticker"],
+            "oe_series": analysis["oe_series"],
+            "parameters": record["parameters"],
+            "cagr": analysis["cagr"].get("cagr"),
+            "current_price": analysis.get("current_price"),
+            "iv": {k: iv[k] for k in ("iv_per_share_low", "iv_per_share_high", "stage1_cagr_low",
+                                      "stage1_cagr_high", "long_term_debt", "shares_outstanding")} if valued else None,
+        }
+    if "iv_per_share_low" in record:
+        return {
+            "ticker": record["ticker"],
+            "oe_series": record.get("oe_series", []),
+            "parameters": record["parameters"],
+            "cagr": record.get("cagr"),
+            "current_price": record.get("current_price"),
+            "iv": {k: record.get(k) for k in ("iv_per_share_low", "iv_per_share_high", "stage1_cagr_low",
+                                              "stage1_cagr_high", "long_term_debt", "shares_outstanding")},
+        }
+    return None
+
+
+def oe_rows(valuation: dict, currency: str = "USD", source: str | None = None) -> list[tuple]:
+    """historical_owner_earnings rows (years without statement inputs are skipped).
+
+    Raises ValueError when maintenance_ratio does not fit its NOT NULL column.
+    """
+    series = sorted((e for e in valuation["oe_series"] if "net_income" in e), key=lambda e: e["year"])
+    if not series:
+        return []
+    ratio = _required(valuation["ticker"], "maintenance_ratio", valuation["parameters"]["maintenance_ratio"], 4, 2)
+    base = series[0]
+    rows = []
+    for entry in series:
+        cagr = None
+        span = entry["year"] - base["year"]
+        if span > 0 and base["oe"] > 0 and entry["oe"] > 0:
+            cagr = _numeric((entry["oe"] / base["oe"]) ** (1 / span) - 1, 6, 4)
+        rows.append((valuation["ticker"], entry["year"], round(entry["net_income"]), round(entry["depreciation"]),
+                     round(entry["amortization"]), round(entry["capex"]), ratio, round(entry["oe"]),
+                     cagr, currency, source))
+    return rows
+
+
+def input_hash(valuation: dict) -> str:
+    """Hash of everything the IV depends on except the market price."""
+    iv = valuation["iv"]
+    key = {
+        "ticker": valuation["ticker"],
+        "parameters": valuation["parameters"],
+        "oe_series": [(e["year"], e["oe"]) for e in sorted(valuation["oe_series"], key=lambda e: e["year"])],
+        "long_term_debt": iv["long_term_debt"],
+        "shares_outstanding": iv["shares_outstanding"],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def iv_row(valuation: dict, currency: str = "USD") -> tuple | None:
+    """iv_calculations row, or None when unvalued.
+
+    Raises ValueError when a required value does not fit its NOT NULL column.
+    """
+    iv = valuation["iv"]
+    if iv is None:
+        return None
+    params = valuation["parameters"]
+    price = valuation.get("current_price") or None
+    row = {
+        "ticker": valuation["ticker"],
+        "maintenance_ratio": _numeric(params["maintenance_ratio"], 4, 2),
+        "historical_cagr": _numeric(valuation["cagr"], 6, 4),
+        "cc_low": _numeric(params["cc_low"], 4, 2),
+        "cc_high": _numeric(params["cc_high"], 4, 2),
+        "stage1_cagr_low": _numeric(iv["stage1_cagr_low"], 6, 4),
+        "stage1_cagr_high": _numeric(iv["stage1_cagr_high"], 6, 4),
+        "stage2_cagr": _numeric(params["stage2_cagr"], 6, 4),
+        "stage3_growth": _numeric(params["stage3_cagr"], 6, 4),
+        "discount_rate": _numeric(params["discount_rate"], 6, 4),
+        "long_term_debt": iv["long_term_debt"] or 0,
+        "shares_outstanding": iv["shares_outstanding"],
+        "iv_per_share_low": _numeric(iv["iv_per_share_low"], 12, 2),
+        "iv_per_share_high": _numeric(iv["iv_per_share_high"], 12, 2),
+        "current_price": _numeric(price, 12, 2),
+        "margin_of_safety_low": _numeric(_mos(iv["iv_per_share_low"], price), 6, 4),
+        "margin_of_safety_high": _numeric(_mos(iv["iv_per_share_high"], price), 6, 4),
+        "currency": currency,
+        "parameters_json": json.dumps(params, sort_keys=True),
+        "input_hash": input_hash(valuation),
+    }
+    for column in IV_REQUIRED:
+        if row[column] is None:
+            raise ValueError(f"{row['ticker']}: {column} is missing or does not fit its column")
+    return tuple(row[c] for c in IV_COLUMNS)
+
+
+def _upsert_sql(table: str, staging: str, columns, conflict, update) -> str:
+    cols = ", ".join(columns)
+    sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in update)
+    if table == "iv_calculations":
+        sets += ", calculated_at = NOW()"
+    return (f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {staging} "
+            f"ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {sets}")
+
+
+class PostgresSink:
+    """Batched COPY + upsert into historical_owner_earnings / iv_calculations."""
+
+    TARGETS = {
+        "owner_earnings": ("historical_owner_earnings", "_stage_hoe", OE_COLUMNS,
+                           ("company_ticker", "year"), OE_UPDATE),
+        "iv_calculations": ("iv_calculations", "_stage_iv", IV_COLUMNS,
+                            ("ticker", "input_hash"), IV_UPDATE),
+    }
+
+    def __init__(self, dsn: str, batch_size: int = 5000, currency: str = "USD", source: str | None = None):
+        import psycopg
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.conn = psycopg.connect(dsn)
+        self.batch_size = batch_size
+        self.currency = currency
+        self.source = source
+        self.pending = {name: {} for name in self.TARGETS}
+        self.written = {name: 0 for name in self.TARGETS}
+        self.batches = 0
+        self.skipped = []
+        with self.conn.transaction():
+            for table, staging, columns, _, _ in self.TARGETS.values():
+                self.conn.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DELETE ROWS AS "
+                    f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA")
+
+    def add(self, record: dict) -> None:
+        """Queue one analyze/screen record; flushes whenever a batch fills up."""
+        valuation = valuation_record(record)
+        if valuation is None:
+            self.skipped.append({"ticker": record.get("ticker"), "error": record.get("error", "not a valuation")})
+            return
+        try:
+            rows = oe_rows(valuation, self.currency, self.source)
+            row = iv_row(valuation, self.currency)
+        except ValueError as e:
+            self.skipped.append({"ticker": valuation["ticker"], "error": str(e)})
+            return
+        for oe_row in rows:
+            self.pending["owner_earnings"][oe_row[:2]] = oe_row  # last one wins within a batch
+        if row is None:
+            self.skipped.append({"ticker": valuation["ticker"], "error": "no IV (unvalued)"})
+        else:
+            self.pending["iv_calculations"][(row[0], row[-1])] = row
+        for name, rows in self.pending.items():
+            if len(rows) >= self.batch_size:
+                self._flush(name)
+
+    def _flush(self, name: str) -> None:
+        rows = list(self.pending[name].values())
+        if not rows:
+            return
+        table, staging, columns, conflict, update = self.TARGETS[name]
+        with self.conn.transaction():
+            with self.conn.cursor() as cur:
+                with cur.copy(f"COPY {staging} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                cur.execute(_upsert_sql(table, staging, columns, conflict, update))
+        self.pending[name].clear()
+        self.written[name] += len(rows)
+        self.batches += 1
+
+    def close(self) -> dict:
+        """Flush what is left, close the connection and return counts."""
+        try:
+            for name in self.TARGETS:
+                self._flush(name)
+        finally:
+            self.conn.close()
+        return {**self.written, "batches": self.batches, "skipped": self.skipped}
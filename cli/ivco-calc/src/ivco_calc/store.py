@@ -0,0 +1,172 @@
+"""Local SQLite store for normalized financial statements.
+
+Holds the records FMPFetcher produces (parse_income_statement /
+fetch_balance_sheet / fetch_quote) so repeated analyses read them with one
+indexed query instead of re-fetching or re-parsing `ivco fetch` dumps.
+Statement tables are keyed (ticker, year, period) — the primary key doubles
+as the (ticker, year) index — and stored WITHOUT ROWID, so each ticker's
+rows sit together on disk. Re-importing a ticker upserts and bumps its
+revision, which result caches use to tell when a ticker's data changed.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+INCOME_COLUMNS = ("net_income", "depreciation", "amortization", "capex", "revenue", "gross_profit")
+BALANCE_COLUMNS = ("total_debt", "total_assets", "shares_outstanding")
+QUOTE_COLUMNS = ("price", "pe", "market_cap", "change_pct")
+
+TABLES = {
+    "income": ("income_statements", INCOME_COLUMNS),
+    "balance": ("balance_sheets", BALANCE_COLUMNS),
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS income_statements (
+    ticker TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    period TEXT NOT NULL DEFAULT 'FY',
+    {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in INCOME_COLUMNS)},
+    PRIMARY KEY (ticker, year, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS balance_sheets (
+    ticker TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    period TEXT NOT NULL DEFAULT 'FY',
+    {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in BALANCE_COLUMNS)},
+    PRIMARY KEY (ticker, year, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quotes (
+    ticker TEXT PRIMARY KEY,
+    {", ".join(f"{c} REAL NOT NULL DEFAULT 0" for c in QUOTE_COLUMNS)},
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS revisions (
+    ticker TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def default_store_path() -> str:
+    """$IVCO_STORE, else $XDG_DATA_HOME/ivco/statements.db, else ~/.local/share/ivco/statements.db."""
+    path = os.environ.get("IVCO_STORE")
+    if path:
+        return path
+    xdg = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(xdg, "ivco", "statements.db")
+
+
+class StatementStore:
+    """SQLite-backed statement store. One connection per thread."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or default_store_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _upsert(self, kind: str, records: list[dict]) -> int:
+        table, columns = TABLES[kind]
+        names = ("ticker", "year", "period") + columns
+        rows = [
+            (r["ticker"].upper(), int(r["year"]), r.get("period") or "FY", *(r.get(c) or 0 for c in columns))
+            for r in records
+        ]
+        with self._conn() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                rows,
+            )
+            self._bump(conn, {row[0] for row in rows})
+        return len(rows)
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, tickers) -> None:
+        conn.executemany(
+            "INSERT INTO revisions VALUES (?, 1) ON CONFLICT (ticker) DO UPDATE SET revision = revision + 1",
+            [(t,) for t in tickers],
+        )
+
+    def revision(self, ticker: str) -> int:
+        """Counter bumped by every write to the ticker's statements or quote (0 = never stored)."""
+        row = self._conn().execute("SELECT revision FROM revisions WHERE ticker = ?", (ticker.upper(),)).fetchone()
+        return row[0] if row is not None else 0
+
+    def put_income_statements(self, records: list[dict]) -> int:
+        return self._upsert("income", records)
+
+    def put_balance_sheets(self, records: list[dict]) -> int:
+        return self._upsert("balance", records)
+
+    def put_quote(self, quote: dict) -> None:
+        names = ("ticker",) + QUOTE_COLUMNS + ("updated_at",)
+        with self._conn() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO quotes ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                (quote["ticker"].upper(), *(quote.get(c) or 0 for c in QUOTE_COLUMNS), time.time()),
+            )
+            self._bump(conn, {quote["ticker"].upper()})
+
+    def import_fetched(self, fetched: dict) -> dict:
+        """Store one `ivco fetch` result ({ticker, income_statements, balance_sheet, quote})."""
+        ticker = fetched["ticker"]
+        income = [{**r, "ticker": r.get("ticker") or ticker} for r in fetched.get("income_statements", [])]
+        balance = [{**r, "ticker": r.get("ticker") or ticker} for r in fetched.get("balance_sheet", [])]
+        counts = {
+            "ticker": ticker.upper(),
+            "income_statements": self.put_income_statements(income),
+            "balance_sheet": self.put_balance_sheets(balance),
+            "quote": 0,
+        }
+        if fetched.get("quote", {}).get("price"):
+            self.put_quote({**fetched["quote"], "ticker": ticker})
+            counts["quote"] = 1
+        return counts
+
+    def query(self, kind: str, ticker: str, limit: int | None = None,
+              start_year: int | None = None, end_year: int | None = None, period: str = "FY") -> list[dict]:
+        """Statements for one ticker, newest year first (the order FMP returns)."""
+        table, _ = TABLES[kind]
+        sql = f"SELECT * FROM {table} WHERE ticker = ? AND period = ?"
+        params: list = [ticker.upper(), period]
+        if start_year is not None:
+            sql += " AND year >= ?"
+            params.append(start_year)
+        if end_year is not None:
+            sql += " AND year <= ?"
+            params.append(end_year)
+        sql += " ORDER BY year DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn().execute(sql, params)]
+
+    def get_quote(self, ticker: str) -> dict | None:
+        row = self._conn().execute("SELECT * FROM quotes WHERE ticker = ?", (ticker.upper(),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def tickers(self) -> list[dict]:
+        """Stored tickers with their income-statement year range."""
+        rows = self._conn().execute(
+            "SELECT ticker, MIN(year) AS first_year, MAX(year) AS last_year, COUNT(*) AS years "
+            "FROM income_statements GROUP BY ticker ORDER BY ticker"
+        )
+        return [dict(row) for row in rows]
@@ -7,16 +7,16 @@ TOOLS = [
         "layer": 1,
         "layer_name": "primitive",
         "description": "Calculate Owner Earnings for a single year",
-        "usage": "ivco calc-oe --net-income N --depreciation N --amortization N --capex N --maintenance-ratio F",
+        "usage": "ivco calc-oe --net-income N --depreciation N --amortization N --capex N --maintenance-ratio F; ivco calc-oe --batch --maintenance-ratio F < records.ndjson",
         "input": "Financial statement values + maintenance ratio",
-        "output": "JSON with owner_earnings value",
+        "output": "JSON with owner_earnings value (--batch: one compact JSON line per input line, errors per line)",
     },
     {
         "name": "calc-cagr",
         "layer": 1,
         "layer_name": "primitive",
         "description": "Calculate CAGR from OE series with Reality Coefficients",
-        "usage": "ivco calc-cagr --start-oe N --end-oe N --start-year Y --end-year Y",
+        "usage": "ivco calc-cagr --start-oe N --end-oe N --start-year Y --end-year Y; ivco calc-cagr --batch < records.ndjson",
         "input": "OE start/end values + years + optional reality coefficients",
         "output": "JSON with cagr, years, calibrated values",
     },
@@ -25,7 +25,7 @@ TOOLS = [
         "layer": 1,
         "layer_name": "primitive",
         "description": "Calculate Intrinsic Value using Three-Stage DCF",
-        "usage": "ivco calc-iv --latest-oe N --cagr F --cc-low F --cc-high F --stage2-cagr F --stage3-cagr F --discount-rate F --long-term-debt N --shares-outstanding N",
+        "usage": "ivco calc-iv --latest-oe N --cagr F --cc-low F --cc-high F --stage2-cagr F --stage3-cagr F --discount-rate F --long-term-debt N --shares-outstanding N [--fast]; ivco calc-iv --batch [options as defaults] < records.ndjson",
         "input": "OE + CAGR + 7 Allen Framework parameters",
         "output": "JSON with iv_per_share_low, iv_per_share_high",
     },
@@ -34,7 +34,7 @@ TOOLS = [
         "layer": 1,
         "layer_name": "primitive",
         "description": "Cross-validate computed IV against expected values",
-        "usage": "ivco verify --computed-low N --computed-high N --expected-low N --expected-high N",
+        "usage": "ivco verify --computed-low N --computed-high N --expected-low N --expected-high N; ivco verify --batch < records.ndjson",
         "input": "Computed and expected IV ranges",
         "output": "JSON with status PASS/FAIL + deviations",
     },
@@ -43,9 +43,18 @@ TOOLS = [
         "layer": 1,
         "layer_name": "primitive",
         "description": "Fetch financial data from external API (FMP free tier)",
-        "usage": "ivco fetch --ticker TSM --years 10 --source fmp",
-        "input": "Ticker symbol + years",
-        "output": "JSON with income_statements, balance_sheet, quote",
+        "usage": "ivco fetch --ticker TSM | --tickers TSM,AAPL | --tickers-file FILE [--years 10] [--workers 4] [--rps 5] [--daily-budget 250] [--offline] [--no-cache]",
+        "input": "Ticker symbol(s) + years",
+        "output": "JSON with income_statements, balance_sheet, quote (array of these for multiple tickers)",
+    },
+    {
+        "name": "store",
+        "layer": 1,
+        "layer_name": "primitive",
+        "description": "Local SQLite statement store keyed by ticker/year/period (offline analysis); Postgres sink for OE/IV results",
+        "usage": "ivco fetch --tickers-file FILE | ivco store import; ivco store query --ticker TSM [--table income|balance|quote] [--years 10]; ivco screen ... | ivco store sink [--dsn DSN] [--batch-size 5000]",
+        "input": "`ivco fetch` JSON (import), ticker + year range (query), or analyze/screen JSON (sink)",
+        "output": "Import counts per ticker, stored statements as JSON, or rows upserted into historical_owner_earnings / iv_calculations",
     },
     # Layer 2: Composed Tools
     {
@@ -53,10 +62,62 @@ TOOLS = [
         "layer": 2,
         "layer_name": "composed",
         "description": "One-stop analysis: fetch → calc-oe → calc-cagr → calc-iv",
-        "usage": "ivco analyze --ticker TSM --maintenance-ratio 0.20 --cc-low 1.2 --cc-high 1.5",
+        "usage": "ivco analyze --ticker TSM --maintenance-ratio 0.20 --cc-low 1.2 --cc-high 1.5 [--source fmp|store]",
         "input": "Ticker + Allen Framework parameters",
         "output": "JSON with full OE series, CAGR, IV range, current price",
-        "composes": ["fetch", "calc-oe", "calc-cagr", "calc-iv"],
+        "composes": ["fetch", "store", "calc-oe", "calc-cagr", "calc-iv"],
+    },
+    {
+        "name": "screen",
+        "layer": 2,
+        "layer_name": "composed",
+        "description": "Run analyze over a ticker universe, ranked by margin of safety (resumable)",
+        "usage": "ivco screen --universe tickers.json --maintenance-ratio 0.20 --cc-low 1.0 --cc-high 1.3 --checkpoint screen.ndjson --compute-workers 4",
+        "input": "Universe file (tickers with optional per-ticker parameter overrides) + default parameters",
+        "output": "JSON ranked by (iv_per_share_low - price) / iv_per_share_low, with per-ticker errors (or CSV)",
+        "composes": ["analyze"],
+    },
+    {
+        "name": "sensitivity",
+        "layer": 2,
+        "layer_name": "composed",
+        "description": "IV-per-share grid over discount rate x stage 2 x stage 3 CAGR x CC",
+        "usage": "ivco sensitivity --latest-oe N --cagr F --cc 1.0:1.5:6 --discount-rate 0.06:0.10:50 --stage2-cagr 0.10:0.20:50 --long-term-debt N --shares-outstanding N --format csv",
+        "input": "OE + CAGR + axis specs (value | a,b,c | START:STOP:NUM)",
+        "output": "Matrix of iv_per_share as JSON, heat-map CSV or NumPy .npy",
+        "composes": ["calc-iv"],
+    },
+    {
+        "name": "simulate",
+        "layer": 2,
+        "layer_name": "composed",
+        "description": "Monte Carlo distribution of IV per share (seeded, chunked, multi-process)",
+        "usage": "ivco simulate --latest-oe N --cagr normal:0.17,0.03 --cc uniform:1.2,1.5 --discount-rate normal:0.08,0.01 --long-term-debt N --shares-outstanding N --paths 1000000 --seed 42 --workers 4",
+        "input": "OE + distribution specs for CAGR, CC, stage 2/3 growth, discount rate",
+        "output": "JSON with iv_per_share percentiles, mean, std, path counts",
+        "composes": ["calc-iv"],
+    },
+    {
+        "name": "reverse-dcf",
+        "layer": 2,
+        "layer_name": "composed",
+        "description": "Market-implied stage-1 CAGR (or discount rate) from current price",
+        "usage": "ivco reverse-dcf --price P --latest-oe N --shares-outstanding N [--cagr F] [--solve-for discount-rate] [--input tickers.json]",
+        "input": "Price + OE + Allen Framework parameters, or a JSON/NDJSON ticker list",
+        "output": "JSON with implied_stage1_cagr (+ implied_cc) or implied_discount_rate",
+        "composes": ["calc-iv"],
+    },
+    # Layer 3: Agent
+    {
+        "name": "serve",
+        "layer": 3,
+        "layer_name": "agent",
+        "description": "Resident JSON-RPC 2.0 server exposing every tool above as a method (shared caches, batches, concurrent clients)",
+        "usage": "ivco serve [--host 127.0.0.1] [--port 8765]; POST /rpc {\"jsonrpc\": \"2.0\", \"id\": 1, \"method\": \"calc-oe\", \"params\": {\"net_income\": N, ...}}",
+        "input": "JSON-RPC request (or batch array); params are the tool's options by name, or a list of CLI arguments",
+        "output": "JSON-RPC response whose result is the tool's JSON output; GET /tools returns this registry",
+        "composes": ["calc-oe", "calc-cagr", "calc-iv", "verify", "fetch", "store", "analyze", "screen",
+                     "sensitivity", "simulate", "reverse-dcf"],
     },
 ]
 
@@ -1,6 +1,11 @@
 """TSMC test fixtures — ground truth from Allen's hand calculation."""
 import pytest
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep result/response caches written by CLI tests out of ~/.cache."""
+    monkeypatch.setenv("IVCO_CACHE_DIR", str(tmp_path / "cache"))
+
 @pytest.fixture
 def tsmc_annual_data():
     """TSMC 2013-2022 financial data (all values in NT$K)."""
@@ -19,3 +19,28 @@ def test_analyze_cli_help():
     assert result.exit_code == 0
     assert "ticker" in result.output.lower()
     assert "maintenance" in result.output.lower()
+
+
+def _mock_fetcher(income, balance, quote):
+    fetcher = MagicMock()
+    fetcher.fetch_income_statements.return_value = income
+    fetcher.fetch_balance_sheet.return_value = balance
+    fetcher.fetch_quote.return_value = quote
+    return fetcher
+
+
+def test_analyze_reports_market_implied_cagr(tsmc_annual_data, tsmc_parameters):
+    """analyze compares price with IV via the reverse-DCF implied stage-1 CAGR."""
+    income = [dict(row, ticker="TSM") for row in tsmc_annual_data]
+    balance = [{"year": 2022, "shares_outstanding": tsmc_parameters["shares_outstanding_raw"]}]
+    fetcher = _mock_fetcher(income, balance, {"price": 4565, "pe": 15})
+    with patch("ivco_calc.cli.make_fetcher", return_value=fetcher):
+        result = CliRunner().invoke(cli, [
+            "analyze", "--ticker", "TSM", "--maintenance-ratio", "0.20",
+            "--cc-low", "1.2", "--cc-high", "1.5",
+            "--long-term-debt", str(tsmc_parameters["long_term_debt"]),
+        ])
+    assert result.exit_code == 0, result.output
+    analysis = json.loads(result.output)["analysis"]
+    assert analysis["iv"]["iv_per_share_low"] == 4565
+    assert abs(analysis["market_implied_stage1_cagr"] - analysis["iv"]["stage1_cagr_low"]) < 1e-3
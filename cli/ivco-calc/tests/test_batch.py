@@ -0,0 +1,71 @@
+"""Test --batch on the primitives: NDJSON in, one compact result per line out."""
+import json
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+
+
+def _run(args, records):
+    lines = "".join((r if isinstance(r, str) else json.dumps(r)) + "\n" for r in records)
+    result = CliRunner().invoke(cli, args, input=lines)
+    return result, [json.loads(line) for line in result.output.splitlines()]
+
+
+def test_tsmc_pipeline_in_batch(tsmc_annual_data, tsmc_parameters, tsmc_expected_oe, tsmc_expected_iv):
+    """calc-oe -> calc-iv -> verify over NDJSON reproduces Allen's hand calculation."""
+    result, oe_lines = _run(["calc-oe", "--batch", "--maintenance-ratio", "0.20"],
+                            [{"id": row["year"], **{k: v for k, v in row.items() if k != "year"}}
+                             for row in tsmc_annual_data])
+    assert result.exit_code == 0
+    assert {line["id"]: line["owner_earnings"] for line in oe_lines} == tsmc_expected_oe
+
+    p = tsmc_parameters
+    _, iv_lines = _run(["calc-iv", "--batch", "--cc-low", "1.2", "--cc-high", "1.5", "--stage2-cagr", "0.15",
+                        "--stage3-cagr", "0.05", "--discount-rate", "0.08", "--shares-outstanding",
+                        str(p["shares_outstanding_raw"]), "--fast"],
+                       [{"latest_oe": oe_lines[-1]["owner_earnings"], "cagr": tsmc_expected_iv["cagr"],
+                         "long-term-debt": p["long_term_debt"]}])
+    iv = iv_lines[0]
+    _, verify_lines = _run(["verify", "--batch"], [
+        {"computed_low": iv["iv_per_share_low"], "computed_high": iv["iv_per_share_high"],
+         "expected_low": tsmc_expected_iv["iv_per_share_low"],
+         "expected_high": tsmc_expected_iv["iv_per_share_high"]},
+        {"computed_low": 1, "computed_high": 2, "expected_low": 3, "expected_high": 4},
+    ])
+    assert [line["status"] for line in verify_lines] == ["PASS", "FAIL"]
+
+
+def test_errors_are_per_record():
+    """Bad lines become error lines; the rest are still computed and the exit status is 1."""
+    result, lines = _run(["calc-cagr", "--batch", "--start-year", "2013", "--end-year", "2022"], [
+        {"id": "ok", "start_oe": 100, "end_oe": 200},
+        "not json",
+        {"start_oe": "x", "end_oe": 200},
+        {"end_oe": 200},
+        {"start_oe": 100, "end_oe": 200, "bogus": 1},
+        {"start_oe": 100, "end_oe": 400, "start_year": 2012},
+    ])
+    assert result.exit_code == 1
+    assert lines[0]["id"] == "ok" and lines[0]["cagr"] > 0
+    assert [line.get("line") for line in lines[1:5]] == [2, 3, 4, 5]
+    assert "invalid JSON" in lines[1]["error"]
+    assert "--start-oe" in lines[2]["error"] and "--start-oe" in lines[3]["error"]
+    assert "bogus" in lines[4]["error"]
+    assert "error" not in lines[5] and lines[5]["cagr"] > lines[0]["cagr"]
+
+
+def test_required_options_still_enforced_without_batch():
+    result = CliRunner().invoke(cli, ["calc-oe", "--net-income", "1"])
+    assert result.exit_code == 2 and "Missing option" in result.output
+
+
+def test_fractional_value_for_int_option_is_an_error():
+    """JSON 1.9 for an INT option is rejected, not truncated; integral floats still pass."""
+    base = {"depreciation": 10, "amortization": 0, "capex": 20}
+    result, lines = _run(["calc-oe", "--batch", "--maintenance-ratio", "0.5"], [
+        {"id": "frac", "net_income": 1.9, **base},
+        {"id": "exp", "net_income": 1e9, **base},
+        {"id": "int", "net_income": 1000000000, **base},
+    ])
+    assert result.exit_code == 1
+    assert lines[0]["line"] == 1 and "--net-income" in lines[0]["error"] and "1.9" in lines[0]["error"]
+    assert "error" not in lines[1] and lines[1]["owner_earnings"] == lines[2]["owner_earnings"]
@@ -0,0 +1,123 @@
+"""Test the on-disk FMP response cache."""
+import os
+import time
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+
+import pytest
+from ivco_calc.fetchers.cache import CacheMiss, ResponseCache
+from ivco_calc.fetchers.fmp import FMPFetcher
+
+INCOME = [{"symbol": "TSM", "date": "2022-12-31", "netIncome": 100, "capitalExpenditure": -10}]
+
+
+def make_fetcher(tmp_path, api_key="secret_key", **kwargs):
+    fetcher = FMPFetcher(api_key=api_key, cache=ResponseCache(str(tmp_path)), **kwargs)
+    fetcher._open = MagicMock(return_value=(200, INCOME, {"ETag": '"v1"'}))
+    return fetcher
+
+
+def test_cache_key_excludes_api_key(tmp_path):
+    make_fetcher(tmp_path).fetch_income_statements("TSM", limit=5)
+    other = make_fetcher(tmp_path, api_key="another_key")
+    assert other.fetch_income_statements("TSM", limit=5)[0]["net_income"] == 100
+    other._open.assert_not_called()
+    for name in os.listdir(tmp_path / "http"):
+        assert "secret_key" not in (tmp_path / "http" / name).read_text()
+
+
+def test_fresh_entry_costs_no_request(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    fetcher.fetch_income_statements("TSM", limit=5)
+    fetcher.fetch_income_statements("TSM", limit=5)
+    assert fetcher._open.call_count == 1
+    fetcher.fetch_income_statements("TSM", limit=10)  # different limit = different key
+    assert fetcher._open.call_count == 2
+
+
+def test_stale_entry_revalidates_with_etag(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    fetcher.cache.ttls["income-statement"] = 0
+    fetcher.fetch_income_statements("TSM", limit=5)
+    fetcher._open.return_value = (304, None, {})
+    assert fetcher.fetch_income_statements("TSM", limit=5)[0]["net_income"] == 100
+    assert fetcher._open.call_args[0][1] == {"If-None-Match": '"v1"'}
+
+
+def test_quote_has_short_ttl():
+    cache = ResponseCache("/nonexistent")
+    assert cache.ttl("quote") < cache.ttl("income-statement")
+    stale = {"endpoint": "quote", "fetched_at": time.time() - 3600}
+    assert not cache.is_fresh(stale)
+    assert cache.is_fresh({**stale, "endpoint": "income-statement"})
+
+
+def test_offline_serves_stale_and_raises_on_miss(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    fetcher.cache.ttls["income-statement"] = 0
+    fetcher.fetch_income_statements("TSM", limit=5)
+    offline = FMPFetcher(api_key=None, cache=ResponseCache(str(tmp_path)), offline=True)
+    assert offline.fetch_income_statements("TSM", limit=5)[0]["year"] == 2022
+    with pytest.raises(CacheMiss):
+        offline.fetch_quote("TSM")
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=900)  # room for three entries
+    for i, ticker in enumerate(["A", "B", "C"]):
+        cache.put("quote", ticker, None, [{"price": i, "pad": "x" * 150}])
+        time.sleep(0.01)
+    cache.get("quote", "A", None)  # A becomes most recently used
+    time.sleep(0.01)
+    cache.put("quote", "D", None, [{"price": 3, "pad": "x" * 150}])
+    assert cache.get("quote", "A", None) is not None
+    assert cache.get("quote", "B", None) is None
+    assert cache.get("quote", "D", None) is not None
+
+
+@pytest.mark.parametrize("status,body", [
+    (200, {"Error Message": "Limit Reach . Please upgrade your plan"}),
+    (200, []),
+    (429, {"Error Message": "Too many requests"}),
+])
+def test_error_and_empty_bodies_are_not_cached(tmp_path, status, body):
+    fetcher = make_fetcher(tmp_path)
+    fetcher._open.return_value = (status, body, {})
+    assert fetcher.fetch_income_statements("TSM", limit=5) == []
+    assert fetcher.cache.get("income-statement", "TSM", 5) is None
+    fetcher._open.return_value = (200, INCOME, {})
+    assert fetcher.fetch_income_statements("TSM", limit=5)[0]["net_income"] == 100
+
+
+def test_error_body_falls_back_to_stale_entry(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    fetcher.cache.ttls["income-statement"] = 0
+    fetcher.fetch_income_statements("TSM", limit=5)
+    fetcher._open.return_value = (200, {"Error Message": "Limit Reach"}, {})
+    assert fetcher.fetch_income_statements("TSM", limit=5)[0]["net_income"] == 100
+    assert fetcher.cache.get("income-statement", "TSM", 5)["body"] == INCOME
+
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_http_error_falls_back_to_stale_entry(tmp_path, status):
+    fetcher = make_fetcher(tmp_path)
+    fetcher.cache.ttls["income-statement"] = 0
+    fetcher.fetch_income_statements("TSM", limit=5)
+    fetcher._open.side_effect = HTTPError("url", status, "error", {}, None)
+    assert fetcher.fetch_income_statements("TSM", limit=5)[0]["net_income"] == 100
+    with pytest.raises(HTTPError):
+        fetcher.fetch_income_statements("TSM", limit=10)  # nothing cached to fall back on
+
+
+def test_eviction_tolerates_concurrent_deletes(tmp_path):
+    """Several threads putting into a full cache race on the same files."""
+    from concurrent.futures import ThreadPoolExecutor
+    cache = ResponseCache(str(tmp_path), max_bytes=600)
+
+    def put(i):
+        cache.put("quote", f"T{i}", None, [{"price": i, "pad": "x" * 150}])
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(put, range(200)))
+    assert sum(1 for name in os.listdir(tmp_path / "http") if name.endswith(".json")) <= 3
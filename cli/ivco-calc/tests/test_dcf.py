@@ -1,4 +1,6 @@
 """Test three-stage DCF against TSMC ground truth."""
+import random
+
 import pytest
 from ivco_calc.dcf import calc_three_stage_dcf
 
@@ -44,3 +46,85 @@ def test_dcf_zero_shares():
             stage2_cagr=0.10, stage3_cagr=0.03, discount_rate=0.08,
             long_term_debt=0, shares_outstanding_raw=0,
         )
+
+
+def test_tsmc_fast_matches_loop(tsmc_expected_oe, tsmc_parameters, tsmc_expected_iv):
+    """Closed-form fast path matches the year-by-year loop and Allen's numbers."""
+    params = tsmc_parameters
+    kwargs = dict(
+        latest_oe=tsmc_expected_oe[2022], cagr=tsmc_expected_iv["cagr"],
+        cc_low=params["cc_low"], cc_high=params["cc_high"],
+        stage2_cagr=params["stage2_cagr"], stage3_cagr=params["stage3_cagr"],
+        discount_rate=params["discount_rate"], long_term_debt=params["long_term_debt"],
+        shares_outstanding_raw=params["shares_outstanding_raw"],
+        share_par_value=params["share_par_value"],
+    )
+    loop = calc_three_stage_dcf(**kwargs)
+    fast = calc_three_stage_dcf(**kwargs, fast=True)
+    assert fast["iv_per_share_low"] == tsmc_expected_iv["iv_per_share_low"]
+    assert fast["iv_per_share_high"] == tsmc_expected_iv["iv_per_share_high"]
+    assert fast["dcf_sum_low"] == loop["dcf_sum_low"]
+    assert fast["dcf_sum_high"] == loop["dcf_sum_high"]
+    assert "dcf_low_detail" not in fast and "dcf_high_detail" not in fast
+    assert {k: v for k, v in loop.items() if not k.endswith("_detail")} == fast
+
+
+@pytest.mark.parametrize("cagr,cc_low,stage2_cagr,stage3_cagr,discount_rate", [
+    (0.10, 1.0, 0.10, 0.03, 0.08),
+    (0.08, 1.0, 0.08, 0.02, 0.08),   # q == 1 in both explicit stages
+    (-0.05, 1.2, 0.02, 0.01, 0.09),
+    (0.35, 1.5, 0.20, 0.05, 0.12),
+])
+def test_fast_matches_loop(cagr, cc_low, stage2_cagr, stage3_cagr, discount_rate):
+    kwargs = dict(
+        latest_oe=123_456_789, cagr=cagr, cc_low=cc_low, cc_high=cc_low + 0.3,
+        stage2_cagr=stage2_cagr, stage3_cagr=stage3_cagr, discount_rate=discount_rate,
+        long_term_debt=10_000_000, shares_outstanding_raw=25_000_000,
+    )
+    loop = calc_three_stage_dcf(**kwargs)
+    fast = calc_three_stage_dcf(**kwargs, fast=True)
+    assert fast["iv_per_share_low"] == loop["iv_per_share_low"]
+    assert fast["iv_per_share_high"] == loop["iv_per_share_high"]
+    assert abs(fast["dcf_sum_low"] - loop["dcf_sum_low"]) <= 1
+
+
+def test_fast_matches_loop_near_q_one():
+    """Stage-1 growth a hair above the discount rate: the closed form must not cancel."""
+    for cagr in [0.0800000001, 0.08000001, 0.0800001, 0.080001, 0.08001, 0.0799999, 0.07999999999]:
+        kwargs = dict(
+            latest_oe=1_000_000_000_000, cagr=cagr, cc_low=1.0, cc_high=1.0,
+            stage2_cagr=cagr, stage3_cagr=0.03, discount_rate=0.08,
+            long_term_debt=0, shares_outstanding_raw=25_000_000_000,
+        )
+        loop = calc_three_stage_dcf(**kwargs)
+        fast = calc_three_stage_dcf(**kwargs, fast=True)
+        assert abs(fast["dcf_sum_low"] - loop["dcf_sum_low"]) <= 1, cagr
+
+
+def test_fast_within_documented_tolerance():
+    """Random inputs: fast dcf_sum is within a relative 1e-11 of the loop (not always equal)."""
+    rng = random.Random(7)
+    for _ in range(2000):
+        discount_rate = rng.uniform(0.01, 0.3)
+        kwargs = dict(
+            latest_oe=rng.randint(1, 10**13), cagr=rng.uniform(-0.9, 1.0), cc_low=1.0, cc_high=1.3,
+            stage2_cagr=rng.uniform(-0.5, 0.5), stage3_cagr=rng.uniform(-0.05, discount_rate - 0.001),
+            discount_rate=discount_rate, long_term_debt=0, shares_outstanding_raw=10**9,
+        )
+        loop = calc_three_stage_dcf(**kwargs)
+        fast = calc_three_stage_dcf(**kwargs, fast=True)
+        for key in ("dcf_sum_low", "dcf_sum_high"):
+            assert abs(fast[key] - loop[key]) <= max(1, 1e-11 * abs(loop[key])), kwargs
+        assert abs(fast["iv_per_share_low"] - loop["iv_per_share_low"]) <= 1
+
+
+@pytest.mark.parametrize("cagr", [-1.0, -1.5, -3.0])
+def test_fast_growth_at_or_below_minus_one(cagr):
+    """Stage-1 growth <= -1 is outside log1p's domain; fast still matches the loop."""
+    kwargs = dict(
+        latest_oe=1_000_000, cagr=cagr, cc_low=1.0, cc_high=1.0, stage2_cagr=0.05,
+        stage3_cagr=0.02, discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=1_000,
+    )
+    loop = calc_three_stage_dcf(**kwargs)
+    fast = calc_three_stage_dcf(**kwargs, fast=True)
+    assert abs(fast["dcf_sum_low"] - loop["dcf_sum_low"]) <= 1
@@ -0,0 +1,142 @@
+"""Test vectorized batch DCF against the scalar three-stage DCF."""
+import random
+
+import numpy as np
+import pytest
+from ivco_calc.dcf import calc_three_stage_dcf
+from ivco_calc.dcf_batch import calc_three_stage_dcf_batch
+
+SCALAR_KEYS = ["dcf_sum_low", "dcf_sum_high", "iv_total_low", "iv_total_high",
+               "iv_per_share_low", "iv_per_share_high"]
+
+
+def test_tsmc_batch_matches_allen(tsmc_expected_oe, tsmc_parameters, tsmc_expected_iv):
+    params = tsmc_parameters
+    result = calc_three_stage_dcf_batch(
+        latest_oe=tsmc_expected_oe[2022], cagr=tsmc_expected_iv["cagr"],
+        cc_low=params["cc_low"], cc_high=params["cc_high"],
+        stage2_cagr=params["stage2_cagr"], stage3_cagr=params["stage3_cagr"],
+        discount_rate=params["discount_rate"], long_term_debt=params["long_term_debt"],
+        shares_outstanding_raw=params["shares_outstanding_raw"],
+        share_par_value=params["share_par_value"],
+    )
+    assert int(result["iv_per_share_low"]) == tsmc_expected_iv["iv_per_share_low"]
+    assert int(result["iv_per_share_high"]) == tsmc_expected_iv["iv_per_share_high"]
+    assert "dcf_low_detail" not in result
+
+
+def test_batch_bit_for_bit_with_scalar():
+    """Random parameter sets give identical rounded results and yearly detail."""
+    rng = random.Random(42)
+    cases = []
+    for _ in range(500):
+        stage3 = rng.uniform(0.0, 0.06)
+        cases.append({
+            "latest_oe": rng.randint(1_000, 5_000_000_000_000),
+            "cagr": rng.uniform(-0.2, 0.4),
+            "cc_low": rng.uniform(0.5, 1.3),
+            "cc_high": rng.uniform(1.3, 2.0),
+            "stage2_cagr": rng.uniform(-0.05, 0.25),
+            "stage3_cagr": stage3,
+            "discount_rate": round(rng.uniform(stage3 + 0.005, 0.15), 3),
+            "long_term_debt": rng.randint(0, 2_000_000_000_000),
+            "shares_outstanding_raw": rng.randint(1_000_000, 30_000_000_000),
+            "share_par_value": rng.choice([1, 10]),
+        })
+    columns = {key: [c[key] for c in cases] for key in cases[0]}
+    batch = calc_three_stage_dcf_batch(**columns, detail=True)
+
+    for i, case in enumerate(cases):
+        scalar = calc_three_stage_dcf(**case)
+        for key in SCALAR_KEYS:
+            assert int(batch[key][i]) == scalar[key], (i, key)
+        assert round(float(batch["stage1_cagr_low"][i]), 4) == scalar["stage1_cagr_low"]
+        assert batch["dcf_low_detail"][i].tolist() == [y["value"] for y in scalar["dcf_low_detail"]]
+        assert batch["dcf_high_detail"][i].tolist() == [y["value"] for y in scalar["dcf_high_detail"]]
+
+
+def test_batch_broadcasts_grid():
+    """Scalar and array inputs broadcast; output keeps the grid shape."""
+    rates = np.array([0.07, 0.08, 0.09])[:, None]
+    stage2 = np.array([0.10, 0.15])[None, :]
+    result = calc_three_stage_dcf_batch(
+        latest_oe=1_000_000, cagr=0.10, cc_low=1.0, cc_high=1.5,
+        stage2_cagr=stage2, stage3_cagr=0.03, discount_rate=rates,
+        long_term_debt=0, shares_outstanding_raw=1_000_000,
+    )
+    assert result["iv_per_share_low"].shape == (3, 2)
+    # Higher discount rate -> lower IV; higher stage 2 growth -> higher IV
+    assert (np.diff(result["iv_per_share_low"], axis=0) < 0).all()
+    assert (np.diff(result["iv_per_share_low"], axis=1) > 0).all()
+
+
+def test_batch_invalid_discount_rate():
+    with pytest.raises(ValueError, match="discount_rate"):
+        calc_three_stage_dcf_batch(
+            latest_oe=1_000_000, cagr=0.10, cc_low=1.0, cc_high=1.5,
+            stage2_cagr=0.10, stage3_cagr=0.05, discount_rate=[0.08, 0.05],
+            long_term_debt=0, shares_outstanding_raw=1_000_000,
+        )
+
+
+def test_batch_zero_shares():
+    with pytest.raises(ValueError, match="shares_outstanding_raw"):
+        calc_three_stage_dcf_batch(
+            latest_oe=1_000_000, cagr=0.10, cc_low=1.0, cc_high=1.5,
+            stage2_cagr=0.10, stage3_cagr=0.03, discount_rate=0.08,
+            long_term_debt=0, shares_outstanding_raw=[1_000_000, 0],
+        )
+
+
+def test_batch_rejects_fractional_integer_inputs():
+    """int64 casting would truncate 1.9 to 1; integral floats are accepted."""
+    kwargs = dict(cagr=0.10, cc_low=1.0, cc_high=1.5, stage2_cagr=0.10, stage3_cagr=0.03,
+                  discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=1_000_000)
+    with pytest.raises(ValueError, match="latest_oe must be integral"):
+        calc_three_stage_dcf_batch(latest_oe=[1_000_000, 1_000_000.5], **kwargs)
+    whole = calc_three_stage_dcf_batch(latest_oe=1_000_000.0, **kwargs)
+    assert whole["iv_per_share_low"] == calc_three_stage_dcf_batch(latest_oe=1_000_000, **kwargs)["iv_per_share_low"]
+
+
+def test_closed_form_near_q_one():
+    """calc_iv_per_share_closed_form tracks the loop when growth ~ discount rate."""
+    from ivco_calc.dcf_batch import calc_iv_per_share_closed_form
+    cagrs = np.array([0.0800000001, 0.0800001, 0.080001, 0.0799999])
+    closed = calc_iv_per_share_closed_form(
+        latest_oe=1_000_000_000_000, stage1_cagr=cagrs, stage2_cagr=cagrs, stage3_cagr=0.03,
+        discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=10, share_par_value=10,
+    )
+    for cagr, iv in zip(cagrs.tolist(), closed.tolist()):
+        loop = calc_three_stage_dcf(
+            latest_oe=1_000_000_000_000, cagr=cagr, cc_low=1.0, cc_high=1.0, stage2_cagr=cagr,
+            stage3_cagr=0.03, discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=10,
+        )
+        assert abs(iv - loop["dcf_sum_low"]) <= 1
+
+
+def test_closed_form_growth_at_or_below_minus_one():
+    """growth <= -1 takes the direct sum instead of a NaN from log1p."""
+    from ivco_calc.dcf_batch import calc_iv_per_share_closed_form
+    cagrs = [-1.0, -1.5, -3.0, 0.1]
+    closed = calc_iv_per_share_closed_form(
+        latest_oe=1_000_000, stage1_cagr=np.array(cagrs), stage2_cagr=0.05, stage3_cagr=0.02,
+        discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=10, share_par_value=10,
+    )
+    for cagr, iv in zip(cagrs, closed.tolist()):
+        loop = calc_three_stage_dcf(
+            latest_oe=1_000_000, cagr=cagr, cc_low=1.0, cc_high=1.0, stage2_cagr=0.05,
+            stage3_cagr=0.02, discount_rate=0.08, long_term_debt=0, shares_outstanding_raw=10,
+        )
+        assert abs(iv - loop["dcf_sum_low"]) <= 1, cagr
+
+
+def test_single_leg():
+    """cc_high=None computes only the low leg, identical to the two-leg call."""
+    kwargs = dict(latest_oe=123_456_789, cagr=0.12, cc_low=np.array([1.0, 1.2, 1.5]), stage2_cagr=0.1,
+                  stage3_cagr=0.03, discount_rate=0.08, long_term_debt=10_000_000,
+                  shares_outstanding_raw=25_000_000, detail=True)
+    both = calc_three_stage_dcf_batch(cc_high=1.6, **kwargs)
+    low = calc_three_stage_dcf_batch(cc_high=None, **kwargs)
+    assert list(low) == [key for key in both if "high" not in key]
+    for key, value in low.items():
+        np.testing.assert_array_equal(value, both[key])
@@ -45,3 +45,65 @@ def test_fetch_cli_requires_ticker():
     result = runner.invoke(cli, ["fetch", "--years", "5"])
     assert result.exit_code != 0
     assert "Missing" in result.output or "required" in result.output.lower()
+
+
+def test_fetch_many_keeps_order_and_isolates_errors():
+    """Multi-ticker fetch reports per-ticker failures without aborting."""
+    from ivco_calc.fetchers.multi import fetch_many
+
+    def quote(ticker):
+        if ticker == "BAD":
+            raise ValueError("unknown ticker")
+        return {"price": 1}
+
+    fetcher = MagicMock()
+    fetcher.fetch_income_statements.side_effect = lambda t, limit: [{"ticker": t}]
+    fetcher.fetch_balance_sheet.return_value = []
+    fetcher.fetch_quote.side_effect = quote
+    results = fetch_many(fetcher, ["TSM", "BAD", "AAPL"], years=5, max_workers=3)
+    assert [r["ticker"] for r in results] == ["TSM", "BAD", "AAPL"]
+    assert "error" in results[1] and "error" not in results[0]
+
+
+def test_read_tickers(tmp_path):
+    from ivco_calc.fetchers.multi import read_tickers
+    path = tmp_path / "universe.txt"
+    path.write_text("# watchlist\nTSM\naapl  # apple\n\nMSFT\n")
+    assert read_tickers("TSM,NVDA", str(path)) == ["TSM", "NVDA", "aapl", "MSFT"]
+
+
+def test_connection_pool_reuses_keepalive_connection():
+    """Sequential requests share one TCP connection."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from ivco_calc.fetchers.pool import HTTPConnectionPool
+
+    peers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            peers.append(self.client_address)
+            body = json.dumps([{"path": self.path}]).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}/api/v3"
+        fetcher = FMPFetcher(api_key="k", pool=HTTPConnectionPool(base))
+        fetcher.BASE_URL = base
+        for _ in range(3):
+            fetcher.fetch_quote("TSM")
+        assert len(peers) == 3
+        assert len(set(peers)) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,84 @@
+"""Test content-addressed memoization of valuation results."""
+import json
+import sqlite3
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc.memo import MemoCache, input_key
+from ivco_calc.store import StatementStore
+from test_store import _fetched
+
+
+def test_input_key_is_canonical():
+    """Key order and 10 vs 10.0 do not matter; any value change does."""
+    a = input_key("calc-iv", {"cagr": 0.1766, "share_par_value": 10})
+    assert a == input_key("calc-iv", {"share_par_value": 10.0, "cagr": 0.1766})
+    assert a != input_key("calc-iv", {"cagr": 0.1767, "share_par_value": 10})
+    assert a != input_key("analyze", {"cagr": 0.1766, "share_par_value": 10})
+
+
+def test_memo_lru_and_disk_tiers(tmp_path):
+    """Misses compute once; hits come from the LRU, then from disk in a new process."""
+    path = str(tmp_path / "memo.db")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"iv": [1, 2]}
+
+    memo = MemoCache(path, maxsize=1)
+    assert memo.memoize("k", {"x": 1}, compute) == {"iv": [1, 2]}
+    assert memo.memoize("k", {"x": 1}, compute) is memo.memoize("k", {"x": 1}, compute)
+    assert len(calls) == 1 and memo.stats["hits"] == 2
+
+    fresh = MemoCache(path)
+    assert fresh.memoize("k", {"x": 1}, compute) == {"iv": [1, 2]}
+    assert len(calls) == 1 and fresh.stats["disk_hits"] == 1
+
+
+def test_calc_iv_memoizes_only_in_batch(monkeypatch):
+    """A one-shot calc-iv computes directly; --batch shares the in-process LRU."""
+    from ivco_calc import memo
+    monkeypatch.setattr(memo, "_default", {})
+    args = ["calc-iv", "--latest-oe", "100", "--cagr", "0.1", "--cc-low", "1.2", "--cc-high", "1.5",
+            "--stage2-cagr", "0.08", "--stage3-cagr", "0.03", "--discount-rate", "0.1",
+            "--long-term-debt", "0", "--shares-outstanding", "10"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0 and memo._default == {}
+
+    result = CliRunner().invoke(cli, args + ["--batch"], input="{}\n{}\n")
+    assert result.exit_code == 0 and len(result.output.splitlines()) == 2
+    assert memo._default[None].stats["hits"] == 1
+
+
+def test_analyze_store_memo_invalidated_by_import(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """A repeated analyze is served from the memo until the ticker is re-imported."""
+    db = str(tmp_path / "s.db")
+    store = StatementStore(db)
+    store.import_fetched(_fetched(tsmc_annual_data, tsmc_parameters))
+    args = ["analyze", "--ticker", "TSM", "--source", "store", "--store", db,
+            "--maintenance-ratio", "0.20", "--cc-low", "1.2", "--cc-high", "1.5",
+            "--long-term-debt", str(tsmc_parameters["long_term_debt"])]
+    runner = CliRunner()
+    first = json.loads(runner.invoke(cli, args).output)
+    assert json.loads(runner.invoke(cli, args).output) == first
+
+    store.import_fetched(_fetched(tsmc_annual_data, tsmc_parameters, price=5000))
+    updated = json.loads(runner.invoke(cli, args).output)
+    assert first["analysis"]["current_price"] == 4565
+    assert updated["analysis"]["current_price"] == 5000
+
+
+def test_disk_tier_is_pruned(tmp_path):
+    """Writes drop entries past max_age, then the oldest beyond max_entries."""
+    path = str(tmp_path / "memo.db")
+    memo = MemoCache(path, max_entries=3, max_age=3600)
+    for i in range(5):
+        memo.put(f"k{i}", "k", i)
+    conn = sqlite3.connect(path)
+    assert sorted(row[0] for row in conn.execute("SELECT key FROM results")) == ["k2", "k3", "k4"]
+
+    with conn:
+        conn.execute("UPDATE results SET created_at = created_at - 7200 WHERE key = 'k2'")
+    memo.put("k5", "k", 5)
+    assert sorted(row[0] for row in conn.execute("SELECT key FROM results")) == ["k3", "k4", "k5"]
+    assert MemoCache(path).get("k2") is None and MemoCache(path).get("k5") == 5
@@ -0,0 +1,40 @@
+"""Test the cross-process token-bucket rate limiter."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ivco_calc.fetchers.ratelimit import QuotaExceeded, RateLimiter
+
+
+def test_burst_then_throttle(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "rl.json"), rate=20, per_day=1000)
+    start = time.monotonic()
+    for _ in range(25):  # 20-token burst, then 5 more at 20/s
+        limiter.acquire()
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+
+def test_daily_budget_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rl.json")
+    first = RateLimiter(path, rate=100, per_day=3)
+    second = RateLimiter(path, rate=100, per_day=3)  # e.g. another cron job
+    first.acquire()
+    second.acquire()
+    first.acquire()
+    with pytest.raises(QuotaExceeded):
+        second.acquire()
+    assert second.usage()["remaining"] == 0
+
+
+def test_concurrent_threads_never_overspend(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "rl.json"), rate=1000, per_day=50)
+
+    def take(_):
+        try:
+            limiter.acquire()
+            return 1
+        except QuotaExceeded:
+            return 0
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert sum(pool.map(take, range(80))) == 50
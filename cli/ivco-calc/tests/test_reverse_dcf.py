@@ -0,0 +1,79 @@
+"""Test reverse DCF (market-implied growth / discount rate)."""
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc.dcf_batch import calc_iv_per_share_closed_form
+from ivco_calc.reverse_dcf import reverse_dcf_records, solve_implied, solve_implied_batch
+
+TSMC = dict(
+    latest_oe=1_239_030_648, stage2_cagr=0.15, stage3_cagr=0.05,
+    long_term_debt=1_673_432_925, shares_outstanding_raw=259_303_805,
+)
+
+
+def test_round_trip_tsmc_cagr(tsmc_expected_iv):
+    """Pricing TSMC at its closed-form low IV implies stage-1 CAGR = CAGR x CC low."""
+    stage1 = tsmc_expected_iv["stage1_cagr_low"]
+    price = float(calc_iv_per_share_closed_form(stage1_cagr=stage1, discount_rate=0.08, **TSMC))
+    assert round(price) == tsmc_expected_iv["iv_per_share_low"]
+    result = solve_implied(price, **TSMC)
+    assert result["converged"]
+    assert result["implied"] == pytest.approx(stage1, abs=1e-8)
+
+
+def test_round_trip_discount_rate():
+    price = float(calc_iv_per_share_closed_form(stage1_cagr=0.20, discount_rate=0.09, **TSMC))
+    result = solve_implied(price, solve_for="discount_rate", stage1_cagr=0.20, **TSMC)
+    assert result["implied"] == pytest.approx(0.09, abs=1e-8)
+
+
+def test_batch_matches_scalar_and_flags_unbracketed():
+    prices = np.array([500.0, 4565.0, 12_000.0, 1e12])
+    batch = solve_implied_batch(prices, **TSMC)
+    for i, p in enumerate(prices[:3]):
+        assert batch["implied"][i] == pytest.approx(solve_implied(float(p), **TSMC)["implied"], abs=1e-9)
+    assert np.all(np.diff(batch["implied"][:3]) > 0)
+    assert not batch["converged"][3] and np.isnan(batch["implied"][3])
+
+
+def test_records_missing_fields():
+    with pytest.raises(ValueError, match="shares_outstanding"):
+        reverse_dcf_records([{"ticker": "TSM", "price": 100, "latest_oe": 1}])
+    with pytest.raises(ValueError, match="cagr"):
+        reverse_dcf_records([{"price": 100, "latest_oe": 1, "shares_outstanding": 1}],
+                            solve_for="discount_rate")
+
+
+def test_reverse_dcf_cli_single(tsmc_expected_iv):
+    result = CliRunner().invoke(cli, [
+        "reverse-dcf", "--price", "4565", "--latest-oe", "1239030648",
+        "--cagr", str(tsmc_expected_iv["cagr"]), "--long-term-debt", "1673432925",
+        "--shares-outstanding", "259303805",
+    ])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert data["converged"]
+    assert data["implied_cc"] == pytest.approx(1.2, abs=1e-3)
+
+
+def test_reverse_dcf_cli_batch_ndjson():
+    lines = "\n".join(json.dumps(r) for r in [
+        {"ticker": "TSM", "price": 4565, "latest_oe": 1239030648, "long_term_debt": 1673432925},
+        {"ticker": "TSM-CHEAP", "price": 1000, "latest_oe": 1239030648, "long_term_debt": 1673432925},
+    ])
+    result = CliRunner().invoke(cli, [
+        "reverse-dcf", "--input", "-", "--shares-outstanding", "259303805",
+    ], input=lines)
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert [d["ticker"] for d in data] == ["TSM", "TSM-CHEAP"]
+    assert data[0]["implied_stage1_cagr"] > data[1]["implied_stage1_cagr"]
+
+
+def test_reverse_dcf_cli_missing_price():
+    result = CliRunner().invoke(cli, ["reverse-dcf", "--latest-oe", "1", "--shares-outstanding", "1"])
+    assert result.exit_code == 1
+    assert "price" in json.loads(result.output)["error"]
@@ -0,0 +1,125 @@
+"""Test ivco screen: universe-wide analyze ranked by margin of safety."""
+import json
+from unittest.mock import patch
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc.screen import load_universe, run_screen
+
+
+class FakeFetcher:
+    """TSMC statements for every ticker; per-ticker price, optional failures."""
+
+    def __init__(self, income, shares, prices, failing=()):
+        self.income = income
+        self.shares = shares
+        self.prices = prices
+        self.failing = set(failing)
+        self.calls = []
+
+    def fetch_income_statements(self, ticker, limit=10):
+        self.calls.append(ticker)
+        if ticker in self.failing:
+            raise ConnectionError(f"{ticker} unavailable")
+        return [dict(row, ticker=ticker) for row in self.income]
+
+    def fetch_balance_sheet(self, ticker, limit=10):
+        return [{"year": 2022, "shares_outstanding": self.shares}]
+
+    def fetch_quote(self, ticker):
+        return {"ticker": ticker, "price": self.prices[ticker], "pe": 15}
+
+
+def _defaults(tsmc_parameters):
+    return {
+        "maintenance_ratio": 0.20,
+        "cc_low": 1.2,
+        "cc_high": 1.5,
+        "long_term_debt": tsmc_parameters["long_term_debt"],
+    }
+
+
+def test_load_universe_formats(tmp_path):
+    """Plain ticker list, JSON array and NDJSON with overrides."""
+    plain = tmp_path / "u.txt"
+    plain.write_text("TSM\n# comment\nAAPL  # inline\n\n")
+    assert load_universe(str(plain)) == [{"ticker": "TSM"}, {"ticker": "AAPL"}]
+
+    array = tmp_path / "u.json"
+    array.write_text(json.dumps(["TSM", {"ticker": "AAPL", "cc_low": 1.0}]))
+    assert load_universe(str(array)) == [{"ticker": "TSM"}, {"ticker": "AAPL", "cc_low": 1.0}]
+
+    ndjson = tmp_path / "u.ndjson"
+    ndjson.write_text('{"ticker": "TSM", "discount_rate": 0.09}\n{"ticker": "AAPL"}\n')
+    assert [e["ticker"] for e in load_universe(str(ndjson))] == ["TSM", "AAPL"]
+
+
+def test_screen_ranks_and_reports_errors(tsmc_annual_data, tsmc_parameters):
+    """Rows ranked by margin of safety; a failing ticker does not abort the run."""
+    fetcher = FakeFetcher(tsmc_annual_data, tsmc_parameters["shares_outstanding_raw"],
+                          {"CHEAP": 2282.5, "DEAR": 9130, "BAD": 1}, failing={"BAD"})
+    universe = [{"ticker": "DEAR"}, {"ticker": "BAD"}, {"ticker": "CHEAP"}]
+    result = run_screen(universe, fetcher, _defaults(tsmc_parameters))
+
+    assert [r["ticker"] for r in result["ranked"]] == ["CHEAP", "DEAR"]
+    cheap, dear = result["ranked"]
+    assert cheap["rank"] == 1 and cheap["iv_per_share_low"] == 4565
+    assert abs(cheap["margin_of_safety"] - 0.5) < 1e-12
+    assert abs(dear["margin_of_safety"] + 1.0) < 1e-12
+    assert result["errors"] == [{"ticker": "BAD", "stage": "fetch", "error": "ConnectionError: BAD unavailable"}]
+    assert result["summary"] == {"universe": 3, "valued": 2, "failed": 1, "resumed": 0}
+
+
+def test_screen_per_ticker_overrides(tsmc_annual_data, tsmc_parameters):
+    """Universe entries override the default parameters."""
+    fetcher = FakeFetcher(tsmc_annual_data, tsmc_parameters["shares_outstanding_raw"], {"A": 4000, "B": 4000})
+    universe = [{"ticker": "A"}, {"ticker": "B", "discount_rate": 0.09}]
+    rows = {r["ticker"]: r for r in run_screen(universe, fetcher, _defaults(tsmc_parameters))["ranked"]}
+    assert rows["B"]["parameters"]["discount_rate"] == 0.09
+    assert rows["B"]["iv_per_share_low"] < rows["A"]["iv_per_share_low"]
+
+
+def test_screen_resumes_from_checkpoint(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """A re-run skips tickers already valued and retries the failures."""
+    checkpoint = str(tmp_path / "screen.ndjson")
+    prices = {"A": 4000, "B": 3000}
+    universe = [{"ticker": "A"}, {"ticker": "B"}]
+    shares = tsmc_parameters["shares_outstanding_raw"]
+
+    first = FakeFetcher(tsmc_annual_data, shares, prices, failing={"B"})
+    run_screen(universe, first, _defaults(tsmc_parameters), checkpoint_path=checkpoint)
+
+    second = FakeFetcher(tsmc_annual_data, shares, prices)
+    result = run_screen(universe, second, _defaults(tsmc_parameters), checkpoint_path=checkpoint)
+    assert second.calls == ["B"]
+    assert [r["ticker"] for r in result["ranked"]] == ["B", "A"]
+    assert result["errors"] == []
+    assert result["summary"]["resumed"] == 1
+
+
+def test_screen_compute_workers_match_inline(tsmc_annual_data, tsmc_parameters):
+    """Valuation in worker processes gives the same ranking as in-process."""
+    prices = {t: 3000 + 500 * i for i, t in enumerate("ABCD")}
+    universe = [{"ticker": t} for t in "ABCD"]
+    shares = tsmc_parameters["shares_outstanding_raw"]
+    inline = run_screen(universe, FakeFetcher(tsmc_annual_data, shares, prices), _defaults(tsmc_parameters))
+    pooled = run_screen(universe, FakeFetcher(tsmc_annual_data, shares, prices), _defaults(tsmc_parameters),
+                        compute_workers=2)
+    assert pooled["ranked"] == inline["ranked"]
+
+
+def test_screen_cli_csv(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """CLI screen prints the ranked table."""
+    universe = tmp_path / "universe.txt"
+    universe.write_text("A\nB\n")
+    fetcher = FakeFetcher(tsmc_annual_data, tsmc_parameters["shares_outstanding_raw"], {"A": 5000, "B": 4000})
+    with patch("ivco_calc.cli.make_fetcher", return_value=fetcher):
+        result = CliRunner().invoke(cli, [
+            "screen", "--universe", str(universe), "--maintenance-ratio", "0.20",
+            "--cc-low", "1.2", "--cc-high", "1.5",
+            "--long-term-debt", str(tsmc_parameters["long_term_debt"]), "--format", "csv",
+        ])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith("rank,ticker,current_price,iv_per_share_low")
+    assert lines[1].startswith("1,B,4000,4565")
+    assert lines[2].startswith("2,A,5000,4565")
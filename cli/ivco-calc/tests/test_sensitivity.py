@@ -0,0 +1,85 @@
+"""Test IV sensitivity grid."""
+import io
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc.dcf import calc_three_stage_dcf
+from ivco_calc.sensitivity import calc_sensitivity_grid, parse_range
+
+
+def test_parse_range():
+    assert parse_range("0.08") == [0.08]
+    assert parse_range("0.06,0.08, 0.10") == [0.06, 0.08, 0.10]
+    assert parse_range("0.06:0.10:5") == [0.06, 0.07, 0.08, 0.09, 0.10]
+    with pytest.raises(ValueError):
+        parse_range("0.06:0.10")
+
+
+def test_grid_matches_scalar_dcf(tsmc_expected_oe, tsmc_parameters, tsmc_expected_iv):
+    params = tsmc_parameters
+    grid = calc_sensitivity_grid(
+        latest_oe=tsmc_expected_oe[2022], cagr=tsmc_expected_iv["cagr"],
+        discount_rates=[0.04, 0.08, 0.10], stage2_cagrs=[0.10, 0.15],
+        stage3_cagrs=[0.05], ccs=[1.2, 1.5],
+        long_term_debt=params["long_term_debt"],
+        shares_outstanding_raw=params["shares_outstanding_raw"],
+    )
+    values = grid["iv_per_share"]
+    assert values.shape == (3, 2, 1, 2)
+    # Allen's TSMC case: r=8%, g2=15%, g3=5%, CC 1.2 / 1.5
+    assert values[1, 1, 0, 0] == tsmc_expected_iv["iv_per_share_low"]
+    assert values[1, 1, 0, 1] == tsmc_expected_iv["iv_per_share_high"]
+    # r=4% <= g3=5%: no perpetuity
+    assert np.isnan(values[0]).all()
+
+    scalar = calc_three_stage_dcf(
+        latest_oe=tsmc_expected_oe[2022], cagr=tsmc_expected_iv["cagr"],
+        cc_low=1.2, cc_high=1.5, stage2_cagr=0.10, stage3_cagr=0.05, discount_rate=0.10,
+        long_term_debt=params["long_term_debt"],
+        shares_outstanding_raw=params["shares_outstanding_raw"],
+    )
+    assert values[2, 0, 0, 0] == scalar["iv_per_share_low"]
+    assert values[2, 0, 0, 1] == scalar["iv_per_share_high"]
+
+
+GRID_ARGS = [
+    "sensitivity", "--latest-oe", "1239030648", "--cagr", "0.1766",
+    "--long-term-debt", "1673432925", "--shares-outstanding", "259303805",
+    "--discount-rate", "0.04,0.08", "--stage2-cagr", "0.10:0.15:2", "--cc", "1.2,1.5",
+]
+
+
+def test_sensitivity_cli_json():
+    result = CliRunner().invoke(cli, GRID_ARGS)
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert data["shape"] == [2, 2, 1, 2]
+    assert data["axes"]["stage2_cagr"] == [0.10, 0.15]
+    assert data["iv_per_share"][0][0][0] == [None, None]
+    assert all(isinstance(v, int) for v in data["iv_per_share"][1][1][0])
+
+
+def test_sensitivity_cli_csv():
+    result = CliRunner().invoke(cli, GRID_ARGS + ["--format", "csv"])
+    assert result.exit_code == 0, result.output
+    lines = result.output.strip().splitlines()
+    assert lines[0] == "stage3_cagr,cc,discount_rate,0.1,0.15"
+    assert len(lines) == 1 + 2 * 2  # header + (cc x discount_rate) rows
+    assert lines[1] == "0.05,1.2,0.04,,"
+
+
+def test_sensitivity_cli_npy(tmp_path):
+    out = tmp_path / "grid.npy"
+    result = CliRunner().invoke(cli, GRID_ARGS + ["--format", "npy", "--output", str(out)])
+    assert result.exit_code == 0, result.output
+    values = np.load(io.BytesIO(out.read_bytes()))
+    assert values.shape == (2, 2, 1, 2)
+
+
+def test_sensitivity_cli_bad_range():
+    result = CliRunner().invoke(cli, GRID_ARGS + ["--cc", "1.0:1.5"])
+    assert result.exit_code != 0
+    assert "START:STOP:NUM" in result.output
@@ -0,0 +1,110 @@
+"""Test `ivco serve`: JSON-RPC calls, batches, errors and concurrent clients."""
+import http.client
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ivco_calc import cli as cli_module
+from ivco_calc.server import make_server, TOOL_ERROR, METHOD_NOT_FOUND, INVALID_PARAMS
+
+TSMC_2022_OE = {"net_income": 1_016_900_515, "depreciation": 428_498_179,
+                "amortization": 8_756_094, "capex": 1_075_620_698, "maintenance_ratio": 0.20}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(cli_module, "_shared_fetchers", None)
+    srv = make_server(port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(srv, payload, conn=None):
+    conn = conn or http.client.HTTPConnection(*srv.server_address[:2], timeout=10)
+    conn.request("POST", "/rpc", json.dumps(payload), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = response.read()
+    return response.status, json.loads(body) if body else None
+
+
+def test_single_call_matches_cli(server, tsmc_expected_oe):
+    """A call returns what the command prints; option names work with _ or -."""
+    params = dict(TSMC_2022_OE, **{"maintenance-ratio": 0.20})
+    del params["maintenance_ratio"]
+    status, response = _post(server, {"jsonrpc": "2.0", "id": 7, "method": "calc-oe", "params": params})
+    assert status == 200 and response["id"] == 7
+    assert response["result"]["owner_earnings"] == tsmc_expected_oe[2022]
+
+
+def test_batch_and_errors(server):
+    """A batch is answered in one response; failures are per call, notifications get no entry."""
+    status, responses = _post(server, [
+        {"jsonrpc": "2.0", "id": 1, "method": "calc-cagr",
+         "params": ["--start-oe", "100", "--end-oe", "200", "--start-year", "2013", "--end-year", "2022"]},
+        {"jsonrpc": "2.0", "id": 2, "method": "nope"},
+        {"jsonrpc": "2.0", "id": 3, "method": "calc-oe", "params": {"net_income": 1}},
+        {"jsonrpc": "2.0", "id": 4, "method": "tool-info"},
+        {"jsonrpc": "2.0", "id": 5, "method": "verify", "params": {
+            "computed_low": 100, "computed_high": 200, "expected_low": 100, "expected_high": 300}},
+        {"jsonrpc": "2.0", "method": "calc-oe", "params": TSMC_2022_OE},
+    ])
+    assert status == 200
+    by_id = {r["id"]: r for r in responses}
+    assert set(by_id) == {1, 2, 3, 4, 5}
+    assert by_id[1]["result"]["cagr"] > 0
+    assert by_id[2]["error"]["code"] == METHOD_NOT_FOUND
+    assert by_id[3]["error"]["code"] == INVALID_PARAMS
+    assert by_id[4]["error"]["code"] == METHOD_NOT_FOUND  # not in TOOLS
+    assert by_id[5]["result"]["status"] == "FAIL"  # exit status 1, but the result is still returned
+
+
+def test_tool_error(server, tmp_path):
+    """A command's {"error": ...} output becomes a JSON-RPC error; integral floats pass as ints."""
+    status, response = _post(server, {"jsonrpc": "2.0", "id": 1, "method": "store.query",
+                                      "params": {"ticker": "NONE", "store": str(tmp_path / "store.db")}})
+    assert status == 200 and response["error"]["code"] == TOOL_ERROR
+    assert "NONE" in response["error"]["message"]
+    _, response = _post(server, {"jsonrpc": "2.0", "id": 2, "method": "calc-oe",
+                                 "params": dict(TSMC_2022_OE, net_income=1e9)})
+    assert "result" in response
+
+
+def test_concurrent_keepalive_clients(server):
+    """Several clients, each reusing one connection, get their own results."""
+    def client(n):
+        conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        results = []
+        for i in range(20):
+            params = dict(TSMC_2022_OE, net_income=n * 1000 + i)
+            _, response = _post(server, {"jsonrpc": "2.0", "id": i, "method": "calc-oe", "params": params}, conn)
+            results.append(response["result"]["owner_earnings"])
+        conn.close()
+        return n, results
+
+    with ThreadPoolExecutor(8) as pool:
+        for n, results in pool.map(client, range(8)):
+            base = 428_498_179 + 8_756_094 - round(1_075_620_698 * 0.20)
+            assert results == [pytest.approx(n * 1000 + i + base, abs=1) for i in range(20)]
+
+
+def test_stdin_is_empty_only_during_a_call(server):
+    """A command reading stdin sees nothing; the server's own stdin is left alone."""
+    stdin = sys.stdin
+    status, response = _post(server, {"jsonrpc": "2.0", "id": 1, "method": "calc-oe",
+                                      "params": {"batch": True, "maintenance_ratio": 0.2}})
+    assert status == 200 and response["result"] is None
+    assert sys.stdin is stdin
+
+
+def test_tools_endpoint(server):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    conn.request("GET", "/tools")
+    tools = json.loads(conn.getresponse().read())
+    assert "calc-iv" in [t["name"] for t in tools]
+    assert {"calc-oe", "analyze", "store.import", "store.sink"} <= set(server.methods)
+    assert "serve" not in server.methods
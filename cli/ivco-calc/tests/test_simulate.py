@@ -0,0 +1,112 @@
+"""Test Monte Carlo IV simulation."""
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc import simulate
+from ivco_calc.simulate import parse_distribution, simulate_iv
+
+TSMC_ARGS = dict(
+    latest_oe=1_239_030_648, long_term_debt=1_673_432_925, shares_outstanding_raw=259_303_805,
+)
+
+
+def test_parse_distribution():
+    assert parse_distribution("0.08") == ("fixed", (0.08,))
+    assert parse_distribution("uniform:1.2,1.5") == ("uniform", (1.2, 1.5))
+    with pytest.raises(ValueError, match="takes 3"):
+        parse_distribution("triangular:1,2")
+    with pytest.raises(ValueError, match="Unknown"):
+        parse_distribution("beta:1,2")
+    with pytest.raises(ValueError, match="spread must be >= 0"):
+        parse_distribution("normal:0.08,-0.01")
+    with pytest.raises(ValueError, match="LOW <= MODE <= HIGH"):
+        parse_distribution("triangular:1.0,1.6,1.5")
+    with pytest.raises(ValueError, match="LOW <= HIGH"):
+        parse_distribution("uniform:1.5,1.2")
+    with pytest.raises(ValueError, match="finite"):
+        parse_distribution("nan")
+
+
+def test_fixed_distributions_collapse_to_point(tsmc_expected_iv):
+    """All-fixed inputs reproduce Allen's low IV at every percentile."""
+    result = simulate_iv(
+        **TSMC_ARGS, cagr=str(tsmc_expected_iv["cagr"]), cc="1.2",
+        stage2_cagr="0.15", stage3_cagr="0.05", discount_rate="0.08", paths=1_000,
+    )
+    assert set(result["iv_per_share_percentiles"].values()) == {tsmc_expected_iv["iv_per_share_low"]}
+    assert result["rejected_paths"] == 0
+
+
+def test_seeded_and_worker_independent():
+    kwargs = dict(
+        **TSMC_ARGS, cagr="normal:0.17,0.03", cc="uniform:1.2,1.5",
+        stage2_cagr="triangular:0.10,0.15,0.18", stage3_cagr="uniform:0.03,0.05",
+        discount_rate="normal:0.08,0.01", paths=20_000, chunk_size=5_000, seed=7,
+    )
+    single = simulate_iv(**kwargs)
+    pooled = simulate_iv(**kwargs, workers=2)
+    assert single == pooled
+    assert simulate_iv(**{**kwargs, "seed": 8}) != single
+    p = single["iv_per_share_percentiles"]
+    assert p["p5"] < p["p50"] < p["p95"]
+    assert single["valid_paths"] + single["rejected_paths"] == 20_000
+
+
+def test_rejects_paths_without_perpetuity():
+    result = simulate_iv(
+        **TSMC_ARGS, cagr="0.17", cc="1.2", stage2_cagr="0.15",
+        stage3_cagr="0.05", discount_rate="uniform:0.03,0.07", paths=1_000,
+    )
+    assert 0 < result["rejected_paths"] < 1_000
+
+
+def test_simulate_cli():
+    result = CliRunner().invoke(cli, [
+        "simulate", "--latest-oe", "1239030648", "--cagr", "normal:0.17,0.03",
+        "--cc", "uniform:1.2,1.5", "--long-term-debt", "1673432925",
+        "--shares-outstanding", "259303805", "--paths", "5000", "--seed", "1",
+        "--price", "4000",
+    ])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert set(data["iv_per_share_percentiles"]) == {"p5", "p25", "p50", "p75", "p95"}
+    assert 0 <= data["prob_iv_above_price"] <= 1
+
+
+def test_simulate_cli_bad_distribution():
+    result = CliRunner().invoke(cli, [
+        "simulate", "--latest-oe", "1", "--cagr", "poisson:1", "--cc", "1.2",
+        "--long-term-debt", "0", "--shares-outstanding", "1",
+    ])
+    assert result.exit_code != 0
+    assert "Unknown distribution" in result.output
+
+
+def test_simulate_cli_bad_parameters():
+    """Invalid parameters are a usage error, not a numpy traceback."""
+    result = CliRunner().invoke(cli, [
+        "simulate", "--latest-oe", "1", "--cagr", "normal:0.1,-0.02", "--cc", "1.2",
+        "--long-term-debt", "0", "--shares-outstanding", "1",
+    ])
+    assert result.exit_code == 2
+    assert "spread must be >= 0" in result.output
+
+
+def test_merged_summaries_match_exact_statistics():
+    """Chunk summaries merge to the exact mean/std and percentiles within RELATIVE_ACCURACY."""
+    rng = np.random.default_rng(3)
+    iv = np.concatenate([rng.normal(500, 300, 30_000), rng.lognormal(8, 1, 10_000), [0.0, -1e-12]])
+    rng.shuffle(iv)
+    summary, _ = simulate._merge_chunks((simulate._summarize(chunk, 600.0), 0)
+                                        for chunk in np.array_split(iv, 7))
+    assert summary["n"] == iv.size and summary["above_price"] == int((iv > 600).sum())
+    assert summary["mean"] == pytest.approx(iv.mean(), rel=1e-12)
+    assert (summary["m2"] / summary["n"]) ** 0.5 == pytest.approx(iv.std(), rel=1e-12)
+    percentiles = (0, 1, 5, 25, 50, 75, 95, 99, 100)
+    for p, value in zip(percentiles, simulate._percentiles(summary, percentiles)):
+        lower, upper = np.percentile(iv, p, method="lower"), np.percentile(iv, p, method="higher")
+        slack = simulate.RELATIVE_ACCURACY * max(abs(lower), abs(upper))
+        assert lower - slack <= value <= upper + slack, p
@@ -0,0 +1,53 @@
+"""Startup budget: `ivco --help` and `ivco calc-oe` import only what they need.
+
+Measured with `python -X importtime` in a subprocess; the budget covers every
+module imported beyond bare interpreter startup (best of three runs).
+Override with IVCO_IMPORT_BUDGET_MS on slow machines.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+BUDGET_MS = float(os.environ.get("IVCO_IMPORT_BUDGET_MS", 100))
+RUNS = 3
+# Never needed to print help or compute one Owner Earnings value
+HEAVY = ("numpy", "sqlite3", "http.client", "concurrent.futures", "ivco_calc.fetchers",
+         "ivco_calc.analyze", "ivco_calc.dcf", "ivco_calc.screen", "ivco_calc.memo", "ivco_calc.server")
+LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+
+def _importtime(*args: str) -> tuple[dict[str, int], set[str], str]:
+    """One `ivco` run: top-level imports -> cumulative µs, every module imported, stdout."""
+    code = "import sys; from ivco_calc.cli import cli; cli(sys.argv[1:])" if args else "pass"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code, *args],
+                          capture_output=True, text=True, timeout=60)
+    top, imported = {}, set()
+    for match in filter(None, map(LINE.match, proc.stderr.splitlines())):
+        imported.add(match.group(3))
+        if not match.group(2):
+            top[match.group(3)] = int(match.group(1))
+    return top, imported, proc.stdout
+
+
+@pytest.mark.parametrize("args", [
+    ("--help",),
+    ("calc-oe", "--net-income", "1016900515", "--depreciation", "428498179",
+     "--amortization", "8756094", "--capex", "1075620698", "--maintenance-ratio", "0.20"),
+])
+def test_import_budget(args):
+    baseline = set(_importtime()[0])
+    best = None
+    for _ in range(RUNS):
+        top, imported, stdout = _importtime(*args)
+        assert stdout  # the command actually ran
+        ms = sum(us for name, us in top.items() if name not in baseline) / 1000
+        best = ms if best is None else min(best, ms)
+    assert best <= BUDGET_MS, f"`ivco {args[0]}` imports took {best:.1f} ms (budget {BUDGET_MS:.0f} ms)"
+
+    heavy = sorted(name for name in imported if name.startswith(HEAVY))
+    assert not heavy, f"`ivco {args[0]}` imported {heavy}"
+    commands = {name for name in imported if name.startswith("ivco_calc.commands.")}
+    assert commands == (set() if args[0] == "--help" else {"ivco_calc.commands.calc_oe"})
@@ -0,0 +1,83 @@
+"""Test the local SQLite statement store and analyze --source store."""
+import json
+from click.testing import CliRunner
+from ivco_calc.cli import cli
+from ivco_calc.fetchers.store import StoreFetcher
+from ivco_calc.store import StatementStore
+
+
+def _fetched(tsmc_annual_data, tsmc_parameters, price=4565):
+    """TSMC data in `ivco fetch` output format (newest year first, like FMP)."""
+    income = [
+        dict(row, ticker="TSM", period="FY", revenue=0, gross_profit=0)
+        for row in sorted(tsmc_annual_data, key=lambda r: -r["year"])
+    ]
+    balance = [{"ticker": "TSM", "year": 2022, "total_debt": 0, "total_assets": 0,
+                "shares_outstanding": tsmc_parameters["shares_outstanding_raw"]}]
+    quote = {"ticker": "TSM", "price": price, "pe": 15, "market_cap": 0, "change_pct": 0}
+    return {"ticker": "TSM", "source": "fmp", "income_statements": income, "balance_sheet": balance, "quote": quote}
+
+
+def test_store_roundtrip(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """StoreFetcher returns what was imported, in FMPFetcher's format."""
+    fetched = _fetched(tsmc_annual_data, tsmc_parameters)
+    store = StatementStore(str(tmp_path / "s.db"))
+    assert store.import_fetched(fetched) == {"ticker": "TSM", "income_statements": 10, "balance_sheet": 1, "quote": 1}
+
+    fetcher = StoreFetcher(store)
+    assert fetcher.fetch_income_statements("tsm", limit=10) == fetched["income_statements"]
+    assert [r["year"] for r in fetcher.fetch_income_statements("TSM", limit=3)] == [2022, 2021, 2020]
+    assert fetcher.fetch_balance_sheet("TSM")[0]["shares_outstanding"] == tsmc_parameters["shares_outstanding_raw"]
+    assert fetcher.fetch_quote("TSM")["price"] == 4565
+    assert fetcher.fetch_quote("NONE")["price"] == 0
+
+
+def test_store_upserts(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """Re-importing a ticker replaces rows instead of duplicating them."""
+    store = StatementStore(str(tmp_path / "s.db"))
+    store.import_fetched(_fetched(tsmc_annual_data, tsmc_parameters))
+    changed = _fetched(tsmc_annual_data, tsmc_parameters, price=5000)
+    changed["income_statements"][0]["net_income"] = 1
+    store.import_fetched(changed)
+    assert store.tickers() == [{"ticker": "TSM", "first_year": 2013, "last_year": 2022, "years": 10}]
+    assert store.query("income", "TSM", limit=1)[0]["net_income"] == 1
+    assert store.get_quote("TSM")["price"] == 5000
+    assert [r["year"] for r in store.query("income", "TSM", start_year=2015, end_year=2016)] == [2016, 2015]
+
+
+def test_store_cli_import_query_analyze(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """ivco fetch output piped into store import, then analyze with no network."""
+    db = str(tmp_path / "s.db")
+    runner = CliRunner()
+    fetched = _fetched(tsmc_annual_data, tsmc_parameters)
+    result = runner.invoke(cli, ["store", "import", "--store", db],
+                           input=json.dumps([fetched, {"ticker": "BAD", "error": "HTTPError"}], indent=2))
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.output)
+    assert summary["imported"][0]["income_statements"] == 10
+    assert summary["skipped"] == [{"ticker": "BAD", "error": "HTTPError"}]
+
+    result = runner.invoke(cli, ["store", "query", "--store", db, "--ticker", "TSM", "--years", "2"])
+    assert [r["year"] for r in json.loads(result.output)] == [2022, 2021]
+    assert runner.invoke(cli, ["store", "query", "--store", db, "--ticker", "NONE"]).exit_code == 1
+
+    result = runner.invoke(cli, [
+        "analyze", "--ticker", "TSM", "--source", "store", "--store", db,
+        "--maintenance-ratio", "0.20", "--cc-low", "1.2", "--cc-high", "1.5",
+        "--long-term-debt", str(tsmc_parameters["long_term_debt"]),
+    ])
+    assert result.exit_code == 0, result.output
+    analysis = json.loads(result.output)["analysis"]
+    assert analysis["iv"]["iv_per_share_low"] == 4565
+    assert analysis["iv"]["iv_per_share_high"] == 5639
+
+
+def test_store_revision_bumps_on_import(tmp_path, tsmc_annual_data, tsmc_parameters):
+    """Every import bumps the ticker's revision; other tickers are untouched."""
+    store = StatementStore(str(tmp_path / "s.db"))
+    assert store.revision("TSM") == 0
+    store.import_fetched(_fetched(tsmc_annual_data, tsmc_parameters))
+    first = store.revision("tsm")
+    store.import_fetched(_fetched(tsmc_annual_data, tsmc_parameters, price=5000))
+    assert store.revision("TSM") > first > 0
+    assert store.revision("AAPL") == 0
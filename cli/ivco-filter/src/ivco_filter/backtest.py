@@ -0,0 +1,266 @@
+"""Comparative backtest: many candidate rule sets over one cached feature matrix.
+
+Which rules a tweet hits does not depend on penalties, bonuses, enabled
+flags or score_threshold — only on keywords, patterns and user lists. So
+hits are extracted once per (corpus, rule structure), packed into one small
+bitmask per tweet and cached on disk. A candidate is then scored as a
+weighted sum over the few distinct bitmasks in the corpus (at most 2^10),
+which makes a 100-candidate sweep over a million tweets a matter of seconds.
+"""
+
+import base64
+import copy
+import hashlib
+import itertools
+import json
+import os
+import sys
+from array import array
+from collections import defaultdict
+
+from .parallel import score_stream
+from .rules import default_cache_dir
+from .scorer import KEYWORD_RULES, compile_rules
+
+# Bit i of a tweet's feature code = the tweet hits FEATURES[i]
+FEATURES = ("G1", "G2", "G3", "G4", "U1", "U2", "U3", "U4", "U5", "BLACKLISTED")
+FEATURE_BITS = {name: 1 << i for i, name in enumerate(FEATURES)}
+RULE_FEATURES = {
+    "G1_ticker_spam": ("garbage_rules", "G1", "penalty", -50),
+    "G4_short_content": ("garbage_rules", "G4", "penalty", -20),
+    "U5_whitelist_bonus": ("useful_rules", "U5", "bonus", 15),
+    **{key: (section, label[:2], weight_key, default) for section, key, label, weight_key, default in KEYWORD_RULES},
+}
+# Rule fields that only change weights or verdicts, not which rules a tweet hits
+WEIGHT_FIELDS = {"penalty", "bonus", "enabled", "description"}
+FEATURE_CACHE_VERSION = 1
+
+
+def default_feature_cache_dir() -> str:
+    return os.path.join(default_cache_dir(), "filter-features")
+
+
+def feature_spec(rules: dict) -> dict:
+    """The part of a rule set that determines hits (weights, flags, threshold dropped)."""
+    spec = {}
+    for section in ("garbage_rules", "useful_rules"):
+        spec[section] = {
+            key: {k: v for k, v in rule.items() if k not in WEIGHT_FIELDS}
+            for key, rule in rules.get(section, {}).items()
+        }
+    spec["whitelist"] = sorted(u.lower() for u in rules.get("whitelist", []))
+    spec["blacklist"] = sorted(u.lower() for u in rules.get("blacklist", []))
+    return spec
+
+
+def spec_hash(rules: dict) -> str:
+    return hashlib.sha256(json.dumps(feature_spec(rules), sort_keys=True).encode()).hexdigest()
+
+
+def rule_weights(rules: dict) -> dict[str, int]:
+    """Score contribution of each feature under these rules (0 when disabled)."""
+    weights = {name: 0 for name in FEATURES if name != "BLACKLISTED"}
+    for key, (section, name, weight_key, default) in RULE_FEATURES.items():
+        rule = rules.get(section, {}).get(key, {})
+        if rule.get("enabled"):
+            weights[name] = rule.get(weight_key, default)
+    return weights
+
+
+def _all_enabled(rules: dict) -> dict:
+    enabled = copy.deepcopy(rules)
+    for key, (section, *_) in RULE_FEATURES.items():
+        enabled.setdefault(section, {}).setdefault(key, {})["enabled"] = True
+    return enabled
+
+
+def extract_features(tweets: list[dict], rules: dict, workers: int = 1) -> array:
+    """One feature code per tweet (bitmask over FEATURES), in input order."""
+    compiled = compile_rules(_all_enabled(rules))
+    codes = array("H")
+    for _, result in score_stream(tweets, compiled, workers):
+        code = 0
+        for reason in result["garbage"] + result["useful"]:
+            code |= FEATURE_BITS["BLACKLISTED" if reason.startswith("BLACKLISTED") else reason[:2]]
+        codes.append(code)
+    return codes
+
+
+def load_features(tweets: list[dict], corpus_hash: str, rules: dict, workers: int = 1,
+                  cache_dir: str | None = None) -> tuple[array, bool]:
+    """Feature codes for the corpus, from the on-disk cache when possible.
+
+    Returns (codes, cached). cache_dir "" disables the cache.
+    """
+    if cache_dir == "":
+        return extract_features(tweets, rules, workers), False
+    cache_dir = cache_dir or default_feature_cache_dir()
+    path = os.path.join(cache_dir, f"{corpus_hash[:32]}-{spec_hash(rules)[:32]}.json")
+    try:
+        with open(path, "r") as f:
+            entry = json.load(f)
+        if entry["version"] == FEATURE_CACHE_VERSION and entry["features"] == list(FEATURES):
+            codes = array("H")
+            codes.frombytes(base64.b64decode(entry["codes"]))
+            if entry["byteorder"] != sys.byteorder:
+                codes.byteswap()
+            if len(codes) == len(tweets):
+                return codes, True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    codes = extract_features(tweets, rules, workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({
+            "version": FEATURE_CACHE_VERSION,
+            "features": list(FEATURES),
+            "byteorder": sys.byteorder,
+            "codes": base64.b64encode(codes.tobytes()).decode(),
+        }, f)
+    os.replace(tmp, path)
+    return codes, False
+
+
+def verdicts_by_code(codes: set[int], rules: dict) -> dict[int, tuple[int, str]]:
+    """(score, verdict) for every distinct feature code — same as score_tweet."""
+    weights = rule_weights(rules)
+    threshold = rules.get("score_threshold", 0)
+    table = {}
+    for code in codes:
+        if code & FEATURE_BITS["BLACKLISTED"]:
+            table[code] = (-999, "discard")
+            continue
+        score = sum(w for name, w in weights.items() if code & FEATURE_BITS[name])
+        if score >= threshold + 20:
+            verdict = "keep"
+        elif score >= threshold:
+            verdict = "review"
+        else:
+            verdict = "discard"
+        table[code] = (score, verdict)
+    return table
+
+
+def parse_grid_values(spec: str) -> list[int | float]:
+    """'-60,-40,-20' or inclusive 'START:STOP:STEP' (e.g. '-10:10:5')."""
+    def number(s: str) -> int | float:
+        value = float(s)
+        return int(value) if value.is_integer() and "." not in s else value
+
+    if ":" in spec:
+        start, stop, step = (number(p) for p in spec.split(":"))
+        if step == 0 or (stop - start) / step < 0:
+            raise ValueError(f"Empty range: {spec}")
+        count = int(round((stop - start) / step)) + 1
+        return [start + i * step for i in range(count)]
+    return [number(p) for p in spec.split(",") if p.strip()]
+
+
+def expand_grid(base: dict, grid: list[str]) -> list[tuple[str, dict]]:
+    """Candidates for every combination of 'dotted.path=values' overrides.
+
+    e.g. ["score_threshold=-10:10:5", "garbage_rules.G2_promo_keywords.penalty=-60,-40"]
+    """
+    axes = []
+    for item in grid:
+        path, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"Grid axis needs PATH=VALUES: {item}")
+        keys = path.strip().split(".")
+        node = base
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                raise ValueError(f"Unknown rule path: {path}")
+            node = node[key]
+        axes.append((path.strip(), keys, parse_grid_values(values)))
+
+    candidates = []
+    for combo in itertools.product(*(values for _, _, values in axes)):
+        rules = copy.deepcopy(base)
+        for (_, keys, _), value in zip(axes, combo):
+            node = rules
+            for key in keys[:-1]:
+                node = node[key]
+            node[keys[-1]] = value
+        name = ",".join(f"{path}={value}" for (path, _, _), value in zip(axes, combo))
+        candidates.append((name, rules))
+    return candidates
+
+
+def _group_indexes(baseline: array, codes: array) -> dict[tuple[int, int], list[int]]:
+    """Tweet indexes grouped by (baseline code, candidate code)."""
+    groups = defaultdict(list)
+    if codes is baseline:
+        for i, code in enumerate(codes):
+            groups[(code, code)].append(i)
+    else:
+        for i, pair in enumerate(zip(baseline, codes)):
+            groups[pair].append(i)
+    return groups
+
+
+def compare_rulesets(
+    tweets: list[dict],
+    corpus_hash: str,
+    candidates: list[tuple[str, dict]],
+    workers: int = 1,
+    cache_dir: str | None = None,
+    max_flips: int = 20,
+) -> dict:
+    """Verdict counts per candidate and tweets whose verdict flips vs the first.
+
+    Candidates that share a rule structure share one feature extraction, and
+    the per-tweet pass happens once per structure, not once per candidate.
+    """
+    features: dict[str, array] = {}
+    cached_specs = 0
+    for _, rules in candidates:
+        key = spec_hash(rules)
+        if key not in features:
+            features[key], cached = load_features(tweets, corpus_hash, rules, workers, cache_dir)
+            cached_specs += cached
+
+    baseline_name, baseline_rules = candidates[0]
+    baseline_key = spec_hash(baseline_rules)
+    baseline_table = verdicts_by_code(set(features[baseline_key]), baseline_rules)
+
+    grouped: dict[str, dict] = {}
+    results = []
+    for name, rules in candidates:
+        key = spec_hash(rules)
+        if key not in grouped:
+            grouped[key] = _group_indexes(features[baseline_key], features[key])
+        groups = grouped[key]
+        table = verdicts_by_code({code for _, code in groups}, rules)
+
+        counts = {"keep": 0, "review": 0, "discard": 0}
+        flips = defaultdict(lambda: [0, []])
+        for (base_code, code), indexes in groups.items():
+            before, after = baseline_table[base_code][1], table[code][1]
+            counts[after] += len(indexes)
+            if before != after:
+                flip = flips[(before, after)]
+                flip[0] += len(indexes)
+                flip[1] = sorted(flip[1] + indexes[:max_flips])[:max_flips]
+        total = len(tweets)
+
+        results.append({
+            "name": name,
+            **counts,
+            "keep_rate": round((counts["keep"] + counts["review"]) / total, 4) if total else 0,
+            "flips": sum(count for count, _ in flips.values()),
+            "flip_breakdown": {
+                f"{before}->{after}": {"count": count, "ids": [tweets[i].get("id", i) for i in head]}
+                for (before, after), (count, head) in sorted(flips.items())
+            },
+        })
+
+    return {
+        "tweets": len(tweets),
+        "baseline": baseline_name,
+        "feature_sets": len(features),
+        "feature_sets_cached": cached_specs,
+        "candidates": results,
+    }
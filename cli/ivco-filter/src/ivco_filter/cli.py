@@ -6,26 +6,194 @@ Usage:
   ivco-filter --input tweets.json
   ivco-filter --input tweets.json --output filtered.json
   ivco-filter --input tweets.json --verbose
+  tail -f tweets.ndjson | ivco-filter --ndjson
+  ivco-filter --input tweets.json --dedup --dedup-threshold 0.8
+  ivco-filter --input tweets.json --dedup --dedup-scope 2 --output filtered.json
+  ivco-filter dedup-record --input stored.json --dedup-scope 2
   ivco-filter blacklist add @spammer
   ivco-filter blacklist remove @spammer
   ivco-filter blacklist list
   ivco-filter whitelist add @analyst
   ivco-filter whitelist list
   ivco-filter backtest --input historical.json --rules new-rules.json
+  ivco-filter backtest --input archive.json --workers 16
+  ivco-filter backtest --input archive.json --rules current.json candidate.json
+  ivco-filter evaluate --input labeled.json --output eval.json
+  ivco-filter backtest --input archive.json --grid score_threshold=-10:10:5 --grid useful_rules.U2_earnings.bonus=15,25,35
 """
 
 import argparse
+import hashlib
 import json
+import os
+import sqlite3
 import sys
+from collections.abc import Iterator
 
 from .rules import load_rules
-from .scorer import score_tweet
+from .scorer import CompiledRules, compile_rules
+from .parallel import STREAM_CHUNK_SIZE, score_stream
+from .backtest import compare_rulesets, expand_grid
+from .dedup import DedupIndex
+from .evaluate import evaluate, split_labeled
 from .lists import add_to_list, remove_from_list, show_list
 
 
+def _log_verdict(tweet: dict, result: dict) -> None:
+    """Per-tweet scoring details to stderr (--verbose)."""
+    username = tweet.get("author", {}).get("username", "?")
+    text_preview = tweet.get("text", "")[:60].replace("\n", " ")
+    print(
+        f"  [{result['verdict'].upper():>7}] score={result['score']:+d} @{username}: {text_preview}",
+        file=sys.stderr,
+    )
+    for g in result["garbage"]:
+        print(f"           - {g}", file=sys.stderr)
+    for u in result["useful"]:
+        print(f"           + {u}", file=sys.stderr)
+
+
+def _filter_one(tweet: dict, result: dict, stats: dict, args, dedup: DedupIndex | None = None) -> dict | None:
+    """Apply one tweet's score; return it annotated, or None if discarded or a near-duplicate.
+
+    Only tweets that pass scoring are checked against (and held in) the dedup
+    index, so a discarded tweet never suppresses its near-duplicates.
+    """
+    if result["verdict"] != "discard" and dedup is not None and _is_duplicate(tweet, dedup, stats, args):
+        return None
+    stats[result["verdict"]] += 1
+    if args.verbose:
+        _log_verdict(tweet, result)
+
+    # Keep tweet if not discarded (keep + review pass through)
+    if result["verdict"] == "discard":
+        return None
+    # Annotate tweet with score metadata
+    tweet["_filter"] = {
+        "score": result["score"],
+        "verdict": result["verdict"],
+        "reasons": result["garbage"] + result["useful"],
+    }
+    return tweet
+
+
+def _print_summary(stats: dict) -> None:
+    duplicates = f", {stats['duplicate']} duplicate" if "duplicate" in stats else ""
+    print(
+        f"Summary: {stats['total']} total → {stats['keep']} keep, "
+        f"{stats['review']} review, {stats['discard']} discard{duplicates}",
+        file=sys.stderr,
+    )
+
+
+def _dedup_index(args) -> DedupIndex:
+    try:
+        return DedupIndex(args.dedup_db, threshold=args.dedup_threshold,
+                          max_entries=args.dedup_max_entries, ttl_days=args.dedup_ttl_days)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _dedup_scope(args, tweet: dict) -> str:
+    """--dedup-scope, else the tweet's ivco-xsearch "query" tag."""
+    return str(args.dedup_scope if args.dedup_scope is not None else tweet.get("query", ""))
+
+
+def _open_dedup(args, stats: dict) -> DedupIndex | None:
+    """Near-duplicate index for --dedup (None without it)."""
+    if not args.dedup:
+        return None
+    index = _dedup_index(args)
+    stats["duplicate"] = 0
+    return index
+
+
+def _is_duplicate(tweet: dict, index: DedupIndex, stats: dict, args) -> bool:
+    """Near-duplicate of a stored tweet or of one kept earlier in this run?"""
+    match = index.check(tweet, _dedup_scope(args, tweet))
+    if match is None:
+        return False
+    stats["duplicate"] += 1
+    if args.verbose:
+        print(f"  [    DUP] {tweet.get('id', '?')} ~ {match['duplicate_of']} "
+              f"(similarity {match['similarity']:.2f})", file=sys.stderr)
+    return True
+
+
+def _read_ndjson(source, stats: dict) -> Iterator[dict]:
+    """Tweets from NDJSON lines; blank lines ignored, bad lines reported and skipped."""
+    for lineno, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            tweet = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"  SKIP: invalid JSON on line {lineno}", file=sys.stderr)
+            continue
+        if not isinstance(tweet, dict):
+            print(f"  SKIP: line {lineno} is not a JSON object", file=sys.stderr)
+            continue
+        stats["total"] += 1
+        yield tweet
+
+
+def stream_tweets(args, rules: CompiledRules) -> None:
+    """NDJSON mode: read, score and emit one tweet per line as it arrives.
+
+    Memory stays constant and every kept tweet is flushed immediately, so the
+    filter can sit in a long-running ivco-xsearch | ivco-filter | ivco-collect
+    pipe. With --workers, tweets are scored in small chunks that are written
+    as soon as they are scored, so output trails input by a few chunks.
+    """
+    if args.input:
+        try:
+            source = open(args.input, "r")
+        except FileNotFoundError:
+            print(f"ERROR: File not found: {args.input}", file=sys.stderr)
+            sys.exit(1)
+    elif not sys.stdin.isatty():
+        source = sys.stdin
+    else:
+        print("ERROR: Provide --input FILE or pipe via stdin", file=sys.stderr)
+        sys.exit(1)
+    sink = open(args.output, "w") if args.output else sys.stdout
+
+    stats = {"keep": 0, "review": 0, "discard": 0, "total": 0}
+    dedup = _open_dedup(args, stats)
+    written = 0
+    try:
+        for tweet, result in score_stream(_read_ndjson(source, stats), rules, args.workers, STREAM_CHUNK_SIZE):
+            kept = _filter_one(tweet, result, stats, args, dedup)
+            if kept is not None:
+                sink.write(json.dumps(kept, ensure_ascii=False) + "\n")
+                sink.flush()
+                written += 1
+    except BrokenPipeError:
+        # Downstream closed the pipe; stop and keep the interpreter from
+        # complaining when it flushes stdout on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        if dedup is not None:
+            dedup.close()
+
+    if args.output:
+        print(f"Written {written} tweets to {args.output}", file=sys.stderr)
+    _print_summary(stats)
+
+
 def filter_tweets(args) -> None:
     """Main filter pipeline: read → score → filter → output."""
-    rules = load_rules(args.config)
+    rules = compile_rules(load_rules(args.config))
+    if args.ndjson:
+        stream_tweets(args, rules)
+        return
 
     # Read input
     if args.input:
@@ -52,32 +220,16 @@ def filter_tweets(args) -> None:
 
     results = []
     stats = {"keep": 0, "review": 0, "discard": 0, "total": len(tweets)}
+    dedup = _open_dedup(args, stats)
 
-    for tweet in tweets:
-        result = score_tweet(tweet, rules)
-        stats[result["verdict"]] += 1
-
-        if args.verbose:
-            username = tweet.get("author", {}).get("username", "?")
-            text_preview = tweet.get("text", "")[:60].replace("\n", " ")
-            print(
-                f"  [{result['verdict'].upper():>7}] score={result['score']:+d} @{username}: {text_preview}",
-                file=sys.stderr,
-            )
-            for g in result["garbage"]:
-                print(f"           - {g}", file=sys.stderr)
-            for u in result["useful"]:
-                print(f"           + {u}", file=sys.stderr)
-
-        # Keep tweet if not discarded (keep + review pass through)
-        if result["verdict"] != "discard":
-            # Annotate tweet with score metadata
-            tweet["_filter"] = {
-                "score": result["score"],
-                "verdict": result["verdict"],
-                "reasons": result["garbage"] + result["useful"],
-            }
-            results.append(tweet)
+    try:
+        for tweet, result in score_stream(tweets, rules, args.workers):
+            kept = _filter_one(tweet, result, stats, args, dedup)
+            if kept is not None:
+                results.append(kept)
+    finally:
+        if dedup is not None:
+            dedup.close()
 
     # Output filtered tweets
     output = json.dumps(results, ensure_ascii=False, indent=2)
@@ -90,11 +242,7 @@ def filter_tweets(args) -> None:
         print(output)
 
     # Summary to stderr
-    print(
-        f"Summary: {stats['total']} total → {stats['keep']} keep, "
-        f"{stats['review']} review, {stats['discard']} discard",
-        file=sys.stderr,
-    )
+    _print_summary(stats)
 
 
 def handle_list(args) -> None:
@@ -115,17 +263,35 @@ def handle_list(args) -> None:
         show_list(list_name, args.config)
 
 
+def handle_dedup_record(args) -> None:
+    """Record stored tweets in the near-duplicate index (after ivco-collect)."""
+    try:
+        with open(args.input, "r") as f:
+            tweets = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(tweets, list):
+        tweets = []
+
+    index = _dedup_index(args)
+    try:
+        recorded = sum(index.add(tweet, _dedup_scope(args, tweet)) for tweet in tweets if isinstance(tweet, dict))
+    finally:
+        index.close()
+    print(f"Recorded {recorded} of {len(tweets)} tweets in {index.path}", file=sys.stderr)
+
+
 def handle_backtest(args) -> None:
     """Run backtest on historical data with specified rules."""
-    rules = load_rules(args.rules or args.config)
-
     if not args.input:
         print("ERROR: --input required for backtest", file=sys.stderr)
         sys.exit(1)
 
     try:
-        with open(args.input, "r") as f:
-            tweets = json.load(f)
+        with open(args.input, "rb") as f:
+            raw = f.read()
+        tweets = json.loads(raw)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
@@ -133,11 +299,16 @@ def handle_backtest(args) -> None:
     if not isinstance(tweets, list):
         tweets = []
 
+    rule_paths = args.rules or [args.config]
+    if len(rule_paths) > 1 or args.grid:
+        compare_backtest(args, tweets, hashlib.sha256(raw).hexdigest(), rule_paths)
+        return
+
+    rules = compile_rules(load_rules(rule_paths[0]))
     stats = {"keep": 0, "review": 0, "discard": 0}
     print(f"Backtesting {len(tweets)} tweets...\n")
 
-    for tweet in tweets:
-        result = score_tweet(tweet, rules)
+    for tweet, result in score_stream(tweets, rules, args.workers):
         stats[result["verdict"]] += 1
         username = tweet.get("author", {}).get("username", "?")
         text_preview = tweet.get("text", "")[:60].replace("\n", " ")
@@ -155,12 +326,106 @@ def handle_backtest(args) -> None:
         print(f"Keep rate: {(stats['keep'] + stats['review']) / total * 100:.0f}%")
 
 
+def compare_backtest(args, tweets: list, corpus_hash: str, rule_paths: list) -> None:
+    """Score the corpus under several rule sets; report counts and verdict flips.
+
+    Candidates are each --rules file and, with --grid, every grid combination
+    applied to each file. The first --rules file (or the config) is the
+    baseline that flips are measured against.
+    """
+    candidates = []
+    try:
+        for path in rule_paths:
+            base = load_rules(path)
+            name = path or "default config"
+            candidates.append((name, base))
+            if args.grid:
+                candidates += [(f"{name} [{combo}]", rules) for combo, rules in expand_grid(base, args.grid)]
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    report = compare_rulesets(
+        tweets, corpus_hash, candidates,
+        workers=args.workers,
+        cache_dir="" if args.no_feature_cache else None,
+        max_flips=args.max_flips,
+    )
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"Backtesting {report['tweets']} tweets against {len(candidates)} rule sets "
+          f"(baseline: {report['baseline']})")
+    print(f"Features: {report['feature_sets']} rule structure(s), {report['feature_sets_cached']} from cache\n")
+    print(f"{'keep':>8} {'review':>8} {'discard':>8} {'kept%':>6} {'flips':>8}  rule set")
+    for c in report["candidates"]:
+        print(f"{c['keep']:>8} {c['review']:>8} {c['discard']:>8} {c['keep_rate'] * 100:>5.0f}% "
+              f"{c['flips']:>8}  {c['name']}")
+        for transition, flip in c["flip_breakdown"].items():
+            ids = ", ".join(str(i) for i in flip["ids"])
+            print(f"{'':>43}{transition}: {flip['count']} ({ids})")
+
+
+def handle_evaluate(args) -> None:
+    """Score a labeled corpus and write a quality/speed report as JSON."""
+    rules = load_rules(args.rules or args.config)
+    try:
+        with open(args.input, "r") as f:
+            raw = f.read().strip()
+        items = json.loads(raw) if raw.startswith("[") else [
+            json.loads(line) for line in raw.splitlines() if line.strip()]
+        tweets, expected = split_labeled(items)
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    report = {"rules_path": args.rules or args.config, "corpus": args.input,
+              **evaluate(tweets, expected, rules)}
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+            f.write("\n")
+        print(f"Written report to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    confusion, timing = report["confusion"], report["timing"]
+    print(
+        f"Accuracy: {confusion['accuracy']}, pass-through precision {confusion['pass_through']['precision']} "
+        f"recall {confusion['pass_through']['recall']}; {timing['tweets_per_sec']} tweets/s, "
+        f"p50 {timing['latency_us']['p50']}us p99 {timing['latency_us']['p99']}us",
+        file=sys.stderr,
+    )
+
+
+def _add_dedup_options(parser, suppress: bool = False) -> None:
+    """Index options shared by --dedup and dedup-record. On a subcommand they are
+    suppressed when absent, so they only override top-level values when given."""
+    def value(v):
+        return argparse.SUPPRESS if suppress else v
+
+    parser.add_argument("--dedup-db", default=value(None),
+                        help="Near-duplicate index (default $IVCO_CACHE_DIR/filter-dedup.db)")
+    parser.add_argument("--dedup-scope", default=value(None),
+                        help="Compare tweets only within this scope, e.g. the CMS company id "
+                             "(default: each tweet's \"query\" tag)")
+    parser.add_argument("--dedup-threshold", type=float, default=value(0.8),
+                        help="Estimated Jaccard similarity at which tweets count as duplicates")
+    parser.add_argument("--dedup-max-entries", type=int, default=value(100_000),
+                        help="Index size bound; oldest entries are pruned first")
+    parser.add_argument("--dedup-ttl-days", type=float, default=value(30), help="Forget tweets older than this")
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="ivco-filter",
         description="Score and filter tweets for IVCO relevance.",
     )
     parser.add_argument("--config", help="Path to filter-rules.json config")
+    workers_help = "Score in N processes (results identical to 1; for large backfills)"
+    parser.add_argument("--workers", type=int, default=1, help=workers_help)
 
     subparsers = parser.add_subparsers(dest="command")
 
@@ -168,6 +433,12 @@ def main():
     parser.add_argument("--input", help="Path to JSON input file")
     parser.add_argument("--output", help="Path to write filtered JSON output")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show per-tweet scoring details")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream NDJSON (one tweet per line) in and out, constant memory")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Drop passing tweets that near-duplicate tweets stored earlier "
+                             "(see dedup-record) or kept earlier in this run (MinHash/LSH)")
+    _add_dedup_options(parser)
 
     # blacklist subcommand
     bl_parser = subparsers.add_parser("blacklist", help="Manage blacklist")
@@ -184,7 +455,31 @@ def main():
     # backtest subcommand
     bt_parser = subparsers.add_parser("backtest", help="Backtest rules on historical data")
     bt_parser.add_argument("--input", required=True, help="Path to historical JSON data")
-    bt_parser.add_argument("--rules", help="Path to alternative rules JSON (default: main config)")
+    bt_parser.add_argument("--rules", nargs="+",
+                           help="Path(s) to alternative rules JSON (default: main config); "
+                                "several = comparative backtest against the first")
+    bt_parser.add_argument("--grid", action="append", metavar="PATH=VALUES",
+                           help="Sweep a rule value, e.g. score_threshold=-10:10:5 or "
+                                "garbage_rules.G2_promo_keywords.penalty=-60,-40 (repeatable)")
+    bt_parser.add_argument("--json", action="store_true", help="Comparative report as JSON")
+    bt_parser.add_argument("--max-flips", type=int, default=20, help="Flipped tweet ids listed per transition")
+    bt_parser.add_argument("--no-feature-cache", action="store_true",
+                           help="Re-extract rule-hit features instead of using the on-disk cache")
+    # SUPPRESS: only override the top-level --workers when given after the subcommand
+    bt_parser.add_argument("--workers", type=int, default=argparse.SUPPRESS, help=workers_help)
+
+    # evaluate subcommand
+    ev_parser = subparsers.add_parser("evaluate", help="Precision/recall and timing on a labeled corpus")
+    ev_parser.add_argument("--input", required=True,
+                           help="Labeled tweets (JSON array or NDJSON, expected verdict in \"label\")")
+    ev_parser.add_argument("--rules", help="Path to alternative rules JSON (default: main config)")
+    ev_parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+
+    # dedup-record subcommand
+    dr_parser = subparsers.add_parser("dedup-record",
+                                      help="Record stored tweets in the --dedup index (run after ivco-collect)")
+    dr_parser.add_argument("--input", required=True, help="Stored tweets (JSON array, e.g. ivco-collect --stored-output)")
+    _add_dedup_options(dr_parser, suppress=True)
 
     args = parser.parse_args()
 
@@ -192,6 +487,10 @@ def main():
         handle_list(args)
     elif args.command == "backtest":
         handle_backtest(args)
+    elif args.command == "evaluate":
+        handle_evaluate(args)
+    elif args.command == "dedup-record":
+        handle_dedup_record(args)
     else:
         filter_tweets(args)
 
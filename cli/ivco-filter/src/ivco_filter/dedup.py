@@ -0,0 +1,246 @@
+"""Near-duplicate tweet suppression: MinHash signatures + LSH, persisted in SQLite.
+
+Text is normalized (lowercase, URLs, @mentions and an "RT @user:" prefix
+removed, punctuation and whitespace collapsed) and cut into character
+shingles. A MinHash signature estimates Jaccard similarity between shingle
+sets; LSH splits the signature into bands so only tweets sharing a band
+bucket are compared. Candidates are confirmed against the similarity
+threshold before a tweet is reported as a duplicate.
+
+Tweets are compared only within a scope (the CMS company, or the search
+query tag), so the same tweet found for two companies is kept for both.
+Filtering only checks the index; a tweet is recorded once it has actually
+been stored (`ivco-filter dedup-record`), so a failed store never makes a
+later copy look like a duplicate. Within one run, the last max_held tweets
+that passed are held in memory so repeats in the same batch are still
+caught; the CLI checks only tweets that scoring kept, so a discarded tweet
+never suppresses its near-duplicates.
+
+The index lives on disk (SQLite), so it survives between the daily
+collection runs and memory stays flat; entries older than ttl_days or
+beyond max_entries (oldest first) are pruned.
+"""
+
+import hashlib
+import itertools
+import os
+import random
+import re
+import sqlite3
+import struct
+import time
+import zlib
+
+from .rules import default_cache_dir
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_URL = re.compile(r"https?://\S+")
+_RETWEET = re.compile(r"^rt @\w+:?\s*")
+_MENTION = re.compile(r"@\w+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def default_dedup_path() -> str:
+    return os.path.join(default_cache_dir(), "filter-dedup.db")
+
+
+def normalize(text: str) -> str:
+    text = _RETWEET.sub("", text.lower())
+    text = _MENTION.sub(" ", _URL.sub(" ", text))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm whose S-curve midpoint
+    (1/bands)^(1/rows) is closest to the threshold, erring low (more candidates)."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        penalty = abs(midpoint - threshold) + (0.05 if midpoint > threshold else 0)
+        if best is None or penalty < best[0]:
+            best = (penalty, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """MinHash over character shingles with fixed (seeded) hash permutations."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                      for _ in range(num_perm)]
+
+    def shingles(self, text: str) -> set[int]:
+        text = normalize(text)
+        k = self.shingle_size
+        if len(text) <= k:
+            return {zlib.crc32(text.encode())} if text else set()
+        return {zlib.crc32(text[i:i + k].encode()) for i in range(len(text) - k + 1)}
+
+    def signature(self, shingles: set[int]) -> tuple[int, ...]:
+        p = _MERSENNE_PRIME
+        return tuple(min(((a * x + b) % p) & _MAX_HASH for x in shingles) for a, b in self.perms)
+
+
+def similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: share of agreeing signature slots."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class DedupIndex:
+    """Persistent MinHash/LSH index of tweets already seen."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS signatures (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tweet_id TEXT,
+        signature BLOB NOT NULL,
+        seen_at REAL NOT NULL,
+        scope TEXT NOT NULL DEFAULT ''
+    );
+    CREATE TABLE IF NOT EXISTS buckets (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        sig_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, sig_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS buckets_sig ON buckets (sig_id);
+    """
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str | None = None, threshold: float = 0.8, num_perm: int = 64,
+                 max_entries: int = 100_000, ttl_days: float = 30, max_held: int = 10_000):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.path = path or default_dedup_path()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self._added = 0
+        # Tweets that passed check() in this run, oldest first: seq -> (tweet_id, signature, bucket keys),
+        # and (scope, band, bucket) -> seqs; beyond max_held the oldest are forgotten
+        self.max_held = max_held
+        self._held: dict[int, tuple[str, tuple[int, ...], list[tuple[str, int, int]]]] = {}
+        self._held_buckets: dict[tuple[str, int, int], set[int]] = {}
+        self._held_seq = itertools.count()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(signatures)")}
+            if "scope" not in columns:
+                # Indexes from before scoping: every entry is in the default scope
+                self.conn.execute("ALTER TABLE signatures ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+            stored = dict(self.conn.execute("SELECT key, value FROM meta"))
+            params = {"num_perm": str(num_perm), "shingle_size": str(self.hasher.shingle_size), "seed": "1"}
+            if stored and {k: stored.get(k) for k in params} != params:
+                raise ValueError(f"{self.path} was built with different MinHash parameters {stored}; "
+                                 "use another --dedup-db")
+            self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", params.items())
+
+    def _band_keys(self, sig: tuple[int, ...], scope: str = "") -> list[tuple[int, int]]:
+        # The scope is part of the bucket hash, so other scopes never become candidates;
+        # the default scope hashes exactly as unscoped indexes did
+        prefix = scope.encode() + b"\0" if scope else b""
+        keys = []
+        for band in range(self.bands):
+            chunk = struct.pack(f"<{self.rows}I", *sig[band * self.rows:(band + 1) * self.rows])
+            digest = hashlib.blake2b(prefix + chunk, digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, "little", signed=True)))
+        return keys
+
+    def _signature(self, tweet: dict) -> tuple[int, ...] | None:
+        shingles = self.hasher.shingles(tweet.get("text", ""))
+        return self.hasher.signature(shingles) if shingles else None
+
+    def check(self, tweet: dict, scope: str = "") -> dict | None:
+        """Return {"duplicate_of", "similarity"} if a near-duplicate was stored or passed earlier in this run.
+
+        Nothing is written to disk; record stored tweets with add(). Tweets
+        with no text after normalization are never treated as duplicates.
+        """
+        sig = self._signature(tweet)
+        if sig is None:
+            return None
+        keys = self._band_keys(sig, scope)
+
+        candidates, held = set(), {}
+        for band, bucket in keys:
+            candidates.update(row[0] for row in self.conn.execute(
+                "SELECT sig_id FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+            for seq in self._held_buckets.get((scope, band, bucket), ()):
+                tweet_id, other, _ = self._held[seq]
+                held[tweet_id] = other
+        others = list(held.items())
+        for sig_id in candidates:
+            row = self.conn.execute("SELECT tweet_id, signature FROM signatures WHERE id = ? AND scope = ?",
+                                    (sig_id, scope)).fetchone()
+            if row is not None:
+                others.append((row[0], struct.unpack(f"<{self.hasher.num_perm}I", row[1])))
+        best = None
+        for tweet_id, other in others:
+            score = similarity(sig, other)
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {"duplicate_of": tweet_id, "similarity": round(score, 4)}
+        if best is not None:
+            return best
+
+        self._hold(str(tweet.get("id", "")), sig, [(scope, band, bucket) for band, bucket in keys])
+        return None
+
+    def _hold(self, tweet_id: str, sig: tuple[int, ...], buckets: list[tuple[str, int, int]]) -> None:
+        seq = next(self._held_seq)
+        self._held[seq] = (tweet_id, sig, buckets)
+        for key in buckets:
+            self._held_buckets.setdefault(key, set()).add(seq)
+        while len(self._held) > self.max_held:
+            oldest = next(iter(self._held))
+            for key in self._held.pop(oldest)[2]:
+                seqs = self._held_buckets[key]
+                seqs.discard(oldest)
+                if not seqs:
+                    del self._held_buckets[key]
+
+    def add(self, tweet: dict, scope: str = "") -> bool:
+        """Record a stored tweet in the index. Returns False if it has no text to index."""
+        sig = self._signature(tweet)
+        if sig is None:
+            return False
+        with self.conn:
+            sig_id = self.conn.execute(
+                "INSERT INTO signatures (tweet_id, signature, seen_at, scope) VALUES (?, ?, ?, ?)",
+                (str(tweet.get("id", "")), struct.pack(f"<{self.hasher.num_perm}I", *sig), time.time(), scope),
+            ).lastrowid
+            self.conn.executemany("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+                                  [(band, bucket, sig_id) for band, bucket in self._band_keys(sig, scope)])
+        self._added += 1
+        if self._added % self.PRUNE_EVERY == 0:
+            self.prune()
+        return True
+
+    def prune(self) -> int:
+        """Drop entries past ttl_days and beyond max_entries (oldest first)."""
+        with self.conn:
+            cutoff_id = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM signatures WHERE seen_at < ?",
+                (time.time() - self.ttl_days * 86400,),
+            ).fetchone()[0]
+            newest = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM signatures").fetchone()[0]
+            cutoff_id = max(cutoff_id, newest - self.max_entries)
+            removed = self.conn.execute("DELETE FROM signatures WHERE id <= ?", (cutoff_id,)).rowcount
+            self.conn.execute("DELETE FROM buckets WHERE sig_id <= ?", (cutoff_id,))
+        return removed
+
+    def close(self) -> None:
+        self.prune()
+        self.conn.close()
@@ -0,0 +1,152 @@
+"""Evaluate filter rules against a labeled corpus: quality and speed.
+
+Labeled corpus: a JSON array or NDJSON of tweets carrying the expected
+verdict in "label" (keep | review | discard), or {"tweet": {...}, "label": ...}.
+"Relevant" means keep or review — the verdicts the filter passes through.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from .backtest import FEATURE_BITS, FEATURES, RULE_FEATURES, extract_features, spec_hash, verdicts_by_code
+from .scorer import compile_rules, score_tweet
+
+VERDICTS = ("keep", "review", "discard")
+GARBAGE_FEATURES = {"G1", "G2", "G3", "G4", "BLACKLISTED"}
+
+
+def split_labeled(items: list) -> tuple[list[dict], list[str]]:
+    """(tweets, expected verdicts) from labeled records. Raises ValueError."""
+    tweets, labels = [], []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Record {i} is not a JSON object")
+        tweet = item["tweet"] if isinstance(item.get("tweet"), dict) else item
+        label = item.get("label")
+        if label not in VERDICTS:
+            raise ValueError(f"Record {i} ({tweet.get('id', '?')}): label must be one of {', '.join(VERDICTS)}")
+        tweets.append(tweet)
+        labels.append(label)
+    return tweets, labels
+
+
+def _ratio(num: int, den: int) -> float | None:
+    return round(num / den, 4) if den else None
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+
+def confusion_report(expected: list[str], predicted: list[str]) -> dict:
+    """Confusion matrix (expected -> predicted), per-verdict and pass-through metrics."""
+    matrix = {e: {p: 0 for p in VERDICTS} for e in VERDICTS}
+    for e, p in zip(expected, predicted):
+        matrix[e][p] += 1
+
+    per_verdict = {}
+    for v in VERDICTS:
+        tp = matrix[v][v]
+        predicted_v = sum(matrix[e][v] for e in VERDICTS)
+        expected_v = sum(matrix[v].values())
+        precision, recall = _ratio(tp, predicted_v), _ratio(tp, expected_v)
+        f1 = None
+        if precision is not None and recall is not None:
+            f1 = round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0
+        per_verdict[v] = {"precision": precision, "recall": recall, "f1": f1, "support": expected_v}
+
+    relevant = [e != "discard" for e in expected]
+    passed = [p != "discard" for p in predicted]
+    tp = sum(r and p for r, p in zip(relevant, passed))
+    return {
+        "matrix": matrix,
+        "accuracy": _ratio(sum(matrix[v][v] for v in VERDICTS), len(expected)),
+        "per_verdict": per_verdict,
+        "pass_through": {
+            "precision": _ratio(tp, sum(passed)),
+            "recall": _ratio(tp, sum(relevant)),
+        },
+    }
+
+
+def rule_report(codes, expected: list[str], predicted: list[str], rules: dict) -> dict:
+    """Per-rule hits, precision/recall and contribution (effect of disabling it).
+
+    A garbage rule hit is correct when the tweet is labeled discard; a useful
+    rule hit is correct when it is labeled keep or review. Contribution
+    counts tweets whose verdict changes with the rule disabled: "fixes" are
+    tweets the rule gets right that would otherwise be wrong, "breaks" the
+    reverse.
+    """
+    distinct = set(codes)
+    report = {}
+    for name in FEATURES:
+        bit = FEATURE_BITS[name]
+        garbage = name in GARBAGE_FEATURES
+        target = [(e == "discard") if garbage else (e != "discard") for e in expected]
+        hits = [bool(c & bit) for c in codes]
+        true_hits = sum(h and t for h, t in zip(hits, target))
+
+        entry = {
+            "target": "discard" if garbage else "relevant",
+            "hits": sum(hits),
+            "precision": _ratio(true_hits, sum(hits)),
+            "recall": _ratio(true_hits, sum(target)),
+        }
+        key = next((k for k, (_, feature, _, _) in RULE_FEATURES.items() if feature == name), None)
+        if key is not None:
+            section = RULE_FEATURES[key][0]
+            enabled = bool(rules.get(section, {}).get(key, {}).get("enabled"))
+            entry["enabled"] = enabled
+            if enabled:
+                ablated = {**rules, section: {**rules[section], key: {**rules[section][key], "enabled": False}}}
+                without = verdicts_by_code(distinct, ablated)
+                fixes = breaks = changed = 0
+                for code, e, p in zip(codes, expected, predicted):
+                    alt = without[code][1]
+                    if alt != p:
+                        changed += 1
+                        fixes += p == e and alt != e
+                        breaks += p != e and alt == e
+                entry["contribution"] = {"changed": changed, "fixes": fixes, "breaks": breaks, "net": fixes - breaks}
+        report[name] = entry
+    return report
+
+
+def evaluate(tweets: list[dict], expected: list[str], rules: dict) -> dict:
+    """Quality (confusion matrix, per-rule metrics) and timing for one rule set."""
+    t0 = time.perf_counter()
+    compiled = compile_rules(rules)
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    predicted, latencies = [], []
+    start = time.perf_counter()
+    for tweet in tweets:
+        t = time.perf_counter()
+        predicted.append(score_tweet(tweet, compiled)["verdict"])
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    codes = extract_features(tweets, rules)
+    return {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "rules_version": rules.get("version"),
+        "rules_spec_hash": spec_hash(rules)[:16],
+        "score_threshold": rules.get("score_threshold", 0),
+        "tweets": len(tweets),
+        "confusion": confusion_report(expected, predicted),
+        "rules": rule_report(codes, expected, predicted, rules),
+        "timing": {
+            "compile_ms": round(compile_ms, 3),
+            "total_s": round(elapsed, 6),
+            "tweets_per_sec": round(len(tweets) / elapsed, 1) if elapsed else None,
+            "latency_us": {
+                "p50": round(_percentile(latencies, 50) * 1e6, 2),
+                "p99": round(_percentile(latencies, 99) * 1e6, 2),
+                "max": round(latencies[-1] * 1e6, 2) if latencies else 0.0,
+            },
+        },
+    }
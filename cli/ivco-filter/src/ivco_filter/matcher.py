@@ -0,0 +1,57 @@
+"""Aho-Corasick automaton for matching many keywords in one pass."""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """Finds every pattern occurring in a text (overlaps included) in one scan.
+
+    The automaton is built as a full DFA over the pattern alphabet: each state
+    maps a character straight to the next state (failure links resolved at
+    build time), so the scan is a single dict lookup per character no matter
+    how many patterns there are.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[set[int]] = [set()]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(pid)
+
+        # Breadth-first: resolve failure links into direct transitions and
+        # merge outputs along the failure chain.
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs = [frozenset(o) if o else None for o in outputs]
+
+    def find_all(self, text: str) -> set[int]:
+        """Ids (indexes into patterns) of every pattern that occurs in text."""
+        delta, outputs = self._delta, self._outputs
+        hits = set(outputs[0] or ())  # empty patterns match everything
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            out = outputs[state]
+            if out is not None:
+                hits |= out
+        return hits
@@ -0,0 +1,61 @@
+"""Multi-process tweet scoring that preserves input order."""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .scorer import CompiledRules, compile_rules, score_tweet
+
+DEFAULT_CHUNK_SIZE = 500
+# Streamed (NDJSON) input: small chunks so kept tweets are not held back behind a large batch
+STREAM_CHUNK_SIZE = 16
+
+_worker_rules: CompiledRules | None = None
+
+
+def _init_worker(rules: dict) -> None:
+    """Compile the rules once per worker process."""
+    global _worker_rules
+    _worker_rules = compile_rules(rules)
+
+
+def _score_chunk(tweets: list[dict]) -> list[dict]:
+    return [score_tweet(tweet, _worker_rules) for tweet in tweets]
+
+
+def _chunks(tweets: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(tweets)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def score_stream(
+    tweets: Iterable[dict],
+    rules: CompiledRules,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[dict, dict]]:
+    """Yield (tweet, score_tweet result) pairs in input order.
+
+    With workers > 1, chunks of tweets are scored in a process pool. At most
+    2 * workers chunks are in flight, so memory stays bounded for streamed
+    input; each chunk is yielded as soon as it and the chunks before it are
+    scored. Results are identical to the single-process run.
+    """
+    if workers <= 1:
+        for tweet in tweets:
+            yield tweet, score_tweet(tweet, rules)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules.rules,)) as pool:
+        pending = deque()
+        for chunk in _chunks(tweets, chunk_size):
+            pending.append((chunk, pool.submit(_score_chunk, chunk)))
+            # Block only when the pool is full; otherwise hand back whatever is already done
+            while pending and (len(pending) >= 2 * workers or pending[0][1].done()):
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
@@ -11,6 +11,19 @@ DEFAULT_CONFIG = os.path.join(
 )
 
 
+def default_cache_dir() -> str:
+    """$IVCO_CACHE_DIR, else $XDG_CACHE_HOME/ivco, else ~/.cache/ivco.
+
+    ivco-filter's one definition; mirrors ivco_calc.fetchers.cache.default_cache_dir
+    (the packages don't depend on each other), keep the two in step.
+    """
+    base = os.environ.get("IVCO_CACHE_DIR")
+    if base:
+        return base
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(xdg, "ivco")
+
+
 def load_rules(config_path: str | None = None) -> dict:
     """Load filter rules from JSON file. Falls back to default config."""
     path = config_path or DEFAULT_CONFIG
@@ -1,18 +1,120 @@
 """Scoring engine — applies G1-G5 garbage rules and U1-U5 useful rules."""
 
+import copy
 import re
 
+from .matcher import AhoCorasick
 
-def score_tweet(tweet: dict, rules: dict) -> dict:
+# Keyword rules: (section, rule key, reason label, weight config key, default weight)
+KEYWORD_RULES = (
+    ("garbage_rules", "G2_promo_keywords", "G2: promo", "penalty", -40),
+    ("garbage_rules", "G3_payment_mention", "G3: payment", "penalty", -30),
+    ("useful_rules", "U1_analyst_actions", "U1: analyst", "bonus", 30),
+    ("useful_rules", "U2_earnings", "U2: earnings", "bonus", 25),
+    ("useful_rules", "U3_fundamental_analysis", "U3: fundamental", "bonus", 20),
+    ("useful_rules", "U4_major_events", "U4: event", "bonus", 35),
+)
+
+
+class CompiledRules:
+    """filter-rules.json compiled for fast repeated scoring.
+
+    Every keyword of every enabled rule (G2, G3, G4 analysis keywords, U1-U4)
+    goes into one Aho-Corasick automaton, so a tweet is scanned once however
+    long the lists grow; the G1 pattern is precompiled and the user lists are
+    lowercased frozensets. Build with compile_rules().
+    """
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+        g_rules = rules.get("garbage_rules", {})
+        u_rules = rules.get("useful_rules", {})
+
+        g1 = g_rules.get("G1_ticker_spam", {})
+        self.g1 = None
+        if g1.get("enabled"):
+            self.g1 = (
+                re.compile(g1.get("pattern", r"\$[A-Z]{1,5}")),
+                g1.get("min_tickers", 5),
+                g1.get("penalty", -50),
+            )
+
+        # groups[i] = (reason label, weight, original keywords, is_garbage); label None = G4
+        self.groups = []
+        for section, key, label, weight_key, default in KEYWORD_RULES:
+            rule = rules.get(section, {}).get(key, {})
+            if rule.get("enabled"):
+                self.groups.append((label, rule.get(weight_key, default), rule.get("keywords", []),
+                                    section == "garbage_rules"))
+
+        g4 = g_rules.get("G4_short_content", {})
+        self.g4 = None
+        if g4.get("enabled"):
+            self.g4 = (g4.get("min_chars", 80), g4.get("penalty", -20), len(self.groups))
+            self.groups.append((None, 0, g4.get("analysis_keywords", []), True))
+
+        # Pattern id -> [(group index, keyword index)], first keyword of a group wins
+        patterns: dict[str, int] = {}
+        self.pattern_groups: list[list[tuple[int, int]]] = []
+        for gi, (_, _, keywords, _) in enumerate(self.groups):
+            for ki, kw in enumerate(keywords):
+                pid = patterns.setdefault(kw.lower(), len(patterns))
+                if pid == len(self.pattern_groups):
+                    self.pattern_groups.append([])
+                self.pattern_groups[pid].append((gi, ki))
+        self.automaton = AhoCorasick(list(patterns))
+
+        u5 = u_rules.get("U5_whitelist_bonus", {})
+        self.u5_bonus = u5.get("bonus", 15) if u5.get("enabled") else None
+        self.whitelist = frozenset(u.lower() for u in rules.get("whitelist", []))
+        self.blacklist = frozenset(u.lower() for u in rules.get("blacklist", []))
+        self.threshold = rules.get("score_threshold", 0)
+
+    def first_hits(self, text_lower: str) -> list[int | None]:
+        """Per keyword group: index of the first listed keyword present, or None."""
+        first: list[int | None] = [None] * len(self.groups)
+        for pid in self.automaton.find_all(text_lower):
+            for gi, ki in self.pattern_groups[pid]:
+                if first[gi] is None or ki < first[gi]:
+                    first[gi] = ki
+        return first
+
+
+def compile_rules(rules: dict) -> CompiledRules:
+    """Compile loaded filter rules once; pass the result to score_tweet."""
+    return CompiledRules(rules)
+
+
+# (rules dict, deep copy at compile time, CompiledRules) for score_tweet callers passing a dict
+_last_compiled: tuple[dict, dict, CompiledRules] | None = None
+
+
+def _compiled_for(rules: dict) -> CompiledRules:
+    """compile_rules(rules), reused while the same dict comes back unchanged."""
+    global _last_compiled
+    cached = _last_compiled
+    if cached is not None and cached[0] is rules and cached[1] == rules:
+        return cached[2]
+    compiled = compile_rules(rules)
+    _last_compiled = (rules, copy.deepcopy(rules), compiled)
+    return compiled
+
+
+def score_tweet(tweet: dict, rules: dict | CompiledRules) -> dict:
     """Score a single tweet. Returns dict with score, reasons, and verdict.
 
     Args:
         tweet: Bird JSON tweet {"id", "text", "createdAt", "author": {"username", "name"}}
-        rules: Loaded filter rules dict
+        rules: CompiledRules (from compile_rules) or a loaded filter rules dict;
+            the last dict's compilation is reused until it is mutated or another
+            dict is passed, so prefer compile_rules when alternating rule sets
 
     Returns:
         {"score": int, "garbage": [...], "useful": [...], "verdict": "keep"|"discard"|"review"}
     """
+    if not isinstance(rules, CompiledRules):
+        rules = _compiled_for(rules)
+
     text = tweet.get("text", "")
     text_lower = text.lower()
     username = tweet.get("author", {}).get("username", "").lower()
@@ -21,104 +123,38 @@ def score_tweet(tweet: dict, rules: dict) -> dict:
     garbage_hits = []
     useful_hits = []
 
-    # --- Garbage Rules ---
-    g_rules = rules.get("garbage_rules", {})
-
     # G1: Ticker spam
-    g1 = g_rules.get("G1_ticker_spam", {})
-    if g1.get("enabled"):
-        pattern = g1.get("pattern", r"\$[A-Z]{1,5}")
-        tickers = re.findall(pattern, text)
-        if len(tickers) >= g1.get("min_tickers", 5):
-            score += g1.get("penalty", -50)
+    if rules.g1 is not None:
+        pattern, min_tickers, penalty = rules.g1
+        tickers = pattern.findall(text)
+        if len(tickers) >= min_tickers:
+            score += penalty
             garbage_hits.append(f"G1: {len(tickers)} tickers found")
 
-    # G2: Promo keywords
-    g2 = g_rules.get("G2_promo_keywords", {})
-    if g2.get("enabled"):
-        for kw in g2.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += g2.get("penalty", -40)
-                garbage_hits.append(f"G2: promo '{kw}'")
-                break  # One match is enough
-
-    # G3: Payment mention
-    g3 = g_rules.get("G3_payment_mention", {})
-    if g3.get("enabled"):
-        for kw in g3.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += g3.get("penalty", -30)
-                garbage_hits.append(f"G3: payment '{kw}'")
-                break
+    # G2, G3, U1-U4: one match per rule is enough; G4 analysis keywords
+    first = rules.first_hits(text_lower)
+    for (label, weight, keywords, is_garbage), ki in zip(rules.groups, first):
+        if label is None or ki is None:
+            continue
+        score += weight
+        (garbage_hits if is_garbage else useful_hits).append(f"{label} '{keywords[ki]}'")
 
     # G4: Short content
-    g4 = g_rules.get("G4_short_content", {})
-    if g4.get("enabled"):
-        if len(text) < g4.get("min_chars", 80):
-            has_analysis = any(
-                kw.lower() in text_lower
-                for kw in g4.get("analysis_keywords", [])
-            )
-            if not has_analysis:
-                score += g4.get("penalty", -20)
-                garbage_hits.append(f"G4: short ({len(text)} chars, no analysis keywords)")
-
-    # G5: Background mention (disabled by default)
-    g5 = g_rules.get("G5_background_mention", {})
-    if g5.get("enabled"):
-        # Placeholder for v2 NLP implementation
-        pass
-
-    # --- Useful Rules ---
-    u_rules = rules.get("useful_rules", {})
-
-    # U1: Analyst actions
-    u1 = u_rules.get("U1_analyst_actions", {})
-    if u1.get("enabled"):
-        for kw in u1.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += u1.get("bonus", 30)
-                useful_hits.append(f"U1: analyst '{kw}'")
-                break
-
-    # U2: Earnings
-    u2 = u_rules.get("U2_earnings", {})
-    if u2.get("enabled"):
-        for kw in u2.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += u2.get("bonus", 25)
-                useful_hits.append(f"U2: earnings '{kw}'")
-                break
-
-    # U3: Fundamental analysis
-    u3 = u_rules.get("U3_fundamental_analysis", {})
-    if u3.get("enabled"):
-        for kw in u3.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += u3.get("bonus", 20)
-                useful_hits.append(f"U3: fundamental '{kw}'")
-                break
-
-    # U4: Major events
-    u4 = u_rules.get("U4_major_events", {})
-    if u4.get("enabled"):
-        for kw in u4.get("keywords", []):
-            if kw.lower() in text_lower:
-                score += u4.get("bonus", 35)
-                useful_hits.append(f"U4: event '{kw}'")
-                break
+    if rules.g4 is not None:
+        min_chars, penalty, gi = rules.g4
+        if len(text) < min_chars and first[gi] is None:
+            score += penalty
+            garbage_hits.append(f"G4: short ({len(text)} chars, no analysis keywords)")
+
+    # G5: Background mention (disabled by default) — placeholder for v2 NLP
 
     # U5: Whitelist bonus
-    u5 = u_rules.get("U5_whitelist_bonus", {})
-    if u5.get("enabled"):
-        whitelist = [u.lower() for u in rules.get("whitelist", [])]
-        if username in whitelist:
-            score += u5.get("bonus", 15)
-            useful_hits.append(f"U5: whitelisted @{username}")
+    if rules.u5_bonus is not None and username in rules.whitelist:
+        score += rules.u5_bonus
+        useful_hits.append(f"U5: whitelisted @{username}")
 
     # --- Blacklist check (instant discard) ---
-    blacklist = [u.lower() for u in rules.get("blacklist", [])]
-    if username in blacklist:
+    if username in rules.blacklist:
         return {
             "score": -999,
             "garbage": [f"BLACKLISTED: @{username}"],
@@ -127,7 +163,7 @@ def score_tweet(tweet: dict, rules: dict) -> dict:
         }
 
     # --- Verdict ---
-    threshold = rules.get("score_threshold", 0)
+    threshold = rules.threshold
     if score >= threshold + 20:
         verdict = "keep"
     elif score >= threshold:
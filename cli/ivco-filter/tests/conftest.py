@@ -0,0 +1,21 @@
+"""Shared fixtures: the shipped filter rules and the sample tweets."""
+import json
+import os
+
+import pytest
+
+from ivco_filter.rules import load_rules
+
+SAMPLE_TWEETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample-tweets.json")
+
+
+@pytest.fixture
+def rules():
+    """config/filter-rules.json as loaded by the CLI."""
+    return load_rules()
+
+
+@pytest.fixture
+def sample_tweets():
+    with open(SAMPLE_TWEETS) as f:
+        return json.load(f)
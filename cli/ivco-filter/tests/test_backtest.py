@@ -0,0 +1,62 @@
+"""Comparative backtest on the sample tweets: feature codes, flips, feature cache."""
+import copy
+
+from ivco_filter.backtest import FEATURE_BITS, compare_rulesets, extract_features
+from ivco_filter.scorer import score_tweet
+
+# Rules each sample tweet hits under config/filter-rules.json (all rules enabled)
+EXPECTED_FEATURES = {
+    "t001": {"U1", "U3"}, "t002": {"U2", "U3"}, "t003": {"G1", "U2"}, "t004": {"G2"},
+    "t005": {"U2", "U3"}, "t006": {"U2", "U4"}, "t007": {"G3", "G4"}, "t008": {"G3"},
+    "t009": {"G4"}, "t010": {"U3"}, "t011": {"U4"}, "t012": {"U1", "U2", "U3"},
+    "t013": {"G4"}, "t014": {"G2"},
+}
+
+
+def _code(names):
+    return sum(FEATURE_BITS[name] for name in names)
+
+
+def _candidates(rules):
+    """Baseline, a structural change (new keyword + blacklist) and a threshold-only change."""
+    keyword = copy.deepcopy(rules)
+    keyword["useful_rules"]["U3_fundamental_analysis"]["keywords"].append("lol")
+    keyword["blacklist"] = ["TickerSpammer"]
+    threshold = dict(copy.deepcopy(rules), score_threshold=30)
+    return [("base", rules), ("keyword", keyword), ("threshold", threshold)]
+
+
+def test_feature_codes(rules, sample_tweets):
+    codes = extract_features(sample_tweets, rules)
+    assert {t["id"]: code for t, code in zip(sample_tweets, codes)} == {
+        tweet_id: _code(names) for tweet_id, names in EXPECTED_FEATURES.items()}
+
+    keyword_rules = _candidates(rules)[1][1]
+    changed = dict(zip([t["id"] for t in sample_tweets], extract_features(sample_tweets, keyword_rules)))
+    assert changed["t013"] == _code({"G4", "U3"})
+    assert changed["t003"] == _code({"BLACKLISTED"})  # a blacklisted tweet has no other hits
+    assert changed["t001"] == _code(EXPECTED_FEATURES["t001"])
+
+
+def test_compare_flips(rules, sample_tweets, tmp_path):
+    candidates = _candidates(rules)
+    report = compare_rulesets(sample_tweets, "corpus", candidates, cache_dir=str(tmp_path))
+    assert report["feature_sets"] == 2 and report["feature_sets_cached"] == 0
+    base, keyword, threshold = report["candidates"]
+
+    assert base["flips"] == 0 and (base["keep"], base["review"], base["discard"]) == (7, 0, 7)
+    # "lol pypl" scores -20 + 20 = 0; t003 was already a discard, blacklisting changes nothing
+    assert keyword["flip_breakdown"] == {"discard->review": {"count": 1, "ids": ["t013"]}}
+    assert threshold["flip_breakdown"] == {
+        "keep->discard": {"count": 1, "ids": ["t010"]},
+        "keep->review": {"count": 3, "ids": ["t002", "t005", "t011"]},
+    }
+
+    # Counts agree with scoring every tweet directly
+    for (_, candidate_rules), result in zip(candidates, report["candidates"]):
+        verdicts = [score_tweet(t, candidate_rules)["verdict"] for t in sample_tweets]
+        assert [result[v] for v in ("keep", "review", "discard")] == [
+            verdicts.count(v) for v in ("keep", "review", "discard")]
+
+    again = compare_rulesets(sample_tweets, "corpus", candidates, cache_dir=str(tmp_path))
+    assert again["feature_sets_cached"] == 2 and again["candidates"] == report["candidates"]
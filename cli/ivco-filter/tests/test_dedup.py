@@ -0,0 +1,106 @@
+"""Near-duplicate index: scoped per company/query, written only for stored tweets."""
+import json
+import sqlite3
+import sys
+
+from ivco_filter.cli import main
+from ivco_filter.dedup import DedupIndex
+
+TEXT = "PayPal Q4 earnings beat estimates: EPS $1.48 vs $1.36 expected. Revenue up 8% YoY to $8.2B"
+
+
+def _tweet(tweet_id, text=TEXT, **extra):
+    return {"id": tweet_id, "text": text, "author": {"username": "someone"}, **extra}
+
+
+def test_check_does_not_record(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    index = DedupIndex(path)
+    assert index.check(_tweet("a")) is None
+    # Held for the rest of the run, so a repeat in the same batch is caught...
+    assert index.check(_tweet("b", "RT @someone: " + TEXT))["duplicate_of"] == "a"
+    index.close()
+    # ...but nothing reached the disk: a failed store must not hide the tweet next run
+    index = DedupIndex(path)
+    assert index.check(_tweet("c")) is None
+    index.close()
+
+    index = DedupIndex(path)
+    assert index.add(_tweet("c")) and not index.add(_tweet("empty", "@someone https://x.com"))
+    index.close()
+    assert DedupIndex(path).check(_tweet("d"))["duplicate_of"] == "c"
+
+
+def test_held_tweets_are_bounded(tmp_path):
+    """Only the last max_held passed tweets guard the rest of the run."""
+    index = DedupIndex(str(tmp_path / "dedup.db"), max_held=2)
+    texts = [TEXT, "Venmo monetization plan explained by the CFO at the investor day in detail",
+             "Braintree volume slowed this quarter while branded checkout margins improved again"]
+    for i, text in enumerate(texts):
+        assert index.check(_tweet(str(i), text)) is None
+    assert len(index._held) == 2
+    assert index.check(_tweet("again-0", texts[0])) is None  # forgotten, and now held in its place
+    assert index.check(_tweet("again-2", texts[2]))["duplicate_of"] == "2"
+
+
+def test_scopes_are_independent(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.db"))
+    index.add(_tweet("a"), scope="2")
+    assert index.check(_tweet("b"), scope="7") is None
+    assert index.check(_tweet("c"), scope="2")["duplicate_of"] == "a"
+    assert index.check(_tweet("d")) is None
+
+
+def test_unscoped_index_is_migrated(tmp_path):
+    """Entries from before scoping stay in the default scope."""
+    path = str(tmp_path / "dedup.db")
+    index = DedupIndex(path)
+    index.add(_tweet("old"))
+    index.close()
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE old_signatures AS SELECT id, tweet_id, signature, seen_at FROM signatures;
+        DROP TABLE signatures;
+        ALTER TABLE old_signatures RENAME TO signatures;
+    """)
+    conn.close()
+
+    index = DedupIndex(path)
+    assert index.check(_tweet("new"))["duplicate_of"] == "old"
+    assert index.check(_tweet("other"), scope="2") is None
+
+
+def test_filter_then_record(monkeypatch, capsys, tmp_path):
+    """--dedup only drops a tweet after dedup-record saw its near-duplicate stored."""
+    raw, stored = tmp_path / "raw.json", tmp_path / "stored.json"
+    raw.write_text(json.dumps([_tweet("1", query="paypal"), _tweet("2", TEXT + "!", query="paypal")]))
+    common = ["--dedup-db", str(tmp_path / "dedup.db")]
+
+    def run(*argv):
+        monkeypatch.setattr(sys, "argv", ["ivco-filter", *argv])
+        main()
+        return capsys.readouterr()
+
+    def kept():
+        return [t["id"] for t in json.loads(run("--input", str(raw), "--dedup", "--dedup-scope", "2", *common).out)]
+
+    assert kept() == ["1"]
+    assert kept() == ["1"]  # nothing was recorded by filtering alone
+    stored.write_text(json.dumps([_tweet("1", query="paypal")]))
+    assert "Recorded 1 of 1" in run("dedup-record", "--input", str(stored), "--dedup-scope", "2", *common).err
+    assert kept() == []
+    # Scoped by query tag instead, company 2's entries are not candidates
+    assert [t["id"] for t in json.loads(run("--input", str(raw), "--dedup", *common).out)] == ["1"]
+
+
+def test_discarded_tweet_does_not_suppress_duplicate(monkeypatch, capsys, tmp_path, rules):
+    """Dedup runs after scoring: a blacklisted copy must not hide the kept one."""
+    config, raw = tmp_path / "rules.json", tmp_path / "raw.json"
+    config.write_text(json.dumps(dict(rules, blacklist=["spammer"])))
+    raw.write_text(json.dumps([dict(_tweet("1"), author={"username": "spammer"}), _tweet("2", TEXT + "!")]))
+    monkeypatch.setattr(sys, "argv", ["ivco-filter", "--input", str(raw), "--config", str(config), "--dedup",
+                                      "--dedup-db", str(tmp_path / "dedup.db")])
+    main()
+    out = capsys.readouterr()
+    assert [t["id"] for t in json.loads(out.out)] == ["2"]
+    assert "1 discard, 0 duplicate" in out.err
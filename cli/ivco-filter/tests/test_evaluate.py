@@ -0,0 +1,53 @@
+"""evaluate on the sample tweets with hand labels: confusion, precision/recall, per-rule metrics."""
+import pytest
+
+from ivco_filter.evaluate import evaluate, split_labeled
+
+# What a reader would want from each sample tweet; the shipped rules get t009 and t010 wrong
+LABELS = {
+    "t001": "keep", "t002": "keep", "t003": "discard", "t004": "discard", "t005": "keep",
+    "t006": "keep", "t007": "discard", "t008": "discard", "t009": "review", "t010": "review",
+    "t011": "keep", "t012": "keep", "t013": "discard", "t014": "discard",
+}
+
+
+@pytest.fixture
+def labeled(sample_tweets):
+    # Both record shapes: the label on the tweet itself, or {"tweet": ..., "label": ...}
+    return [dict(t, label=LABELS[t["id"]]) if i % 2 else {"tweet": t, "label": LABELS[t["id"]]}
+            for i, t in enumerate(sample_tweets)]
+
+
+def test_confusion_and_pass_through(rules, labeled):
+    tweets, expected = split_labeled(labeled)
+    assert [t["id"] for t in tweets] == list(LABELS) and expected == list(LABELS.values())
+    confusion = evaluate(tweets, expected, rules)["confusion"]
+
+    assert confusion["matrix"] == {
+        "keep": {"keep": 6, "review": 0, "discard": 0},
+        "review": {"keep": 1, "review": 0, "discard": 1},
+        "discard": {"keep": 0, "review": 0, "discard": 6},
+    }
+    assert confusion["accuracy"] == 0.8571
+    assert confusion["per_verdict"]["keep"] == {"precision": 0.8571, "recall": 1.0, "f1": 0.9231, "support": 6}
+    assert confusion["per_verdict"]["review"] == {"precision": None, "recall": 0.0, "f1": None, "support": 2}
+    assert confusion["per_verdict"]["discard"]["precision"] == 0.8571
+    # 8 relevant tweets (keep/review); 7 passed through, all relevant
+    assert confusion["pass_through"] == {"precision": 1.0, "recall": 0.875}
+
+
+def test_rule_metrics(rules, labeled):
+    report = evaluate(*split_labeled(labeled), rules)
+    g4 = report["rules"]["G4"]
+    # G4 hits t007, t009, t013; only t007 and t013 are labeled discard (6 discards in all)
+    assert (g4["hits"], g4["precision"], g4["recall"]) == (3, 0.6667, 0.3333)
+    # Without G4, t013 would pass (wrong) and t009 would become review (right)
+    assert g4["contribution"] == {"changed": 2, "fixes": 1, "breaks": 1, "net": 0}
+    assert report["rules"]["U1"]["precision"] == 1.0 and report["rules"]["U1"]["hits"] == 2
+    assert "contribution" not in report["rules"]["BLACKLISTED"]
+    assert report["tweets"] == 14 and report["timing"]["latency_us"]["max"] > 0
+
+
+def test_bad_label(sample_tweets):
+    with pytest.raises(ValueError, match="t001"):
+        split_labeled([dict(sample_tweets[0], label="maybe")])
@@ -0,0 +1,46 @@
+"""Multi-process scoring returns exactly what the single-process run does."""
+import json
+import os
+import sys
+
+import pytest
+
+from ivco_filter import cli
+from ivco_filter.cli import main
+from ivco_filter.parallel import score_stream
+from ivco_filter.scorer import compile_rules
+
+
+def _run(monkeypatch, capsys, argv):
+    monkeypatch.setattr(sys, "argv", ["ivco-filter", *argv])
+    main()
+    return capsys.readouterr().out
+
+
+def test_score_stream_matches_serial(rules, sample_tweets):
+    compiled = compile_rules(rules)
+    tweets = [dict(t, id=f"{t['id']}-{i}") for i in range(40) for t in sample_tweets]
+    serial = list(score_stream(tweets, compiled))
+    for chunk_size in (1, 7, 500):
+        assert list(score_stream(iter(tweets), compiled, workers=2, chunk_size=chunk_size)) == serial
+
+
+@pytest.mark.parametrize("workers_args", [["backtest", "--workers", "2"], ["--workers", "2", "backtest"]])
+def test_backtest_workers_option(monkeypatch, capsys, workers_args):
+    """--workers is accepted before or after the subcommand and changes nothing in the output."""
+    input_args = ["--input", os.path.join(os.path.dirname(__file__), "sample-tweets.json")]
+    serial = _run(monkeypatch, capsys, ["backtest", *input_args])
+    seen = []
+    monkeypatch.setattr(cli, "score_stream", lambda tweets, rules, workers: seen.append(workers)
+                        or score_stream(tweets, rules, workers))
+    assert _run(monkeypatch, capsys, [*workers_args, *input_args]) == serial
+    assert seen == [2]
+    assert "Results: 7 keep" in serial
+
+
+def test_ndjson_workers_matches_serial(monkeypatch, capsys, tmp_path, sample_tweets):
+    source = tmp_path / "tweets.ndjson"
+    source.write_text("".join(json.dumps(t) + "\n" for t in sample_tweets * 5))
+    serial = _run(monkeypatch, capsys, ["--ndjson", "--input", str(source)])
+    assert _run(monkeypatch, capsys, ["--ndjson", "--workers", "3", "--input", str(source)]) == serial
+    assert len(serial.splitlines()) == 35
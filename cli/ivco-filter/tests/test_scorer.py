@@ -0,0 +1,138 @@
+"""CompiledRules parity: the single-pass scorer matches the per-rule keyword loops."""
+import copy
+import random
+import re
+
+import pytest
+
+from ivco_filter.scorer import compile_rules, score_tweet
+
+# (section, rule key, reason label, weight key, default weight); G4 is checked after these
+KEYWORD_RULES = (
+    ("garbage_rules", "G2_promo_keywords", "G2: promo", "penalty", -40),
+    ("garbage_rules", "G3_payment_mention", "G3: payment", "penalty", -30),
+    ("useful_rules", "U1_analyst_actions", "U1: analyst", "bonus", 30),
+    ("useful_rules", "U2_earnings", "U2: earnings", "bonus", 25),
+    ("useful_rules", "U3_fundamental_analysis", "U3: fundamental", "bonus", 20),
+    ("useful_rules", "U4_major_events", "U4: event", "bonus", 35),
+)
+FILLER = ["the", "stock", "is", "up", "today", "steps", "moonlight", "board-level", "beaten",
+          "I", "think", "PayPal", "PYPL", "ratings", "q", "margins", "10-ks", "!!", "🚀", "\n"]
+
+
+def _reference_score(tweet: dict, rules: dict) -> dict:
+    """The scorer before compilation: one substring scan per keyword, rule by rule."""
+    text = tweet.get("text", "")
+    text_lower = text.lower()
+    username = tweet.get("author", {}).get("username", "").lower()
+    g_rules = rules.get("garbage_rules", {})
+    u_rules = rules.get("useful_rules", {})
+    score, garbage, useful = 0, [], []
+
+    g1 = g_rules.get("G1_ticker_spam", {})
+    if g1.get("enabled"):
+        tickers = re.findall(g1.get("pattern", r"\$[A-Z]{1,5}"), text)
+        if len(tickers) >= g1.get("min_tickers", 5):
+            score += g1.get("penalty", -50)
+            garbage.append(f"G1: {len(tickers)} tickers found")
+
+    for section, key, label, weight_key, default in KEYWORD_RULES:
+        rule = rules.get(section, {}).get(key, {})
+        if not rule.get("enabled"):
+            continue
+        for kw in rule.get("keywords", []):
+            if kw.lower() in text_lower:
+                score += rule.get(weight_key, default)
+                (garbage if section == "garbage_rules" else useful).append(f"{label} '{kw}'")
+                break
+
+    g4 = g_rules.get("G4_short_content", {})
+    if g4.get("enabled") and len(text) < g4.get("min_chars", 80):
+        if not any(kw.lower() in text_lower for kw in g4.get("analysis_keywords", [])):
+            score += g4.get("penalty", -20)
+            garbage.append(f"G4: short ({len(text)} chars, no analysis keywords)")
+
+    u5 = u_rules.get("U5_whitelist_bonus", {})
+    if u5.get("enabled") and username in [u.lower() for u in rules.get("whitelist", [])]:
+        score += u5.get("bonus", 15)
+        useful.append(f"U5: whitelisted @{username}")
+
+    if username in [u.lower() for u in rules.get("blacklist", [])]:
+        return {"score": -999, "garbage": [f"BLACKLISTED: @{username}"], "useful": [], "verdict": "discard"}
+
+    threshold = rules.get("score_threshold", 0)
+    verdict = "keep" if score >= threshold + 20 else "review" if score >= threshold else "discard"
+    return {"score": score, "garbage": garbage, "useful": useful, "verdict": verdict}
+
+
+def _vocabulary(rules: dict) -> list[str]:
+    words = list(FILLER)
+    for section in ("garbage_rules", "useful_rules"):
+        for rule in rules[section].values():
+            words += rule.get("keywords", []) + rule.get("analysis_keywords", [])
+    return words
+
+
+def _random_tweet(rng: random.Random, vocabulary: list[str], users: list[str]) -> dict:
+    words = []
+    for _ in range(rng.choice([1, 2, 4, 8, 16, 32])):
+        word = rng.choice(vocabulary)
+        word = rng.choice([word, word.upper(), word.title(), word[: max(1, len(word) - 1)]])
+        words.append(word)
+    words += [f"${rng.choice(['TSM', 'PYPL', 'AAPL', 'X', 'NVDA', 'toolong'])}"
+              for _ in range(rng.choice([0, 0, 2, 5, 7]))]
+    rng.shuffle(words)
+    sep = rng.choice([" ", "", ", "])
+    return {"id": str(rng.random()), "text": sep.join(words), "author": {"username": rng.choice(users)}}
+
+
+def _random_rules(rng: random.Random, rules: dict) -> dict:
+    """Shuffled and overlapping keyword lists, random toggles, user lists and threshold."""
+    variant = copy.deepcopy(rules)
+    for section in ("garbage_rules", "useful_rules"):
+        for rule in variant[section].values():
+            rule["enabled"] = rng.random() < 0.8
+            for field in ("keywords", "analysis_keywords"):
+                if field in rule:
+                    keywords = rule[field] + rng.sample(_vocabulary(rules), 3)
+                    rng.shuffle(keywords)
+                    rule[field] = keywords
+    variant["whitelist"] = ["Analyst", "shared"]
+    variant["blacklist"] = ["spammer", "SHARED"]
+    variant["score_threshold"] = rng.choice([-20, 0, 10])
+    return variant
+
+
+def test_sample_tweets_match_reference(rules, sample_tweets):
+    compiled = compile_rules(rules)
+    for tweet in sample_tweets:
+        assert score_tweet(tweet, compiled) == _reference_score(tweet, rules), tweet["id"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_tweets_match_reference(rules, seed):
+    rng = random.Random(seed)
+    variant = rules if seed == 0 else _random_rules(rng, rules)
+    compiled = compile_rules(variant)
+    vocabulary = _vocabulary(rules)
+    users = ["analyst", "ANALYST", "spammer", "shared", "nobody", ""]
+    for _ in range(1000):
+        tweet = _random_tweet(rng, vocabulary, users)
+        assert score_tweet(tweet, compiled) == _reference_score(tweet, variant), tweet["text"]
+    # The uncompiled-dict form goes through the same path
+    assert score_tweet(tweet, variant) == _reference_score(tweet, variant)
+
+
+def test_dict_rules_compiled_once(rules, sample_tweets, monkeypatch):
+    """Passing the same dict reuses its compilation; mutating it recompiles."""
+    from ivco_filter import scorer
+    calls = []
+    monkeypatch.setattr(scorer, "_last_compiled", None)
+    monkeypatch.setattr(scorer, "compile_rules", lambda r: calls.append(r) or scorer.CompiledRules(r))
+    variant = copy.deepcopy(rules)
+    for tweet in sample_tweets:
+        score_tweet(tweet, variant)
+    assert len(calls) == 1
+    variant["score_threshold"] = 100
+    assert score_tweet(sample_tweets[0], variant) == _reference_score(sample_tweets[0], variant)
+    assert len(calls) == 2
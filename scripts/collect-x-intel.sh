@@ -1,6 +1,6 @@
 #!/bin/bash
 # collect-x-intel.sh — Search X → Filter → Store pipeline for IVCO
-# Version: 3.0.0 (2026-02-15)
+# Version: 3.5.0 (2026-10-18)
 #
 # Pipeline: ivco-xsearch (X API v2) → ivco-filter (score+discard) → ivco-collect (POST to CMS, file fallback)
 # Runs via launchd: 07:00, 13:00, 20:00 (Asia/Taipei)
@@ -13,6 +13,16 @@
 #                          Remove cookie dependencies (no more BIRD_AUTH_TOKEN/BIRD_CT0)
 #                          Add queue flush at start (retry failed POSTs from previous runs)
 #                          Auth: X_BEARER_TOKEN from ~/.config/env/global.env
+#   v3.1.0 (2026-10-18) — Queue is now SQLite (queue.db) flushed by ivco-collect --flush-queue
+#                          (old per-event queue files are imported automatically)
+#   v3.2.0 (2026-10-18) — ivco-xsearch --checkpoint: only tweets newer than the last run (since_id)
+#   v3.3.0 (2026-10-18) — One ivco-xsearch process for all keywords (shared connection, merged dedup)
+#   v3.4.0 (2026-10-18) — ivco-filter --dedup per company; tweets enter the near-duplicate
+#                          index only after ivco-collect stored them (dedup-record)
+#   v3.5.0 (2026-10-18) — Drop --checkpoint again: at -n 10 "paypal" outruns every run, so
+#                          checkpointing only switched the search from relevancy to recency
+#                          and left gaps that expire unfetched. Re-enable with an -n/--budget
+#                          sized for the query volume between runs.
 #
 # Rollback:
 #   cp ~/AI-Workspace/memory/backups/collect-x-intel.sh.bak.20260215 \
@@ -65,73 +75,59 @@ log() {
   echo "[$(date -Iseconds)] $1" >> "$LOG_FILE"
 }
 
-log "=== Collection run started (v3.0.0 — X API v2) ==="
-
-# Step 0: Flush queue — retry any failed POSTs from previous runs
-queue_count=$(find "$QUEUE_DIR" -name "*.json" -type f 2>/dev/null | wc -l | tr -d ' ')
-if [ "$queue_count" -gt 0 ]; then
-  log "Flushing queue: ${queue_count} pending events"
-  flushed=0
-  for qfile in "$QUEUE_DIR"/*.json; do
-    [ -f "$qfile" ] || continue
-    result=$("$PYTHON" "$SCRIPT_DIR/ivco-collect" \
-      --input "$qfile" \
-      --api "$PAYLOAD_API" \
-      --company-id "$PAYPAL_COMPANY_ID" \
-      --keyword "queue-retry" \
-      --json 2>> "$LOG_FILE")
-    # Only delete queue file if all events stored and zero errors/queued
-    q_stored=$("$PYTHON" -c "import json,sys; d=json.loads(sys.argv[1]); print(d.get('stored',0))" "$result" 2>/dev/null || echo "0")
-    q_errors=$("$PYTHON" -c "import json,sys; d=json.loads(sys.argv[1]); print(d.get('errors',0)+d.get('queued',0))" "$result" 2>/dev/null || echo "1")
-    if [ "$q_stored" -gt 0 ] && [ "$q_errors" -eq 0 ] 2>/dev/null; then
-      rm -f "$qfile"
-      flushed=$((flushed + q_stored))
-    fi
-  done
+log "=== Collection run started (v3.5.0 — X API v2) ==="
+
+# Step 0: Flush queue — retry any failed POSTs from previous runs (claim/ack, concurrent)
+queue_depth=$("$PYTHON" "$SCRIPT_DIR/ivco-collect" --queue-stats --queue-dir "$QUEUE_DIR" 2>> "$LOG_FILE" \
+  | "$PYTHON" -c "import json,sys; print(json.load(sys.stdin)['depth'])" 2>/dev/null || echo "0")
+if [ "$queue_depth" -gt 0 ]; then
+  log "Flushing queue: ${queue_depth} pending events"
+  flushed=$("$PYTHON" "$SCRIPT_DIR/ivco-collect" \
+    --flush-queue \
+    --queue-dir "$QUEUE_DIR" \
+    --api "$PAYLOAD_API" 2>> "$LOG_FILE" || echo "0")
   log "  Queue flush: ${flushed} events recovered"
 fi
 
-total_raw=0
-total_filtered=0
-total_stored=0
-
-for keyword in "paypal" "PYPL"; do
-  log "Searching: ${keyword}"
-
-  # Step 1: ivco-xsearch → raw JSON (official X API v2, bearer token auth)
-  "$PYTHON" "$IVCO_XSEARCH" "$keyword" -n "$MAX_RESULTS" \
-    > "$TMP_DIR/raw.json" 2>> "$LOG_FILE" || echo "[]" > "$TMP_DIR/raw.json"
-
-  raw_count=$("$PYTHON" -c "import json; print(len(json.load(open('$TMP_DIR/raw.json'))))" 2>/dev/null || echo "0")
-  log "  Raw tweets: ${raw_count}"
-  total_raw=$((total_raw + raw_count))
-
-  # Step 2: ivco-filter → scored + filtered JSON
-  "$IVCO_FILTER" \
-    --config "$FILTER_CONFIG" \
-    --input "$TMP_DIR/raw.json" \
-    --output "$TMP_DIR/filtered.json" \
-    --verbose 2>> "$LOG_FILE" || {
-    log "  WARNING: ivco-filter failed, falling back to raw tweets"
-    cp "$TMP_DIR/raw.json" "$TMP_DIR/filtered.json"
-  }
-
-  filtered_count=$("$PYTHON" -c "import json; print(len(json.load(open('$TMP_DIR/filtered.json'))))" 2>/dev/null || echo "0")
-  discarded=$((raw_count - filtered_count))
-  log "  After filter: ${filtered_count} kept, ${discarded} discarded"
-  total_filtered=$((total_filtered + filtered_count))
-
-  # Step 3: ivco-collect → POST to Payload CMS (with file queue fallback)
-  stored=$("$PYTHON" "$SCRIPT_DIR/ivco-collect" \
-    --input "$TMP_DIR/filtered.json" \
-    --api "$PAYLOAD_API" \
-    --company-id "$PAYPAL_COMPANY_ID" \
-    --keyword "$keyword" \
-    --queue-dir "$QUEUE_DIR" 2>> "$LOG_FILE")
-
-  log "  Stored: ${stored} tweets"
-  total_stored=$((total_stored + stored))
-done
-
-rm -f "$TMP_DIR/raw.json" "$TMP_DIR/filtered.json"
+KEYWORDS=("paypal" "PYPL")
+log "Searching: ${KEYWORDS[*]}"
+
+# Step 1: ivco-xsearch → raw JSON, all keywords in one process (merged, deduplicated, tagged with "query")
+"$PYTHON" "$IVCO_XSEARCH" "${KEYWORDS[@]}" -n "$MAX_RESULTS" \
+  > "$TMP_DIR/raw.json" 2>> "$LOG_FILE" || echo "[]" > "$TMP_DIR/raw.json"
+
+total_raw=$("$PYTHON" -c "import json; print(len(json.load(open('$TMP_DIR/raw.json'))))" 2>/dev/null || echo "0")
+log "  Raw tweets: ${total_raw}"
+
+# Step 2: ivco-filter → scored + filtered JSON
+"$IVCO_FILTER" \
+  --config "$FILTER_CONFIG" \
+  --input "$TMP_DIR/raw.json" \
+  --output "$TMP_DIR/filtered.json" \
+  --dedup --dedup-scope "$PAYPAL_COMPANY_ID" \
+  --verbose 2>> "$LOG_FILE" || {
+  log "  WARNING: ivco-filter failed, falling back to raw tweets"
+  cp "$TMP_DIR/raw.json" "$TMP_DIR/filtered.json"
+}
+
+total_filtered=$("$PYTHON" -c "import json; print(len(json.load(open('$TMP_DIR/filtered.json'))))" 2>/dev/null || echo "0")
+discarded=$((total_raw - total_filtered))
+log "  After filter: ${total_filtered} kept, ${discarded} discarded"
+
+# Step 3: ivco-collect → POST to Payload CMS (with queue fallback); keywords come from each tweet's "query"
+total_stored=$("$PYTHON" "$SCRIPT_DIR/ivco-collect" \
+  --input "$TMP_DIR/filtered.json" \
+  --api "$PAYLOAD_API" \
+  --company-id "$PAYPAL_COMPANY_ID" \
+  --keyword "${KEYWORDS[0]}" \
+  --queue-dir "$QUEUE_DIR" \
+  --stored-output "$TMP_DIR/stored.json" 2>> "$LOG_FILE")
+log "  Stored: ${total_stored} tweets"
+
+# Step 4: remember what was stored, so near-duplicates are dropped in later runs
+"$IVCO_FILTER" dedup-record \
+  --input "$TMP_DIR/stored.json" \
+  --dedup-scope "$PAYPAL_COMPANY_ID" 2>> "$LOG_FILE" || log "  WARNING: dedup-record failed"
+
+rm -f "$TMP_DIR/raw.json" "$TMP_DIR/filtered.json" "$TMP_DIR/stored.json"
 log "=== Collection complete: ${total_raw} raw → ${total_filtered} filtered → ${total_stored} stored ==="
@@ -0,0 +1,32 @@
+"""Load the stdlib-only scripts (no .py suffix, not a package) as modules."""
+import importlib.machinery
+import importlib.util
+import os
+
+import pytest
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(name: str):
+    loader = importlib.machinery.SourceFileLoader(name.replace("-", "_"), os.path.join(SCRIPTS, name))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def collect():
+    return _load("ivco-collect")
+
+
+@pytest.fixture(scope="session")
+def xsearch():
+    return _load("ivco-xsearch")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep seen indexes and checkpoints written by tests out of ~/.cache."""
+    monkeypatch.setenv("IVCO_CACHE_DIR", str(tmp_path / "cache"))
@@ -0,0 +1,167 @@
+"""ivco-collect's seen-ID index, retry queue and uploader, against a fake CMS."""
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def cms():
+    """CompanyEvents stand-in: stores POSTs, answers (company, source_url) lookups.
+
+    Append statuses to `script` to answer the next POSTs with them instead of
+    201; "502*" stores the event and still answers 502.
+    """
+    state = {"events": [], "posts": 0, "script": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            event = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            state["posts"] += 1
+            status = state["script"].pop(0) if state["script"] else 201
+            if status in (201, "502*"):
+                state["events"].append(event)
+            self._reply(502 if status == "502*" else status, {})
+
+        def do_GET(self):
+            query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+            docs = [e for e in state["events"]
+                    if str(e["company"]) == query["where[company][equals]"]
+                    and e["source_url"] == query["where[source_url][equals]"]]
+            self._reply(200, {"docs": docs, "totalDocs": len(docs)})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/api/company-events"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _event(n, company=2):
+    return {"company": company, "source_url": f"https://x.com/someone/status/{n}", "title": f"event {n}"}
+
+
+def test_seen_index(collect, tmp_path):
+    index = collect.SeenIndex(str(tmp_path / "seen.db"))
+    assert index.add_many(2, ["1", "2", ""]) == 2
+    assert (2, "1") in index and (2, 1) in index  # ids are stored as text
+    assert (3, "1") not in index and (2, "3") not in index
+    assert index.count(2) == 2 and index.count(3) == 0
+    index.close()
+
+
+def test_bloom_filter_rebuilt_after_runs_without_it(collect, tmp_path):
+    """Ids added by a run without --seen-bloom must not read as "definitely new" later."""
+    path = str(tmp_path / "seen.db")
+    index = collect.SeenIndex(path, bloom=True)
+    index.add_many(2, ["1"])
+    index.close()
+
+    plain = collect.SeenIndex(path)  # e.g. --flush-queue or a default collect
+    plain.add(2, "2")
+    plain.close()
+
+    index = collect.SeenIndex(path, bloom=True)
+    assert (2, "1") in index and (2, "2") in index
+    generation = index._generation()
+    index.close()
+    # Saved for the current generation, so the next run loads it instead of rebuilding
+    assert generation == 2 and collect.BloomFilter(path + ".bloom").load(generation)
+
+
+def test_bloom_filter_not_saved_after_concurrent_writer(collect, tmp_path):
+    path = str(tmp_path / "seen.db")
+    first, second = collect.SeenIndex(path, bloom=True), collect.SeenIndex(path, bloom=True)
+    first.add(2, "1")
+    second.add(2, "2")  # second's filter lacks "1": not saved
+    assert second.bloom_generation is None
+    second.close()
+    assert not os.path.exists(path + ".bloom")
+    first.close()  # complete for generation 1 only, the database is at 2
+    assert not collect.BloomFilter(path + ".bloom").load(2)
+    index = collect.SeenIndex(path, bloom=True)
+    assert (2, "1") in index and (2, "2") in index
+
+
+def test_queue_claim_ack_release(collect, tmp_path):
+    queue = collect.EventQueue(str(tmp_path / "queue"), lease_seconds=60)
+    assert queue.put_many([_event(1), _event(2), _event(3)]) == 3
+    assert queue.put_many([_event(1)]) == 0  # same (company, source_url)
+
+    batch = queue.claim("a", 2)
+    assert [(attempts, event["title"]) for _, attempts, event in batch] == [(1, "event 1"), (1, "event 2")]
+    assert [event["title"] for _, _, event in queue.claim("b", 10)] == ["event 3"]
+    assert queue.claim("c", 10) == []  # everything is leased
+
+    queue.ack("b", [batch[0][0]])  # not b's item: ignored
+    queue.ack("a", [batch[0][0]])
+    queue.release("a", [batch[1][0]])
+    stats = queue.stats()
+    assert (stats["depth"], stats["claimed"], stats["due"], stats["max_attempts"]) == (2, 1, 0, 1)
+    assert queue.claim("c", 10) == []  # released item is backing off
+    queue.close()
+
+
+def test_queue_expired_lease_is_claimable(collect, tmp_path):
+    queue = collect.EventQueue(str(tmp_path / "queue"))
+    queue.put_many([_event(1)])
+    assert len(queue.claim("crashed", 1, lease_seconds=-1)) == 1
+    assert [attempts for _, attempts, _ in queue.claim("b", 1)] == [2]
+
+
+def test_legacy_queue_files(collect, tmp_path):
+    queue_dir = tmp_path / "queue"
+    queue_dir.mkdir()
+    (queue_dir / "old.json").write_text(json.dumps([_event(1), "junk"]))
+    (queue_dir / "odd.json").write_text(json.dumps({"not": "a list"}))
+    queue = collect.EventQueue(str(queue_dir))
+    assert queue.stats()["depth"] == 1
+    assert (queue_dir / "odd.json").exists() and not (queue_dir / "old.json").exists()
+
+
+def test_uploader_retries_refusals_and_looks_up_uncertain_failures(collect, cms):
+    uploader = collect.EventUploader(cms["url"], concurrency=2, retries=2, backoff=0)
+    cms["script"] = [503, "502*"]
+    assert uploader.post_all([_event(1)]) == [True]
+    # 503 is a refusal: posted again; the 502 stored it anyway: found by lookup, not re-posted
+    assert cms["posts"] == 2 and len(cms["events"]) == 1
+
+    cms["script"] = [400]
+    assert uploader.post_all([_event(2)]) == [False]
+    assert cms["posts"] == 3
+    assert uploader.exists_all([_event(1), _event(2)]) == [True, False]
+
+
+def test_flush_queue(collect, cms, tmp_path):
+    queue = collect.EventQueue(str(tmp_path / "queue"))
+    queue.put_many([_event(n) for n in range(1, 6)])
+    cms["events"].append(_event(1))  # an earlier POST that did reach the CMS
+    index = collect.SeenIndex(str(tmp_path / "seen.db"))
+    index.add(2, "2")
+
+    uploader = collect.EventUploader(cms["url"], concurrency=1, retries=0, backoff=0)
+    cms["script"] = [201, 201, 400]
+    counts = collect.flush_queue(queue, uploader, index)
+    assert counts == {"stored": 2, "already_stored": 2, "released": 1}
+    # 1 found in the CMS, 2 in the seen index; 3 and 4 stored, 5 rejected and left queued
+    assert sorted(e["title"] for e in cms["events"]) == ["event 1", "event 3", "event 4"]
+    assert queue.stats()["depth"] == 1
+    assert (2, "3") in index and (2, "4") in index and (2, "5") not in index
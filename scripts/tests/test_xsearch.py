@@ -0,0 +1,139 @@
+"""ivco-xsearch --checkpoint: state file, transitions, and runs against a fake search/recent."""
+import json
+import sys
+import time
+
+import pytest
+
+
+def _id(xsearch, seconds_ago: float, seq: int = 0) -> str:
+    """A snowflake tweet id created seconds_ago."""
+    ms = int((time.time() - seconds_ago) * 1000) - xsearch.TWEET_EPOCH_MS
+    return str((ms << 22) + seq)
+
+
+def test_load_checkpoint(xsearch, tmp_path):
+    path = tmp_path / "ckpt.json"
+    assert xsearch.load_checkpoint(str(path)) == {}
+    path.write_text("not json")
+    assert xsearch.load_checkpoint(str(path)) == {}
+    # Files written before gaps were kept
+    path.write_text(json.dumps({"query": "q", "since_id": "100"}))
+    assert xsearch.load_checkpoint(str(path)) == {"newest_id": "100", "gaps": []}
+    path.write_text(json.dumps({"since_id": "100", "until_id": "150", "newest_id": "200"}))
+    assert xsearch.load_checkpoint(str(path)) == {"newest_id": "200", "gaps": [["100", "150"]]}
+
+    state = {"newest_id": "300", "gaps": [["200", "250"], ["100", "150"]]}
+    xsearch.save_checkpoint(str(path), "q", state)
+    assert xsearch.load_checkpoint(str(path)) == state
+    path.write_text(json.dumps({"newest_id": "300", "gaps": [["1"], None, ["2", "3"]]}))
+    assert xsearch.load_checkpoint(str(path)) == {"newest_id": "300", "gaps": [["2", "3"]]}
+
+
+def test_next_checkpoint(xsearch):
+    nxt = xsearch.next_checkpoint
+    # First run: newest id, nothing owed from before it
+    assert nxt({}, None, None, "500", "400", exhausted=False) == {"newest_id": "500", "gaps": []}
+    state = {"newest_id": "500", "gaps": [["100", "200"]]}
+    # New tweets fetched completely
+    assert nxt(state, "500", None, "900", "600", True) == {"newest_id": "900", "gaps": [["100", "200"]]}
+    # Cut short: the unfetched part below the oldest id becomes the newest gap
+    assert nxt(state, "500", None, "900", "800", False) == {
+        "newest_id": "900", "gaps": [["500", "800"], ["100", "200"]]}
+    # Nothing fetched (error): unchanged
+    assert nxt(state, "500", None, None, None, False) is state
+    # Gaps narrow to the oldest id fetched, and close once exhausted
+    assert nxt(state, "100", "200", "190", "150", False) == {"newest_id": "500", "gaps": [["100", "150"]]}
+    assert nxt(state, "100", "200", "190", "150", True) == {"newest_id": "500", "gaps": []}
+    assert nxt(state, "100", "200", None, None, True) == {"newest_id": "500", "gaps": []}
+    assert nxt(state, "100", "200", None, None, False) is state
+    assert xsearch.checkpoint_ranges(state) == [("500", None), ("100", "200")]
+
+
+def test_expired_gaps_are_dropped(xsearch):
+    old, recent = _id(xsearch, 8 * 86400), _id(xsearch, 86400)
+    state = {"newest_id": _id(xsearch, 0), "gaps": [[recent, _id(xsearch, 3600)], ["1", old]]}
+    kept, dropped = xsearch.drop_expired_gaps(state)
+    assert kept["gaps"] == state["gaps"][:1] and dropped == [["1", old]]
+    assert xsearch.drop_expired_gaps(kept) == (kept, [])
+
+
+@pytest.fixture
+def stream(xsearch, monkeypatch, tmp_path):
+    """A fake search/recent over a growing list of tweet ids; main() runs against it."""
+    fake = {"ids": [], "calls": []}
+
+    def search_recent(query, max_results, token, no_retweets=True, since_id=None, next_token=None,
+                      sort_order="relevancy", client=None, until_id=None):
+        fake["calls"].append({"since_id": since_id, "until_id": until_id, "sort_order": sort_order})
+        ids = sorted((i for i in fake["ids"] if (not since_id or int(i) > int(since_id))
+                      and (not until_id or int(i) < int(until_id))), key=int, reverse=True)
+        start = int(next_token or 0)
+        size = max(xsearch.PAGE_MIN, min(max_results, xsearch.PAGE_MAX))
+        page = ids[start:start + size]
+        meta = {"result_count": len(page)}
+        if start + size < len(ids):
+            meta["next_token"] = str(start + size)
+        return {"data": [{"id": i, "text": f"tweet {i}"} for i in page], "meta": meta}
+
+    monkeypatch.setattr(xsearch, "search_recent", search_recent)
+    monkeypatch.setenv("X_BEARER_TOKEN", "token")
+
+    def run(*argv):
+        fake["calls"].clear()
+        monkeypatch.setattr(sys, "argv", ["ivco-xsearch", "paypal", "--checkpoint-dir", str(tmp_path), *argv])
+        xsearch.main()
+
+    fake["run"] = run
+    return fake
+
+
+def _fetched(capsys) -> list[int]:
+    return [int(t["id"]) for t in json.loads(capsys.readouterr().out)]
+
+
+def test_checkpoint_runs_fetch_new_tweets_first(xsearch, stream, capsys):
+    """50 new tweets between runs of -n 10: every run gets the newest ten, not stale ones."""
+    base = int(_id(xsearch, 3 * 3600))
+    batches = [sorted((base + (run * 50 + k) * 1000 for k in range(50)), reverse=True) for run in range(6)]
+    fetched = []
+    for batch in batches[:5]:
+        stream["ids"] += map(str, batch)
+        stream["run"]("-n", "10", "--checkpoint")
+        run = _fetched(capsys)
+        assert run == batch[:10]
+        assert all(call["sort_order"] == "recency" for call in stream["calls"])
+        fetched += run
+
+    # With room to spare, a run takes the new tweets first, then fills the gaps newest first
+    stream["ids"] += map(str, batches[5])
+    stream["run"]("-n", "100", "--checkpoint")
+    run = _fetched(capsys)
+    assert run == batches[5] + batches[4][10:] + batches[3][10:20]
+    fetched += run
+    while run:
+        stream["run"]("-n", "100", "--checkpoint")
+        run = _fetched(capsys)
+        fetched += run
+    # Everything since the first run's ten, each tweet exactly once
+    assert sorted(fetched, reverse=True) == [i for batch in reversed(batches[1:]) for i in batch] + batches[0][:10]
+
+
+def test_without_checkpoint_sorts_by_relevancy(xsearch, stream, capsys):
+    stream["ids"] += [_id(xsearch, 60, seq) for seq in range(3)]
+    stream["run"]("-n", "10")
+    assert len(_fetched(capsys)) == 3 and stream["calls"][0]["sort_order"] == "relevancy"
+
+
+def test_budget_is_shared_between_new_tweets_and_gaps(xsearch, stream, capsys):
+    base = int(_id(xsearch, 3600))
+    stream["ids"] += [str(base + k * 1000) for k in range(30)]
+    stream["run"]("-n", "10", "--checkpoint")
+    capsys.readouterr()
+    stream["ids"] += [str(base + k * 1000) for k in range(30, 60)]
+    stream["run"]("-n", "10", "--checkpoint")  # leaves a gap of 20
+    capsys.readouterr()
+    stream["ids"] += [str(base + k * 1000) for k in range(60, 65)]
+    stream["run"]("-n", "100", "--checkpoint", "--budget", "0.10")  # 20 tweets' worth
+    fetched = _fetched(capsys)
+    assert len(fetched) == 20 and fetched[:5] == sorted((base + k * 1000 for k in range(60, 65)), reverse=True)
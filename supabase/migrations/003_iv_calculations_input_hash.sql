@@ -0,0 +1,8 @@
+-- 003_iv_calculations_input_hash.sql
+-- Idempotent bulk writes from `ivco store sink`
+-- input_hash = hash of ticker + parameters + OE series + debt/shares (everything but price),
+-- so re-running an unchanged valuation updates price / margin of safety instead of adding a row
+
+ALTER TABLE iv_calculations ADD COLUMN IF NOT EXISTS input_hash TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_iv_ticker_input_hash ON iv_calculations (ticker, input_hash);